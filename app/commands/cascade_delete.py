@@ -0,0 +1,41 @@
+"""Delete a user with their tasks, or a company with its users and their tasks, in committed batches.
+
+Same as DELETE /users/{id} and DELETE /companies/{id}, with progress printed after every batch.
+
+Usage: python -m app.commands.cascade_delete {user,company} <id> [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import time
+from uuid import UUID
+
+from app.dependencies.cache import get_entity_cache, close_entity_cache
+from app.dependencies.config import get_config
+from app.dependencies.db import AsyncSessionLocal, dispose_engine
+from app.services.cascade_delete_service import CascadeDeleteService, DeleteProgress
+
+async def cascade_delete(kind: str, entity_id: UUID, batch_size: int):
+    started = time.perf_counter()
+
+    def print_progress(progress: DeleteProgress):
+        print(f"{time.perf_counter() - started:8.1f}s  batch {progress.batches}: {progress.tasks} tasks, {progress.users} users deleted")
+
+    async with AsyncSessionLocal() as session:
+        service = CascadeDeleteService(session, entity_cache=get_entity_cache(), batch_size=batch_size, on_progress=print_progress)
+        if kind == 'user':
+            progress = await service.delete_user(entity_id)
+        else:
+            progress = await service.delete_company(entity_id)
+    close_entity_cache()
+    await dispose_engine()
+    if progress is None:
+        raise SystemExit(f"{kind} {entity_id} not found")
+    print(f"Deleted {kind} {entity_id} with {progress.tasks} tasks and {progress.users} users")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m app.commands.cascade_delete")
+    parser.add_argument("kind", choices=("user", "company"))
+    parser.add_argument("id", type=UUID)
+    parser.add_argument("--batch-size", type=int, default=get_config().CASCADE_DELETE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(cascade_delete(args.kind, args.id, args.batch_size))
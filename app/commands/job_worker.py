@@ -0,0 +1,47 @@
+"""Run background jobs outside the web processes.
+
+Takes jobs from the jobs table until SIGTERM or SIGINT, then gives running jobs --shutdown-timeout
+seconds to finish and puts the others back in the queue. Any number of these can run next to the
+web workers (or with JOBS_CONCURRENCY=0 on those, instead of them).
+
+Usage: python -m app.commands.job_worker [--concurrency 2] [--shutdown-timeout 30]
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.dependencies.cache import close_entity_cache
+from app.dependencies.config import get_config
+from app.dependencies.db import dispose_engine, get_session_factory
+from app.jobs import JobRunner, JOB_DEFINITIONS
+
+async def run_worker(concurrency: int, shutdown_timeout: float):
+    config = get_config()
+    runner = JobRunner(
+        session_factory=get_session_factory(),
+        definitions=JOB_DEFINITIONS,
+        concurrency=concurrency,
+        poll_interval=config.JOBS_POLL_INTERVAL_SECONDS,
+        lease_seconds=config.JOBS_LEASE_SECONDS,
+        retry_backoff=config.JOBS_RETRY_BACKOFF_SECONDS
+    )
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+    await runner.start()
+    print(f"job worker running with {concurrency} workers, stop with Ctrl+C")
+    await stopping.wait()
+    print("stopping, waiting for running jobs")
+    await runner.stop(shutdown_timeout)
+    close_entity_cache()
+    await dispose_engine()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m app.commands.job_worker")
+    parser.add_argument("--concurrency", type=int, default=max(get_config().JOBS_CONCURRENCY, 1))
+    parser.add_argument("--shutdown-timeout", type=float, default=get_config().WEB_GRACEFUL_SHUTDOWN_SECONDS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(run_worker(args.concurrency, args.shutdown_timeout))
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""Recompute task_counters from the tasks table.
+
+Usage: python -m app.commands.rebuild_task_counters
+"""
+import asyncio
+
+from app.dependencies.db import AsyncSessionLocal, dispose_engine
+from app.services.task_counter_service import TaskCounterService
+
+async def rebuild_task_counters():
+    async with AsyncSessionLocal() as session:
+        rows = await TaskCounterService(session).rebuild()
+        await session.commit()
+    await dispose_engine()
+    print(f"Rebuilt task counters: {rows} rows")
+
+if __name__ == '__main__':
+    asyncio.run(rebuild_task_counters())
@@ -0,0 +1,86 @@
+"""Local stand-in for Redis, enough of RESP2 for the entity cache (GET, SET [EX], DEL, PING, AUTH, SELECT).
+
+Keeps everything in memory of a single process, for development and for testing
+ENTITY_CACHE_BACKEND=redis without a Redis server.
+
+Usage: python -m app.commands.resp_server [--host 127.0.0.1] [--port 6379]
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+# key -> (value, expires_at or None)
+_store: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b'$-1\r\n'
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+def _lookup(key: bytes) -> Optional[bytes]:
+    entry = _store.get(key)
+    if entry is None:
+        return None
+    value, expires_at = entry
+    if expires_at is not None and expires_at <= time.monotonic():
+        del _store[key]
+        return None
+    return value
+
+def handle_command(args: List[bytes]) -> bytes:
+    name = args[0].upper() if args else b''
+    if name == b'PING':
+        return b'+PONG\r\n'
+    if name in (b'AUTH', b'SELECT'):
+        return b'+OK\r\n'
+    if name == b'GET' and len(args) == 2:
+        return _bulk(_lookup(args[1]))
+    if name == b'SET' and len(args) in (3, 5):
+        expires_at = None
+        if len(args) == 5:
+            if args[3].upper() != b'EX':
+                return b'-ERR syntax error\r\n'
+            expires_at = time.monotonic() + int(args[4])
+        _store[args[1]] = (args[2], expires_at)
+        return b'+OK\r\n'
+    if name == b'DEL' and len(args) >= 2:
+        deleted = sum(1 for key in args[1:] if _lookup(key) is not None and _store.pop(key, None) is not None)
+        return b':%d\r\n' % deleted
+    return b'-ERR unknown command or wrong number of arguments\r\n'
+
+async def _read_command(reader: asyncio.StreamReader) -> List[bytes]:
+    line = await reader.readline()
+    if not line:
+        raise EOFError
+    if not line.startswith(b'*'):
+        # Inline command, e.g. typed into telnet
+        return line.split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+async def serve_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            writer.write(handle_command(await _read_command(reader)))
+            await writer.drain()
+    except (EOFError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def main(host: str, port: int):
+    server = await asyncio.start_server(serve_client, host, port)
+    print(f"RESP stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))
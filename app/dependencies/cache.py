@@ -0,0 +1,30 @@
+from typing import Optional
+
+from .config import get_config
+from app.utils.entity_cache import EntityCache, MemoryEntityCache, RedisEntityCache
+from app.utils.resp_client import RespClient
+
+_entity_cache: Optional[EntityCache] = None
+
+def get_entity_cache() -> Optional[EntityCache]:
+    # One cache per worker process, the redis backend shares entries between workers
+    global _entity_cache
+    if _entity_cache is None:
+        config = get_config()
+        if config.ENTITY_CACHE_BACKEND == 'redis':
+            _entity_cache = RedisEntityCache(
+                client=RespClient(config.REDIS_URL, timeout=config.REDIS_TIMEOUT),
+                ttl_seconds=config.ENTITY_CACHE_TTL_SECONDS
+            )
+        elif config.ENTITY_CACHE_BACKEND == 'memory' and config.ENTITY_CACHE_MAX_ENTRIES > 0:
+            _entity_cache = MemoryEntityCache(
+                ttl_seconds=config.ENTITY_CACHE_TTL_SECONDS,
+                max_entries=config.ENTITY_CACHE_MAX_ENTRIES
+            )
+    return _entity_cache
+
+def close_entity_cache():
+    global _entity_cache
+    if _entity_cache is not None:
+        _entity_cache.close()
+    _entity_cache = None
\ No newline at end of file
@@ -1,11 +1,8 @@
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Optional, List
 
 from pydantic.v1 import BaseSettings, PostgresDsn
 
-# Load environment variables from .env file
-load_dotenv()
-
 class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_HOST: str
@@ -17,15 +14,114 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = 'HS256'
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
-def get_database_url(async_mode: bool = True) -> str:
+    # bcrypt cost, existing hashes with another cost are rehashed on login
+    PASSWORD_HASH_ROUNDS: int = 12
+    # 'thread' or 'process'
+    PASSWORD_HASH_EXECUTOR: str = 'thread'
+    PASSWORD_HASH_WORKERS: int = 4
+    # Operations allowed to wait for a worker before answering 503
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+
+    # Verified bearer tokens kept per worker, 0 disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Production server (python -m app.server), 0 workers starts one per CPU core
+    WEB_HOST: str = '0.0.0.0'
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0
+    # 'auto' picks uvloop and httptools when installed, 'asyncio' and 'h11' force the pure Python ones
+    WEB_LOOP: str = 'auto'
+    WEB_HTTP: str = 'auto'
+    # Seconds in-flight requests get to finish after SIGTERM before they are cancelled
+    WEB_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    WEB_KEEP_ALIVE_SECONDS: int = 5
+    # A worker is replaced after serving this many requests, 0 never recycles
+    WEB_LIMIT_MAX_REQUESTS: int = 0
+
+    # Connection pool, sized per worker process
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Connections all workers together may open per database (max_connections minus other clients),
+    # split between the workers by app.server; 0 keeps DB_POOL_SIZE + DB_MAX_OVERFLOW per worker
+    DB_CONNECTION_BUDGET: int = 0
+    # asyncpg prepared statements cached per connection, 0 when behind a transaction-mode pgbouncer
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Statements at least this slow are logged with their route, 0 disables the slow-query log
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    # Share of slow SELECTs re-run with EXPLAIN (ANALYZE, BUFFERS), and per-minute caps
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+    SLOW_QUERY_LOGS_PER_MINUTE: int = 60
+    SLOW_QUERY_EXPLAINS_PER_MINUTE: int = 6
+    # Per-request query budget for tests, 0 disables; 'warn' logs, 'raise' fails the request
+    QUERY_BUDGET_MAX_STATEMENTS: int = 0
+    QUERY_BUDGET_MAX_REPEATS: int = 0
+    QUERY_BUDGET_MODE: str = 'warn'
+    # Connections opened and warmed at startup before readiness flips, defaults to DB_POOL_SIZE
+    DB_POOL_WARM_CONNECTIONS: Optional[int] = None
+    # Read replicas for listings, searches and lookups: comma separated asyncpg URLs, empty reads from the primary
+    DB_REPLICA_URLS: str = ''
+    # After a write, the writer's reads stay on the primary this long so they always see their own changes
+    DB_REPLICA_STICKY_SECONDS: float = 5.0
+    # Upper bound for the readiness probe round trip
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+
+    # Rows per multi-row INSERT in POST /tasks/bulk, capped by the 32767 bind parameters of a statement
+    TASK_BULK_CHUNK_SIZE: int = 1000
+    # Rows per committed DELETE when a user or company is deleted with its tasks (and users)
+    CASCADE_DELETE_BATCH_SIZE: int = 1000
+
+    # Background job workers per process, 0 leaves the jobs to `python -m app.commands.job_worker`
+    JOBS_CONCURRENCY: int = 2
+    # Idle workers look for due jobs this often, jobs queued by the same process wake them at once
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    # A running job is taken over by another worker when its heartbeat stops for this long
+    JOBS_LEASE_SECONDS: int = 60
+    # Delay before the first retry of a failed attempt, doubled on each further one
+    JOBS_RETRY_BACKOFF_SECONDS: float = 10.0
+    # Rows per committed UPDATE of the reassign_tasks job
+    JOBS_BATCH_SIZE: int = 1000
+    # Files written by export jobs, served by GET /jobs/{id}/download of the same host
+    JOBS_EXPORT_DIR: str = '/tmp/todos-exports'
+
+    # GET /tasks/stream: events kept per worker for Last-Event-ID resumes, undelivered events per subscriber
+    # before it gets a reset, and the keep-alive comment interval of idle streams
+    TASK_FEED_BUFFER_SIZE: int = 10000
+    TASK_FEED_SUBSCRIBER_BUFFER: int = 1000
+    TASK_FEED_KEEPALIVE_SECONDS: float = 15.0
+
+    # Company/user lookups: 'memory' (per worker), 'redis' (shared, needs REDIS_URL) or 'none'
+    ENTITY_CACHE_BACKEND: str = 'memory'
+    ENTITY_CACHE_TTL_SECONDS: int = 60
+    ENTITY_CACHE_MAX_ENTRIES: int = 10000
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    REDIS_TIMEOUT: float = 0.5
+
+    class Config:
+        # Environment variables win over .env, read once by get_config
+        env_file = '.env'
+
+def get_database_url(async_mode: bool = True, config: Optional[Settings] = None) -> str:
+    config = config or get_config()
     scheme = 'postgresql+asyncpg' if async_mode else 'postgresql'
     return PostgresDsn.build(
         scheme=scheme,
-        user=os.getenv('POSTGRES_USER'),
-        password=os.getenv('POSTGRES_PASSWORD'),
-        host=os.getenv('POSTGRES_HOST'),
-        path=f'/{os.getenv("POSTGRES_DB")}'
+        user=config.POSTGRES_USER,
+        password=config.POSTGRES_PASSWORD,
+        host=config.POSTGRES_HOST,
+        path=f'/{config.POSTGRES_DB}'
     )
 
+def get_replica_urls(config: Optional[Settings] = None) -> List[str]:
+    config = config or get_config()
+    return [url.strip() for url in config.DB_REPLICA_URLS.split(',') if url.strip()]
+
+@lru_cache
 def get_config() -> Settings:
+    # Parsed once per process, also cheap enough to stay a request dependency
     return Settings()
\ No newline at end of file
@@ -1,30 +1,133 @@
-from typing import Generator
+import asyncio
+import itertools
+from functools import lru_cache
+from typing import Optional, List, Iterator
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
 
-from app.dependencies.config import get_database_url
+from app.dependencies.config import get_database_url, get_replica_urls, get_config, Settings
+from app.utils.db_pool import InstrumentedAsyncPool
+from app.utils.metrics import instrument_engine
+from app.utils.query_log import QueryLog
+from app.utils.replica_routing import StickyWrites, bearer_subject, STICKY_COOKIE, STICKY_HEADER
 
-DATABASE_URL = get_database_url(async_mode=False)
-DATABASE_URL_ASYNC = get_database_url(async_mode=True)
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_replica_engines: Optional[List[AsyncEngine]] = None
+_replica_session_factories: Optional[Iterator[async_sessionmaker]] = None
 
-# Create a configured "Session" class
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-# Create an asynchronous engine
-async_engine = create_async_engine(DATABASE_URL_ASYNC, echo=True)
-# Create an asynchronous session factory
-AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+def create_db_engine(url: str, config: Settings) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=config.DB_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE},
+    )
+    # Query count and DB time per request for /metrics and Server-Timing, cheaper than echo
+    instrument_engine(engine.sync_engine)
+    # Slow statements and query budgets of the engine
+    get_query_log().watch(engine)
+    return engine
 
-def get_sync_db_session() -> Generator:
-    db = SessionLocal()
+@lru_cache
+def get_query_log() -> QueryLog:
+    config = get_config()
+    return QueryLog(
+        threshold_ms=config.SLOW_QUERY_THRESHOLD_MS,
+        explain_sample_rate=config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        explain_timeout_ms=config.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+        logs_per_minute=config.SLOW_QUERY_LOGS_PER_MINUTE,
+        explains_per_minute=config.SLOW_QUERY_EXPLAINS_PER_MINUTE,
+        budget_max_statements=config.QUERY_BUDGET_MAX_STATEMENTS,
+        budget_max_repeats=config.QUERY_BUDGET_MAX_REPEATS,
+        budget_raise=config.QUERY_BUDGET_MODE == 'raise',
+    )
+
+def get_engine() -> AsyncEngine:
+    # Created by the application lifespan, or on first use in scripts and commands
+    global _engine
+    if _engine is None:
+        config = get_config()
+        _engine = create_db_engine(get_database_url(async_mode=True, config=config), config)
+    return _engine
+
+def get_session_factory() -> async_sessionmaker:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(bind=get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _session_factory
+
+def AsyncSessionLocal() -> AsyncSession:
+    return get_session_factory()()
+
+def get_replica_engines() -> List[AsyncEngine]:
+    # Same pool settings as the primary, one pool per replica and worker
+    global _replica_engines
+    if _replica_engines is None:
+        config = get_config()
+        _replica_engines = [create_db_engine(url, config) for url in get_replica_urls(config)]
+    return _replica_engines
+
+def get_replica_session_factory() -> Optional[async_sessionmaker]:
+    # Round robin over the replicas, None without any
+    global _replica_session_factories
+    if _replica_session_factories is None:
+        _replica_session_factories = itertools.cycle([
+            async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False) for engine in get_replica_engines()
+        ])
+    return next(_replica_session_factories, None)
+
+@lru_cache
+def get_sticky_writes() -> StickyWrites:
+    config = get_config()
+    return StickyWrites(secret=config.JWT_SECRET_KEY, seconds=config.DB_REPLICA_STICKY_SECONDS)
+
+async def warm_up_engine(engine: AsyncEngine, connections: int):
+    """
+    Opens `connections` pool connections up front and runs one statement per mapped table on each,
+    so asyncpg's codec setup and enum type introspection happen here rather than on the first requests.
+    """
+    # Imported here, app.models pulls in every mapped class
+    from app.models import Task, User, Company, TaskCounter, Job
+
+    async def warm_connection(connection):
+        for model in (Task, User, Company, TaskCounter, Job):
+            await connection.execute(select(model).limit(0))
+
+    # All checked out at once so the pool really opens that many, released back into the pool afterwards
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
     try:
-      yield db
+        await asyncio.gather(*(warm_connection(connection) for connection in opened))
     finally:
-        db.close()
+        await asyncio.gather(*(connection.close() for connection in opened))
+
+async def dispose_engine():
+    global _engine, _session_factory, _replica_engines, _replica_session_factories
+    if _engine is not None:
+        await _engine.dispose()
+    if _replica_engines:
+        await asyncio.gather(*(engine.dispose() for engine in _replica_engines))
+    _engine = _session_factory = _replica_engines = _replica_session_factories = None
 
 # Dependency function to get the session
 async def get_async_db_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
+        yield session
+
+# Dependency function to get the session of read-only queries
+async def get_async_read_db_session(request: Request, async_session: AsyncSession = Depends(get_async_db_session)) -> AsyncSession:
+    # Without replicas, or right after the caller's own write, reads share the request's primary session
+    replica_session_factory = get_replica_session_factory()
+    sticky_token = request.cookies.get(STICKY_COOKIE) or request.headers.get(STICKY_HEADER)
+    if replica_session_factory is None or get_sticky_writes().is_sticky(bearer_subject(request.headers.get("authorization")), sticky_token):
+        yield async_session
+        return
+    async with replica_session_factory() as session:
         yield session
\ No newline at end of file
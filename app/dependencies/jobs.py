@@ -0,0 +1,28 @@
+from typing import Optional
+
+from .config import get_config
+from .db import get_session_factory
+from app.jobs import JobRunner, JOB_DEFINITIONS
+
+_job_runner: Optional[JobRunner] = None
+
+def get_job_runner() -> JobRunner:
+    # One runner per process; started by the lifespan or by the job_worker command
+    global _job_runner
+    if _job_runner is None:
+        config = get_config()
+        _job_runner = JobRunner(
+            session_factory=get_session_factory(),
+            definitions=JOB_DEFINITIONS,
+            concurrency=config.JOBS_CONCURRENCY,
+            poll_interval=config.JOBS_POLL_INTERVAL_SECONDS,
+            lease_seconds=config.JOBS_LEASE_SECONDS,
+            retry_backoff=config.JOBS_RETRY_BACKOFF_SECONDS
+        )
+    return _job_runner
+
+async def stop_job_runner(timeout: float):
+    global _job_runner
+    if _job_runner is not None:
+        await _job_runner.stop(timeout)
+    _job_runner = None
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from .config import get_config
+from app.utils.password_utils import PasswordHasher
+from app.utils.token_cache import VerifiedTokenCache
+
+_password_hasher: Optional[PasswordHasher] = None
+_token_cache: Optional[VerifiedTokenCache] = None
+
+def get_password_hasher() -> PasswordHasher:
+    # One pool per worker process, shared by every request
+    global _password_hasher
+    if _password_hasher is None:
+        config = get_config()
+        _password_hasher = PasswordHasher(
+            rounds=config.PASSWORD_HASH_ROUNDS,
+            max_workers=config.PASSWORD_HASH_WORKERS,
+            queue_limit=config.PASSWORD_HASH_QUEUE_LIMIT,
+            use_processes=config.PASSWORD_HASH_EXECUTOR == 'process'
+        )
+    return _password_hasher
+
+def close_password_hasher():
+    global _password_hasher
+    if _password_hasher is not None:
+        _password_hasher.shutdown()
+    _password_hasher = None
+
+
+def get_token_cache() -> Optional[VerifiedTokenCache]:
+    global _token_cache
+    if _token_cache is None:
+        config = get_config()
+        if config.TOKEN_CACHE_MAX_ENTRIES <= 0:
+            return None
+        _token_cache = VerifiedTokenCache(max_entries=config.TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=config.TOKEN_CACHE_TTL_SECONDS)
+    return _token_cache
\ No newline at end of file
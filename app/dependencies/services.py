@@ -1,33 +1,45 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 from .config import get_config
-from .db import get_async_db_session, get_sync_db_session
+from .db import get_async_db_session, get_async_read_db_session
+from .security import get_password_hasher, get_token_cache
+from .cache import get_entity_cache
 from app.services.user_service import UserService
 from app.services.auth_service import AuthService
 from app.services.company_service import CompanyService
 from app.services.task_service import TaskService
+from app.services.job_service import JobService
+from app.utils.password_utils import PasswordHasher
+from app.utils.token_cache import VerifiedTokenCache
+from app.utils.entity_cache import EntityCache
 
 def get_user_service(
         async_session: AsyncSession = Depends(get_async_db_session),
-        sync_session: Session = Depends(get_sync_db_session)
+        password_hasher: PasswordHasher = Depends(get_password_hasher),
+        entity_cache: EntityCache = Depends(get_entity_cache),
+        read_session: AsyncSession = Depends(get_async_read_db_session)
 ) -> UserService:
-    return UserService(async_session=async_session, sync_session=sync_session)
+    return UserService(async_session=async_session, password_hasher=password_hasher, entity_cache=entity_cache, read_session=read_session)
 
 def get_auth_service(
         user_service: UserService = Depends(get_user_service),
         config=Depends(get_config),
+        token_cache: VerifiedTokenCache = Depends(get_token_cache),
 ) -> AuthService:
-    return AuthService(config=config, user_service=user_service)
+    return AuthService(config=config, user_service=user_service, token_cache=token_cache)
 
 def get_company_service(
         async_session: AsyncSession = Depends(get_async_db_session),
-        sync_session: Session = Depends(get_sync_db_session)
+        entity_cache: EntityCache = Depends(get_entity_cache),
+        read_session: AsyncSession = Depends(get_async_read_db_session)
 ) -> CompanyService:
-    return CompanyService(async_session=async_session, sync_session=sync_session)
+    return CompanyService(async_session=async_session, entity_cache=entity_cache, read_session=read_session)
 
 def get_task_service(
         async_session: AsyncSession = Depends(get_async_db_session),
-        sync_session: Session = Depends(get_sync_db_session)
+        read_session: AsyncSession = Depends(get_async_read_db_session)
 ) -> TaskService:
-    return TaskService(async_session=async_session, sync_session=sync_session)
\ No newline at end of file
+    return TaskService(async_session=async_session, read_session=read_session)
+
+def get_job_service(async_session: AsyncSession = Depends(get_async_db_session)) -> JobService:
+    return JobService(async_session=async_session)
\ No newline at end of file
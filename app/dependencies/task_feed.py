@@ -0,0 +1,26 @@
+from typing import Optional
+
+from .config import get_config, get_database_url
+from app.models.task import TASK_CHANGES_CHANNEL
+from app.utils.task_feed import TaskFeed
+
+_task_feed: Optional[TaskFeed] = None
+
+def get_task_feed() -> TaskFeed:
+    # One LISTEN connection per worker process, on the primary: notifications are not replicated
+    global _task_feed
+    if _task_feed is None:
+        config = get_config()
+        _task_feed = TaskFeed(
+            dsn=get_database_url(async_mode=False, config=config),
+            channel=TASK_CHANGES_CHANNEL,
+            buffer_size=config.TASK_FEED_BUFFER_SIZE,
+            subscriber_buffer=config.TASK_FEED_SUBSCRIBER_BUFFER
+        )
+    return _task_feed
+
+async def stop_task_feed():
+    global _task_feed
+    if _task_feed is not None:
+        await _task_feed.stop()
+    _task_feed = None
\ No newline at end of file
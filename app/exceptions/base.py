@@ -1,6 +1,8 @@
+from typing import Any
+
 from fastapi import HTTPException, status
 
 
 class BaseCustomException(HTTPException):
-    def __init__(self, detail: str, status_code: int, headers: dict | None = None):
+    def __init__(self, detail: Any, status_code: int, headers: dict | None = None):
         super().__init__(status_code=status_code, detail=detail, headers=headers)
\ No newline at end of file
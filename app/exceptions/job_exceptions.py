@@ -0,0 +1,31 @@
+from starlette import status
+
+from app.exceptions.base import BaseCustomException
+
+class JobNotFoundException(BaseCustomException):
+    def __init__(self, detail: str = "Job not found"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+class JobNotCancellableException(BaseCustomException):
+    def __init__(self, detail: str = "Job already finished"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_409_CONFLICT
+        )
+
+class JobResultNotAvailableException(BaseCustomException):
+    def __init__(self, detail: str = "Job has no file to download"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+class InvalidJobPayloadException(BaseCustomException):
+    def __init__(self, detail: list):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
\ No newline at end of file
@@ -0,0 +1,10 @@
+from starlette import status
+
+from app.exceptions.base import BaseCustomException
+
+class InvalidCursorException(BaseCustomException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
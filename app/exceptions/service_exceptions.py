@@ -0,0 +1,25 @@
+from starlette import status
+
+from app.exceptions.base import BaseCustomException
+
+class ServiceUnavailableException(BaseCustomException):
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+class VersionConflictException(BaseCustomException):
+    def __init__(self, detail: str = "The resource was changed by another request"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_409_CONFLICT
+        )
+
+class PreconditionFailedException(BaseCustomException):
+    def __init__(self, detail: str = "If-Match does not match the current version"):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_412_PRECONDITION_FAILED
+        )
\ No newline at end of file
@@ -7,4 +7,11 @@ class TaskNotFoundException(BaseCustomException):
         super().__init__(
             detail=detail,
             status_code=status.HTTP_404_NOT_FOUND
+        )
+
+class BulkTaskCreateException(BaseCustomException):
+    def __init__(self, detail: list):
+        super().__init__(
+            detail=detail,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
         )
\ No newline at end of file
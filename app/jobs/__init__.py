@@ -0,0 +1,2 @@
+from .runner import JobRunner, JobContext, JobDefinition, JobFailed
+from .handlers import JOB_DEFINITIONS
\ No newline at end of file
@@ -0,0 +1,106 @@
+import asyncio
+import os
+from dataclasses import asdict
+from typing import Dict, Optional
+
+from app.dependencies.cache import get_entity_cache
+from app.dependencies.config import get_config
+from app.schemas.job import JobKindEnum, DeleteUserJobPayload, DeleteCompanyJobPayload, ReassignTasksJobPayload, ExportTasksJobPayload
+from app.schemas.task import ExportFormatEnum
+from app.services.cascade_delete_service import CascadeDeleteService, DeleteProgress
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+from app.transformers.task_transformers import transform_to_task_export_row, TASK_EXPORT_FIELDS
+from app.utils.export_utils import encode_csv, encode_ndjson
+from .runner import JobContext, JobDefinition, JobFailed
+
+# Exported rows between two progress reports
+EXPORT_PROGRESS_ROWS = 10000
+
+def _report_deletes(context: JobContext):
+    def on_progress(progress: DeleteProgress):
+        context.report(**asdict(progress))
+    return on_progress
+
+async def delete_user(context: JobContext, payload: DeleteUserJobPayload) -> dict:
+    # Resumes where an interrupted attempt stopped, the batches it committed are gone already
+    async with context.session_factory() as session:
+        progress = await CascadeDeleteService(
+            session, entity_cache=get_entity_cache(), batch_size=get_config().CASCADE_DELETE_BATCH_SIZE, on_progress=_report_deletes(context)
+        ).delete_user(payload.user_id)
+    if progress is None:
+        raise JobFailed(f"User with ID {payload.user_id} not found")
+    return asdict(progress)
+
+async def delete_company(context: JobContext, payload: DeleteCompanyJobPayload) -> dict:
+    async with context.session_factory() as session:
+        progress = await CascadeDeleteService(
+            session, entity_cache=get_entity_cache(), batch_size=get_config().CASCADE_DELETE_BATCH_SIZE, on_progress=_report_deletes(context)
+        ).delete_company(payload.company_id)
+    if progress is None:
+        raise JobFailed(f"Company with ID {payload.company_id} not found")
+    return asdict(progress)
+
+async def reassign_tasks(context: JobContext, payload: ReassignTasksJobPayload) -> dict:
+    if payload.from_user_id == payload.to_user_id:
+        raise JobFailed("from_user_id and to_user_id are the same user")
+    batch_size = get_config().JOBS_BATCH_SIZE
+    # Counted from this attempt on, tasks moved by earlier attempts are no longer the source user's
+    moved = 0
+    async with context.session_factory() as session:
+        if not await UserService(async_session=session).get_existing_user_ids([payload.to_user_id]):
+            raise JobFailed(f"User with ID {payload.to_user_id} not found")
+        task_service = TaskService(async_session=session)
+        while True:
+            count = await task_service.reassign_tasks(payload.from_user_id, payload.to_user_id, payload.status, limit=batch_size)
+            moved += count
+            context.report(moved=moved)
+            if count < batch_size:
+                return {"moved": moved}
+
+async def export_tasks(context: JobContext, payload: ExportTasksJobPayload) -> dict:
+    directory = get_config().JOBS_EXPORT_DIR
+    await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+    path = os.path.join(directory, f"{context.job_id}.{payload.format.value}")
+    exported = 0
+
+    async def rows():
+        nonlocal exported
+        async with context.session_factory() as session:
+            async for row in TaskService(async_session=session).stream_tasks(user_id=payload.user_id, status=payload.status, priority=payload.priority):
+                exported += 1
+                if exported % EXPORT_PROGRESS_ROWS == 0:
+                    context.report(rows=exported)
+                yield transform_to_task_export_row(row)
+
+    chunks = encode_csv(rows(), TASK_EXPORT_FIELDS) if payload.format == ExportFormatEnum.CSV else encode_ndjson(rows())
+    # Written under a temporary name and renamed once complete, a download never sees a partial file
+    partial_path = f"{path}.partial"
+    file = await asyncio.to_thread(open, partial_path, "w", newline="", encoding="utf-8")
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(file.write, chunk)
+        await asyncio.to_thread(file.close)
+        await asyncio.to_thread(os.replace, partial_path, path)
+    except BaseException:
+        file.close()
+        await asyncio.shield(asyncio.to_thread(_remove, partial_path))
+        raise
+    context.report(rows=exported)
+    return {"path": path, "rows": exported, "format": payload.format.value}
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+JOB_DEFINITIONS: Dict[str, JobDefinition] = {
+    JobKindEnum.DELETE_USER.value: JobDefinition(DeleteUserJobPayload, delete_user),
+    JobKindEnum.DELETE_COMPANY.value: JobDefinition(DeleteCompanyJobPayload, delete_company),
+    JobKindEnum.REASSIGN_TASKS.value: JobDefinition(ReassignTasksJobPayload, reassign_tasks),
+    JobKindEnum.EXPORT_TASKS.value: JobDefinition(ExportTasksJobPayload, export_tasks),
+}
+
+def get_job_definition(kind: str) -> Optional[JobDefinition]:
+    return JOB_DEFINITIONS.get(kind)
\ No newline at end of file
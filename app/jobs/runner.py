@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Type
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Job
+from app.models.job import JobStatusEnum
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+class JobFailed(Exception):
+    """Raised by a handler for errors a retry cannot fix, the job fails without further attempts."""
+
+class JobContext:
+    def __init__(self, job: Job, session_factory: Callable[[], AsyncSession]):
+        self.job_id: UUID = job.id
+        self.attempt: int = job.attempts
+        # Handlers open their own sessions, committing as often as their batches need
+        self.session_factory = session_factory
+        # Latest progress, saved by the heartbeat and kept from the previous attempt on retries
+        self.progress: Optional[dict] = job.progress
+        self.cancel_requested = False
+
+    def report(self, **progress):
+        self.progress = progress
+
+@dataclass
+class JobDefinition:
+    payload_model: Type[BaseModel]
+    run: Callable[[JobContext, BaseModel], Awaitable[Optional[dict]]]
+
+class JobRunner:
+    """
+    `concurrency` asyncio workers taking jobs from the jobs table. Each runs one job at a time next to a
+    heartbeat that extends the job's lease, saves its progress and cancels it once cancellation is requested.
+    Failures are retried with exponential backoff up to the job's max_attempts.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], AsyncSession],
+            definitions: Dict[str, JobDefinition],
+            concurrency: int = 2,
+            poll_interval: float = 1.0,
+            lease_seconds: float = 60.0,
+            retry_backoff: float = 10.0
+    ):
+        self.session_factory = session_factory
+        self.definitions = definitions
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self._wake = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    def wake(self):
+        # A job was queued by this process, idle workers look for it without waiting for the next poll
+        self._wake.set()
+
+    async def start(self):
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._work(), name=f"job-worker-{index}") for index in range(self.concurrency)]
+
+    async def stop(self, timeout: float = 30.0):
+        # Running jobs get `timeout` seconds to finish, then they are cancelled and put back in the queue
+        self._stopping = True
+        self._wake.set()
+        if not self._workers:
+            return
+        _, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+
+    async def _work(self):
+        while not self._stopping:
+            try:
+                async with self.session_factory() as session:
+                    job = await JobService(session).claim_job(self.lease_seconds)
+            except Exception:
+                logger.exception("claiming a job failed")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            try:
+                await self._run(job)
+            except Exception:
+                # Bookkeeping of the job failed (connection lost while finishing it...), the worker goes on
+                # and the lease expiry hands the job to another claim
+                logger.exception("job %s (%s) could not be run to completion", job.id, job.kind)
+
+    async def _idle(self):
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self, job: Job):
+        context = JobContext(job, self.session_factory)
+        definition = self.definitions.get(job.kind)
+        if job.cancel_requested:
+            await self._finish(job, JobStatusEnum.CANCELLED, context)
+            return
+        if job.attempts > job.max_attempts:
+            # Taken over after the worker of the last attempt stopped renewing the lease
+            await self._finish(job, JobStatusEnum.FAILED, context, error="Lease expired on the last attempt")
+            return
+        if definition is None:
+            await self._finish(job, JobStatusEnum.FAILED, context, error=f"Unknown job kind {job.kind!r}")
+            return
+        try:
+            payload = definition.payload_model(**job.payload)
+        except ValidationError as error:
+            await self._finish(job, JobStatusEnum.FAILED, context, error=str(error))
+            return
+
+        logger.info("job %s (%s) attempt %d started", job.id, job.kind, job.attempts)
+        handler = asyncio.create_task(definition.run(context, payload))
+        heartbeat = asyncio.create_task(self._heartbeat(job, context, handler))
+        try:
+            result = await handler
+        except asyncio.CancelledError:
+            if not context.cancel_requested:
+                # Worker shutdown, the job goes back to the queue for another worker
+                handler.cancel()
+                await asyncio.shield(self._release(job, context))
+                raise
+            await self._finish(job, JobStatusEnum.CANCELLED, context)
+        except JobFailed as error:
+            await self._finish(job, JobStatusEnum.FAILED, context, error=str(error))
+        except Exception as error:
+            logger.exception("job %s (%s) attempt %d failed", job.id, job.kind, job.attempts)
+            if job.attempts < job.max_attempts:
+                async with self.session_factory() as session:
+                    await JobService(session).retry_job(job, repr(error), self.retry_backoff * 2 ** (job.attempts - 1), context.progress)
+            else:
+                await self._finish(job, JobStatusEnum.FAILED, context, error=repr(error))
+        else:
+            await self._finish(job, JobStatusEnum.SUCCEEDED, context, result=result)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job, context: JobContext, handler: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as session:
+                    cancel_requested = await JobService(session).heartbeat(job, self.lease_seconds, context.progress)
+            except Exception:
+                # The next beat retries, the lease outlives a couple of missed ones
+                logger.exception("heartbeat of job %s failed", job.id)
+                continue
+            if cancel_requested is None or cancel_requested:
+                # Cancelled by a user, or taken over by another worker after this one missed its lease
+                context.cancel_requested = True
+                handler.cancel()
+                return
+
+    async def _finish(self, job: Job, status: JobStatusEnum, context: JobContext, result: Optional[dict] = None, error: Optional[str] = None):
+        logger.info("job %s (%s) %s", job.id, job.kind, status.value.lower())
+        async with self.session_factory() as session:
+            await JobService(session).finish_job(job, status, progress=context.progress, result=result, error=error)
+
+    async def _release(self, job: Job, context: JobContext):
+        async with self.session_factory() as session:
+            await JobService(session).release_job(job, context.progress)
\ No newline at end of file
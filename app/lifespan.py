@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from app.dependencies.cache import get_entity_cache, close_entity_cache
+from app.dependencies.config import get_config
+from app.dependencies.db import get_engine, get_replica_engines, warm_up_engine, dispose_engine
+from app.dependencies.jobs import get_job_runner, stop_job_runner
+from app.dependencies.security import get_password_hasher, get_token_cache, close_password_hasher
+from app.dependencies.task_feed import get_task_feed, stop_task_feed
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # /health/ready answers 503 until the warm-up below is done
+    app.state.ready = False
+    started = time.perf_counter()
+    config = get_config()
+    warm_connections = min(config.DB_POOL_WARM_CONNECTIONS or config.DB_POOL_SIZE, config.DB_POOL_SIZE)
+    # Both wait on I/O or worker threads, run them side by side
+    await asyncio.gather(
+        warm_up_engine(get_engine(), warm_connections),
+        *(warm_up_engine(engine, warm_connections) for engine in get_replica_engines()),
+        get_password_hasher().warm_up(),
+    )
+    get_token_cache()
+    get_entity_cache()
+    await get_task_feed().start()
+    if config.JOBS_CONCURRENCY > 0:
+        await get_job_runner().start()
+    app.state.ready = True
+    logger.info("warm-up done in %.0f ms, %d connections open", (time.perf_counter() - started) * 1000, warm_connections)
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        # Running jobs get the graceful shutdown window, unfinished ones go back to the queue
+        await stop_job_runner(config.WEB_GRACEFUL_SHUTDOWN_SECONDS)
+        await stop_task_feed()
+        close_entity_cache()
+        close_password_hasher()
+        await dispose_engine()
\ No newline at end of file
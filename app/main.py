@@ -1,14 +1,23 @@
-import uvicorn
 from fastapi import FastAPI
 
+from app.dependencies.config import get_replica_urls
+from app.dependencies.db import get_query_log, get_sticky_writes
+from app.lifespan import lifespan
+from app.middlewares import MetricsMiddleware, ReadYourWritesMiddleware
 from app.routers import router
 
 app = FastAPI(
     title="Todo FastAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(router)
+if get_replica_urls():
+    app.add_middleware(ReadYourWritesMiddleware, sticky_writes=get_sticky_writes())
+app.add_middleware(MetricsMiddleware, query_log=get_query_log())
 
 if __name__ == '__main__':
-    uvicorn.run(app)
\ No newline at end of file
+    # Same as python -m app.server
+    from app.server import serve
+    serve()
\ No newline at end of file
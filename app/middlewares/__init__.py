@@ -0,0 +1,2 @@
+from .metrics_middleware import MetricsMiddleware
+from .read_your_writes_middleware import ReadYourWritesMiddleware
\ No newline at end of file
@@ -0,0 +1,49 @@
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from app.utils.metrics import RequestTiming, current_timing, metrics_registry, MetricsRegistry, route_template
+from app.utils.query_log import QueryLog
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: records latency, status and DB work per route template,
+    and reports app and db time to the client in a Server-Timing header.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics_registry, query_log: Optional[QueryLog] = None):
+        self.app = app
+        self.registry = registry
+        self.query_log = query_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(scope)
+        token = current_timing.set(timing)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Streaming bodies keep querying after this point, the header covers the work done until then
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", (
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}, "
+                    f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.queries} queries"'
+                ))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timing.reset(token)
+            self.registry.observe(scope["method"], route_template(scope), status_code, time.perf_counter() - started, timing)
+            if self.query_log is not None:
+                self.query_log.check_budget(timing, scope)
\ No newline at end of file
@@ -0,0 +1,40 @@
+import math
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from app.utils.replica_routing import StickyWrites, bearer_subject, is_read_only_route, STICKY_COOKIE, STICKY_HEADER
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: after a successful write, pins the writer's reads to the primary
+    for the sticky window so replication lag never hides their own changes. The window travels
+    with the client as a signed cookie and header, so it holds whichever worker serves the next read.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_writes: StickyWrites):
+        self.app = app
+        self.sticky_writes = sticky_writes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        subject = bearer_subject(Headers(scope=scope).get("authorization"))
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marking_writes(message: Message):
+            # Marked before the client sees the response, its next request is already sticky
+            if message["type"] == "http.response.start" and message["status"] < 400 and not is_read_only_route(scope):
+                token = self.sticky_writes.mark(subject)
+                headers = MutableHeaders(scope=message)
+                headers.append(STICKY_HEADER, token)
+                headers.append("Set-Cookie", f"{STICKY_COOKIE}={token}; Max-Age={math.ceil(self.sticky_writes.seconds)}; Path=/; HttpOnly; SameSite=Lax")
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writes)
\ No newline at end of file
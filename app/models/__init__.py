@@ -1,3 +1,5 @@
 from .user import User
 from .task import Task
-from .company import Company
\ No newline at end of file
+from .company import Company
+from .task_counter import TaskCounter
+from .job import Job
\ No newline at end of file
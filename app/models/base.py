@@ -1,12 +1,13 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, DateTime
-
-from app.utils.time_utils import get_current_utc_datetime
+from sqlalchemy import Column, DateTime, Integer, func, text
 
 Base = declarative_base()
 
 class BaseModel(Base):
     __abstract__ = True
 
-    created_at = Column(DateTime(timezone=True), nullable=False, default=get_current_utc_datetime())
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=get_current_utc_datetime(), onupdate=get_current_utc_datetime())
\ No newline at end of file
+    # Stamped by the database on every INSERT/UPDATE, they come back through RETURNING
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    # Incremented by every UPDATE, ETags are built from it and If-Match compares against it
+    version = Column(Integer, nullable=False, server_default=text('1'))
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, Text, Enum, DateTime, Integer, Boolean, UUID, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+import uuid
+import enum
+from .base import BaseModel
+
+class JobStatusEnum(enum.Enum):
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+    CANCELLED = 'CANCELLED'
+
+
+class Job(BaseModel):
+    __tablename__: str = 'jobs'
+    __table_args__ = (
+        # Workers claim the oldest due job of a status
+        Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(length=64), nullable=False)
+    status = Column(Enum(JobStatusEnum), nullable=False, default=JobStatusEnum.QUEUED)
+    payload = Column(JSONB, nullable=False, server_default='{}')
+    progress = Column(JSONB, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, server_default='0')
+    max_attempts = Column(Integer, nullable=False, server_default='3')
+    # Not claimed before this time, pushed back by the retry backoff
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Set on every claim, a worker only writes to the job while its token is still the current one
+    lease_token = Column(UUID(as_uuid=True), nullable=True)
+    # Extended by the running worker's heartbeat, an expired lease lets another worker take the job over
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, server_default='false')
+    created_by = Column(UUID(as_uuid=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
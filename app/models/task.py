@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Text, Enum, DateTime, ForeignKey, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Enum, DateTime, ForeignKey, UUID, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 import enum
 from .base import BaseModel
@@ -16,8 +17,25 @@ class PriorityEnum(enum.Enum):
     HIGH = 'HIGH'
 
 
+# Text search configuration of tasks.search_vector, queries must use the same one to hit the GIN index
+SEARCH_CONFIG = 'english'
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+# LISTEN/NOTIFY channel of the task change feed, event ids come from the sequence so every worker sees the same ids
+TASK_CHANGES_CHANNEL = 'task_changes'
+TASK_CHANGE_ID_SEQUENCE = 'task_change_id_seq'
+
 class Task(BaseModel):
     __tablename__: str = 'tasks'
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id), globally and per owner
+        Index('ix_tasks_created_at_id', 'created_at', 'id'),
+        Index('ix_tasks_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_tasks_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
@@ -25,5 +43,7 @@ class Task(BaseModel):
     description = Column(Text, nullable=True)
     status = Column(Enum(StatusEnum), nullable=False, default=StatusEnum.TODO)
     priority = Column(Enum(PriorityEnum), nullable=False, default=PriorityEnum.MEDIUM)
+    # Generated by Postgres from summary (weight A) and description (weight B), only used in WHERE/ORDER BY
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
 
     user = relationship("User", back_populates="tasks")
\ No newline at end of file
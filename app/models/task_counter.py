@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Enum, ForeignKey, UUID, BigInteger
+
+from .base import Base
+from .task import StatusEnum, PriorityEnum
+
+class TaskCounter(Base):
+    __tablename__ = 'task_counters'
+
+    # Kept exact by TaskService on every task write, rebuilt by app.commands.rebuild_task_counters
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    status = Column(Enum(StatusEnum), primary_key=True)
+    priority = Column(Enum(PriorityEnum), primary_key=True)
+    # Denormalized from users so company roll-ups never touch users or tasks
+    company_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    count = Column(BigInteger, nullable=False, default=0)
@@ -3,10 +3,7 @@ from sqlalchemy.orm import relationship
 import uuid
 
 from .base import BaseModel
-from passlib.context import CryptContext
-
-# Creating a CryptContext specifically for bcrypt
-bcrypt_context = CryptContext(schemes=["bcrypt"])
+from app.utils import password_utils
 
 class User(BaseModel):
     __tablename__ = 'users'
@@ -19,13 +16,14 @@ class User(BaseModel):
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
-    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=True)
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=True, index=True)
 
     tasks = relationship("Task", back_populates="user")
     company = relationship("Company", back_populates="users")
 
+# Blocking helpers for scripts and migrations, request handlers go through PasswordHasher
 def get_password_hash(password: str) -> str:
-    return bcrypt_context.hash(password)
+    return password_utils.hash_password(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return password_utils.verify_password(plain_password, hashed_password)
\ No newline at end of file
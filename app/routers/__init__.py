@@ -4,10 +4,18 @@ from .auth import router as auth_router
 from .company import router as company_router
 from .user import router as user_router
 from .task import router as task_router
+from .job import router as job_router
+from .stats import router as stats_router
+from .health import router as health_router
+from .metrics import router as metrics_router
 
 router = APIRouter()
 
 router.include_router(auth_router)
 router.include_router(company_router)
 router.include_router(user_router)
-router.include_router(task_router)
\ No newline at end of file
+router.include_router(task_router)
+router.include_router(job_router)
+router.include_router(stats_router)
+router.include_router(health_router)
+router.include_router(metrics_router)
\ No newline at end of file
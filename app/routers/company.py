@@ -1,44 +1,69 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from starlette import status
 
 from app.dependencies.auth import is_admin
+from app.dependencies.config import get_config, Settings
 from app.dependencies.services import get_company_service
 from app.exceptions.company_exceptions import CompanyNotFoundException
 from app.schemas.company import CompanyResponseDetail, CompanyCreate, CompanyUpdate
+from app.schemas.lookup import LookupRequest, LookupResponse
 from app.services import company_service as CompanyService
-from app.transformers.company_transformers import transform_to_company_response_detail
+from app.transformers.company_transformers import transform_to_company_response_detail, COMPANY_LIST_ADAPTER, COMPANY_LOOKUP_ADAPTER
+from app.transformers.lookup_transformers import generate_lookup_response
+from app.utils.http_cache_utils import make_etag, last_modified_of, is_conditional, is_not_modified, validator_headers, not_modified_response, if_match_versions
+from app.utils.replica_routing import read_only
+from app.utils.responses import ModelResponse
 
 router = APIRouter(prefix="/companies", tags=["Companies"], dependencies=[Depends(is_admin)])
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=List[CompanyResponseDetail])
 async def get_companies(company_service: CompanyService = Depends(get_company_service)):
     companies = await company_service.get_companies()
-    return [transform_to_company_response_detail(company) for company in companies]
+    return ModelResponse([transform_to_company_response_detail(company) for company in companies], COMPANY_LIST_ADAPTER)
 
 @router.get("/{company_id}", status_code=status.HTTP_200_OK, response_model=CompanyResponseDetail)
-async def get_company(company_id: UUID, company_service: CompanyService = Depends(get_company_service)):
+async def get_company(company_id: UUID, request: Request, response: Response, company_service: CompanyService = Depends(get_company_service)):
+    if is_conditional(request):
+        versions = await company_service.get_company_versions(company_id=company_id)
+        if not versions:
+            raise CompanyNotFoundException()
+        etag, last_modified = make_etag(versions.version), last_modified_of(versions.updated_at)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
     company_info = await company_service.get_company_by_id(company_id=company_id)
     if not company_info:
         raise CompanyNotFoundException()
+    # Validators of the body actually sent, which may come from the entity cache
+    response.headers.update(validator_headers(make_etag(company_info.version), last_modified_of(company_info.updated_at)))
     return transform_to_company_response_detail(company_info)
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=CompanyResponseDetail)
-def create_company(company: CompanyCreate, company_service: CompanyService = Depends(get_company_service)):
-    company_info = company_service.create_company(company=company)
+async def create_company(company: CompanyCreate, company_service: CompanyService = Depends(get_company_service)):
+    company_info = await company_service.create_company(company=company)
     return transform_to_company_response_detail(company_info)
 
+@router.post("/lookup", status_code=status.HTTP_200_OK, response_model=LookupResponse[CompanyResponseDetail])
+@read_only
+async def lookup_companies(lookup: LookupRequest, company_service: CompanyService = Depends(get_company_service)):
+    company_ids = list(dict.fromkeys(lookup.ids))
+    companies = await company_service.get_companies_by_ids(company_ids=company_ids)
+    return ModelResponse(generate_lookup_response(company_ids, companies, transform_to_company_response_detail), COMPANY_LOOKUP_ADAPTER)
+
 @router.put("/{company_id}", response_model=CompanyResponseDetail, status_code=status.HTTP_200_OK)
-async def update_company(company_id: UUID, company: CompanyUpdate, company_service: CompanyService = Depends(get_company_service)):
-    updated_company = await company_service.update_company(company_id=company_id, company=company)
+async def update_company(company_id: UUID, company: CompanyUpdate, request: Request, response: Response, company_service: CompanyService = Depends(get_company_service)):
+    # If-Match mismatches answer 412, a stale body version 409
+    updated_company = await company_service.update_company(company_id=company_id, company_update=company, if_match=if_match_versions(request))
     if not updated_company:
         raise CompanyNotFoundException()
+    response.headers.update(validator_headers(make_etag(updated_company.version), last_modified_of(updated_company.updated_at)))
     return transform_to_company_response_detail(updated_company)
 
 @router.delete("/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_company(company_id: UUID, company_service: CompanyService = Depends(get_company_service)):
-    result = await company_service.delete_company(company_id=company_id)
+async def delete_company(company_id: UUID, company_service: CompanyService = Depends(get_company_service), config: Settings = Depends(get_config)):
+    # Also deletes the company's users and their tasks
+    result = await company_service.delete_company(company_id=company_id, batch_size=config.CASCADE_DELETE_BATCH_SIZE)
     if not result:
         raise CompanyNotFoundException()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette import status
+
+from app.dependencies.config import get_config
+from app.dependencies.db import get_engine
+from app.utils.db_pool import get_pool_stats
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+async def ping_database() -> float:
+    started = time.perf_counter()
+    async with get_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+@router.get("/live", status_code=status.HTTP_200_OK)
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness(request: Request):
+    # Not ready before the lifespan warm-up opened the pool, nor once shutdown started
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "starting"})
+    pool = get_pool_stats(get_engine().pool)
+    try:
+        latency_ms = await asyncio.wait_for(ping_database(), timeout=get_config().HEALTH_CHECK_TIMEOUT)
+    except Exception as error:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "error": type(error).__name__, "pool": pool},
+        )
+    return {"status": "ok", "db_latency_ms": round(latency_ms, 3), "pool": pool}
@@ -0,0 +1,65 @@
+import os
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from starlette import status
+
+from app.dependencies.auth import is_admin
+from app.dependencies.config import get_config
+from app.dependencies.jobs import get_job_runner
+from app.dependencies.services import get_job_service
+from app.exceptions.job_exceptions import JobNotFoundException, JobNotCancellableException, JobResultNotAvailableException, InvalidJobPayloadException
+from app.jobs.handlers import get_job_definition
+from app.models.job import JobStatusEnum
+from app.schemas.job import JobCreate, JobResponseDetail, JobKindEnum
+from app.schemas.task import ExportFormatEnum
+from app.schemas.user import UserInToken
+from app.services.job_service import JobService
+from app.transformers.job_transformers import transform_to_job_response_detail
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], dependencies=[Depends(is_admin)])
+
+EXPORT_MEDIA_TYPES = {ExportFormatEnum.CSV.value: "text/csv", ExportFormatEnum.NDJSON.value: "application/x-ndjson"}
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED, response_model=JobResponseDetail)
+async def create_job(job: JobCreate, job_service: JobService = Depends(get_job_service), current_user: UserInToken = Depends(is_admin)):
+    try:
+        payload = get_job_definition(job.kind.value).payload_model(**job.payload)
+    except ValidationError as error:
+        raise InvalidJobPayloadException(detail=error.errors(include_url=False))
+    job_info = await job_service.create_job(
+        kind=job.kind.value, payload=payload.model_dump(mode="json"), max_attempts=job.max_attempts, created_by=current_user.id
+    )
+    if get_config().JOBS_CONCURRENCY > 0:
+        get_job_runner().wake()
+    return transform_to_job_response_detail(job_info)
+
+@router.get("/{job_id}", status_code=status.HTTP_200_OK, response_model=JobResponseDetail)
+async def get_job(job_id: UUID, job_service: JobService = Depends(get_job_service)):
+    job_info = await job_service.get_job(job_id=job_id)
+    if not job_info:
+        raise JobNotFoundException()
+    return transform_to_job_response_detail(job_info)
+
+@router.post("/{job_id}/cancel", status_code=status.HTTP_202_ACCEPTED, response_model=JobResponseDetail)
+async def cancel_job(job_id: UUID, job_service: JobService = Depends(get_job_service)):
+    # Queued jobs are cancelled at once, running ones within a heartbeat interval
+    job_info, cancellable = await job_service.cancel_job(job_id=job_id)
+    if not job_info:
+        raise JobNotFoundException()
+    if not cancellable:
+        raise JobNotCancellableException(detail=f"Job already {job_info.status.value.lower()}")
+    return transform_to_job_response_detail(job_info)
+
+@router.get("/{job_id}/download", status_code=status.HTTP_200_OK, response_class=FileResponse)
+async def download_job_result(job_id: UUID, job_service: JobService = Depends(get_job_service)):
+    job_info = await job_service.get_job(job_id=job_id)
+    if not job_info:
+        raise JobNotFoundException()
+    path = (job_info.result or {}).get("path")
+    if job_info.kind != JobKindEnum.EXPORT_TASKS.value or job_info.status != JobStatusEnum.SUCCEEDED or not path or not os.path.exists(path):
+        raise JobResultNotAvailableException()
+    export_format = job_info.result["format"]
+    return FileResponse(path, media_type=EXPORT_MEDIA_TYPES[export_format], filename=f"tasks-{job_id}.{export_format}")
\ No newline at end of file
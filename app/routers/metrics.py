@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import metrics_registry
+
+router = APIRouter(tags=["Metrics"])
+
+# Unauthenticated like /health so Prometheus can scrape it, counters are per worker process
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
\ No newline at end of file
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+
+from app.dependencies.auth import is_admin
+from app.dependencies.db import get_engine, get_replica_engines
+from app.dependencies.security import get_token_cache
+from app.dependencies.cache import get_entity_cache
+from app.dependencies.task_feed import get_task_feed
+from app.utils.db_pool import get_pool_stats
+
+router = APIRouter(prefix="/stats", tags=["Stats"], dependencies=[Depends(is_admin)])
+
+@router.get("/token-cache", status_code=status.HTTP_200_OK)
+async def get_token_cache_stats():
+    token_cache = get_token_cache()
+    return token_cache.stats() if token_cache else {"enabled": False}
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_db_pool_stats():
+    stats = get_pool_stats(get_engine().pool)
+    stats["replicas"] = [get_pool_stats(engine.pool) for engine in get_replica_engines()]
+    return stats
+
+@router.get("/entity-cache", status_code=status.HTTP_200_OK)
+async def get_entity_cache_stats():
+    entity_cache = get_entity_cache()
+    return entity_cache.stats() if entity_cache else {"enabled": False}
+
+@router.get("/task-feed", status_code=status.HTTP_200_OK)
+async def get_task_feed_stats():
+    return get_task_feed().stats()
\ No newline at end of file
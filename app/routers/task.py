@@ -1,26 +1,57 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from starlette import status as StatusCode
 
 from app.dependencies.auth import is_authenticated, is_admin
+from app.dependencies.config import get_config, Settings
+from app.dependencies.db import AsyncSessionLocal
 from app.dependencies.services import get_task_service, get_user_service
-from app.exceptions.task_exceptions import TaskNotFoundException
+from app.dependencies.task_feed import get_task_feed
+from app.exceptions.task_exceptions import TaskNotFoundException, BulkTaskCreateException
 from app.exceptions.user_exceptions import UserNotFoundException
-from app.models import User
+from app.models import Task, User
 from app.models.task import StatusEnum, PriorityEnum
-from app.schemas.task import TaskResponseDetail, TaskCreate, TaskUpdate
+from app.schemas.lookup import LookupRequest, LookupResponse
+from app.schemas.paginate import CountModeEnum
+from app.schemas.task import TaskResponseDetail, TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkCreateResponse, BulkModeEnum, BulkItemStatusEnum, ExportFormatEnum, TaskStatsResponse, TaskSearchResponse
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
-from app.transformers.task_transformers import transform_to_task_response, TasksPaginatedResponse, generate_tasks_paginated_response
+from app.transformers.task_transformers import transform_to_task_response, TasksPaginatedResponse, generate_tasks_paginated_response, transform_to_task_export_row, TASK_EXPORT_FIELDS, TASK_LIST_ADAPTER, TASKS_PAGINATED_ADAPTER, transform_to_task_stats_response, TASK_SEARCH_ADAPTER, generate_task_search_response, TASK_LOOKUP_ADAPTER
+from app.transformers.lookup_transformers import generate_lookup_response
+from app.utils.cursor_utils import decode_cursor, decode_rank_cursor
+from app.utils.export_utils import encode_ndjson, encode_csv
+from app.utils.http_cache_utils import make_etag, last_modified_of, is_conditional, is_not_modified, validator_headers, not_modified_response, if_match_versions
+from app.utils.replica_routing import read_only
+from app.utils.responses import ModelResponse
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-async def check_user_exists(user_id: UUID, user_service: UserService):
-    company = await user_service.get_user_by_id(user_id)
-    if not company:
+async def check_user_exists(user_id: UUID, user_service: UserService) -> User:
+    user = await user_service.get_user_by_id(user_id)
+    if not user:
         raise UserNotFoundException(detail=f"User with ID {user_id} not found")
+    return user
+
+def task_validator_headers(task: Task) -> dict:
+    return validator_headers(make_etag(task.version, task.user.version), last_modified_of(task.updated_at, task.user.updated_at))
+
+def stream_tasks_response(export_format: ExportFormatEnum, user_id: Optional[UUID] = None, status: Optional[StatusEnum] = None, priority: Optional[PriorityEnum] = None) -> StreamingResponse:
+    async def rows():
+        # The request scoped session is closed before the body streams, so the export owns its session
+        async with AsyncSessionLocal() as session:
+            async for row in TaskService(async_session=session).stream_tasks(user_id=user_id, status=status, priority=priority):
+                yield transform_to_task_export_row(row)
+
+    if export_format == ExportFormatEnum.CSV:
+        return StreamingResponse(
+            encode_csv(rows(), TASK_EXPORT_FIELDS),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="tasks.csv"'}
+        )
+    return StreamingResponse(encode_ndjson(rows()), media_type="application/x-ndjson")
 
 @router.get("", status_code=StatusCode.HTTP_200_OK, response_model=TasksPaginatedResponse, dependencies=[Depends(is_authenticated)])
 async def get_tasks(
@@ -28,54 +59,191 @@ async def get_tasks(
         priority: Optional[PriorityEnum] = Query(None),
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="Opaque next_cursor of the previous page, takes precedence over skip"),
+        count: CountModeEnum = Query(CountModeEnum.EXACT, description="How the total is computed, 'none' leaves it null"),
         task_service: TaskService = Depends(get_task_service),
         current_user: User = Depends(is_authenticated)
 ):
+    seek = decode_cursor(cursor) if cursor else None
+    if seek is not None:
+        skip = 0
     if current_user.is_admin:
-        tasks, total = await task_service.get_tasks(status=status, priority=priority, skip=skip, limit=limit)
+        tasks, total, last_task = await task_service.get_tasks(status=status, priority=priority, skip=skip, limit=limit, cursor=seek, count_mode=count)
     else:
-        tasks, total = await task_service.get_tasks(user_id=current_user.id, status=status, priority=priority, skip=skip, limit=limit)
-    return generate_tasks_paginated_response(tasks, total, skip, limit)
+        tasks, total, last_task = await task_service.get_tasks(user_id=current_user.id, status=status, priority=priority, skip=skip, limit=limit, cursor=seek, count_mode=count)
+    return ModelResponse(generate_tasks_paginated_response(tasks, total, skip, limit, last_task), TASKS_PAGINATED_ADAPTER)
+
+@router.get("/export", status_code=StatusCode.HTTP_200_OK, dependencies=[Depends(is_authenticated)])
+async def export_tasks(
+        format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON),
+        status: Optional[StatusEnum] = Query(None),
+        priority: Optional[PriorityEnum] = Query(None),
+        user_id: Optional[UUID] = Query(None),
+        current_user: User = Depends(is_authenticated)
+):
+    # Same visibility as GET /tasks: non-admins only ever export their own tasks
+    if not current_user.is_admin:
+        user_id = current_user.id
+    return stream_tasks_response(format, user_id=user_id, status=status, priority=priority)
+
+@router.get("/search", status_code=StatusCode.HTTP_200_OK, response_model=TaskSearchResponse, dependencies=[Depends(is_authenticated)])
+async def search_tasks(
+        q: str = Query(..., min_length=1, max_length=256, description="Words, \"quoted phrases\", or, -excluded (websearch syntax)"),
+        status: Optional[StatusEnum] = Query(None),
+        priority: Optional[PriorityEnum] = Query(None),
+        user_id: Optional[UUID] = Query(None),
+        limit: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="Opaque next_cursor of the previous page"),
+        task_service: TaskService = Depends(get_task_service),
+        current_user: User = Depends(is_authenticated)
+):
+    # Same visibility as GET /tasks: non-admins only ever search their own tasks
+    if not current_user.is_admin:
+        user_id = current_user.id
+    seek = decode_rank_cursor(cursor) if cursor else None
+    rows, last_row = await task_service.search_tasks(q=q, user_id=user_id, status=status, priority=priority, limit=limit, cursor=seek)
+    return ModelResponse(generate_task_search_response(rows, limit, last_row), TASK_SEARCH_ADAPTER)
+
+@router.get("/stats", status_code=StatusCode.HTTP_200_OK, response_model=TaskStatsResponse, dependencies=[Depends(is_authenticated)])
+async def get_task_stats(
+        user_id: Optional[UUID] = Query(None),
+        company_id: Optional[UUID] = Query(None),
+        task_service: TaskService = Depends(get_task_service),
+        current_user: User = Depends(is_authenticated)
+):
+    # Served from task_counters, non-admins only see their own numbers
+    if not current_user.is_admin:
+        user_id, company_id = current_user.id, None
+    counts = await task_service.get_task_stats(user_id=user_id, company_id=company_id)
+    return transform_to_task_stats_response(counts)
+
+@router.get("/stream", status_code=StatusCode.HTTP_200_OK, dependencies=[Depends(is_authenticated)])
+async def stream_task_changes(
+        user_id: Optional[UUID] = Query(None),
+        company_id: Optional[UUID] = Query(None),
+        last_event_id: Optional[int] = Header(None, description="Id of the last event received, sent by EventSource on reconnect"),
+        config: Settings = Depends(get_config),
+        current_user: User = Depends(is_authenticated)
+):
+    # Server-sent events of task changes, same visibility as GET /tasks: non-admins only follow their own tasks
+    if not current_user.is_admin:
+        user_id, company_id = current_user.id, None
+    task_feed = get_task_feed()
+
+    async def frames():
+        # Subscribed once the body streams, so a stream that never starts leaves nothing registered
+        subscriber = task_feed.subscribe(
+            user_id=str(user_id) if user_id else None, company_id=str(company_id) if company_id else None, last_event_id=last_event_id
+        )
+        try:
+            while True:
+                yield b"".join(await subscriber.next_frames(config.TASK_FEED_KEEPALIVE_SECONDS))
+        finally:
+            task_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @router.get("/{task_id}", status_code=StatusCode.HTTP_200_OK, response_model=TaskResponseDetail, dependencies=[Depends(is_authenticated)])
-async def get_task(task_id: UUID, task_service: TaskService = Depends(get_task_service), current_user: User = Depends(is_authenticated)):
+async def get_task(task_id: UUID, request: Request, response: Response, task_service: TaskService = Depends(get_task_service), current_user: User = Depends(is_authenticated)):
+    if is_conditional(request):
+        versions = await task_service.get_task_versions(task_id=task_id, user_id=None if current_user.is_admin else current_user.id)
+        if not versions:
+            raise TaskNotFoundException()
+        etag, last_modified = make_etag(versions.version, versions.owner_version), last_modified_of(versions.updated_at, versions.owner_updated_at)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
     if current_user.is_admin:
         task_info = await task_service.get_task_by_id(task_id=task_id)
     else:
         task_info = await task_service.get_task_by_id_and_user_id(task_id=task_id, user_id=current_user.id)
     if not task_info:
         raise TaskNotFoundException()
+    # Validators of the body actually sent
+    response.headers.update(task_validator_headers(task_info))
     return transform_to_task_response(task_info)
 
 @router.get("/user/{user_id}", status_code=StatusCode.HTTP_200_OK, response_model=List[TaskResponseDetail], dependencies=[Depends(is_admin)])
 async def get_tasks_by_user_id(user_id: UUID, task_service: TaskService = Depends(get_task_service)):
     tasks = await task_service.get_tasks_by_user_id(user_id=user_id)
-    return [transform_to_task_response(task) for task in tasks]
+    return ModelResponse([transform_to_task_response(task) for task in tasks], TASK_LIST_ADAPTER)
+
+@router.get("/user/{user_id}/stream", status_code=StatusCode.HTTP_200_OK, dependencies=[Depends(is_admin)])
+async def stream_tasks_by_user_id(user_id: UUID, format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON)):
+    return stream_tasks_response(format, user_id=user_id)
 
 @router.get("/user/{user_id}/completed", status_code=StatusCode.HTTP_200_OK, response_model=List[TaskResponseDetail], dependencies=[Depends(is_authenticated)])
 async def get_completed_tasks_by_user_id(user_id: UUID, task_service: TaskService = Depends(get_task_service)):
     tasks = await task_service.get_tasks_by_user_id_and_status(user_id=user_id, status=StatusEnum.DONE)
-    return [transform_to_task_response(task) for task in tasks]
+    return ModelResponse([transform_to_task_response(task) for task in tasks], TASK_LIST_ADAPTER)
 
 @router.get("/company/{company_id}/completed", status_code=StatusCode.HTTP_200_OK, response_model=List[TaskResponseDetail], dependencies=[Depends(is_authenticated)])
-async def get_completed_tasks_by_company_id(company_id: UUID, task_service: TaskService = Depends(get_task_service)):
-    tasks = await task_service.get_tasks_by_company_id_and_status(company_id=company_id, status=StatusEnum.DONE)
-    return [transform_to_task_response(task) for task in tasks]
+async def get_completed_tasks_by_company_id(
+        company_id: UUID,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        task_service: TaskService = Depends(get_task_service)
+):
+    tasks = await task_service.get_tasks_by_company_id_and_status(company_id=company_id, status=StatusEnum.DONE, skip=skip, limit=limit)
+    return ModelResponse([transform_to_task_response(task) for task in tasks], TASK_LIST_ADAPTER)
 
 @router.post("", status_code=StatusCode.HTTP_201_CREATED, response_model=TaskResponseDetail, dependencies=[Depends(is_admin)])
 async def create_task(task_create: TaskCreate, task_service: TaskService = Depends(get_task_service), user_service: UserService = Depends(get_user_service)):
+    owner = None
     if task_create.user_id is not None:
-        await check_user_exists(task_create.user_id, user_service)
-    task = task_service.create_task(task_create=task_create)
+        owner = await check_user_exists(task_create.user_id, user_service)
+    task = await task_service.create_task(task_create=task_create, owner=owner)
     return transform_to_task_response(task)
 
+@router.post("/bulk", status_code=StatusCode.HTTP_201_CREATED, response_model=TaskBulkCreateResponse, dependencies=[Depends(is_admin)])
+async def create_tasks_bulk(
+        bulk_create: TaskBulkCreate,
+        response: Response,
+        task_service: TaskService = Depends(get_task_service),
+        user_service: UserService = Depends(get_user_service),
+        config: Settings = Depends(get_config)
+):
+    # Every referenced user is validated with a single query
+    existing_user_ids = await user_service.get_existing_user_ids(task.user_id for task in bulk_create.items)
+    atomic = bulk_create.mode == BulkModeEnum.ATOMIC
+    results = await task_service.create_tasks(
+        tasks_create=bulk_create.items,
+        existing_user_ids=existing_user_ids,
+        atomic=atomic,
+        chunk_size=config.TASK_BULK_CHUNK_SIZE
+    )
+    created = sum(1 for result in results if result.status == BulkItemStatusEnum.CREATED)
+    failed = sum(1 for result in results if result.status == BulkItemStatusEnum.FAILED)
+    if atomic and failed:
+        raise BulkTaskCreateException(detail=[result.model_dump(mode='json') for result in results if result.status == BulkItemStatusEnum.FAILED])
+    if failed:
+        response.status_code = StatusCode.HTTP_207_MULTI_STATUS
+    return TaskBulkCreateResponse(created=created, failed=failed, items=results)
+
+@router.post("/lookup", status_code=StatusCode.HTTP_200_OK, response_model=LookupResponse[TaskResponseDetail], dependencies=[Depends(is_authenticated)])
+@read_only
+async def lookup_tasks(lookup: LookupRequest, task_service: TaskService = Depends(get_task_service), current_user: User = Depends(is_authenticated)):
+    # Same visibility as GET /tasks/{task_id}: other users' tasks are reported as missing to non-admins
+    task_ids = list(dict.fromkeys(lookup.ids))
+    tasks = await task_service.get_tasks_by_ids(task_ids=task_ids, user_id=None if current_user.is_admin else current_user.id)
+    return ModelResponse(generate_lookup_response(task_ids, tasks, transform_to_task_response), TASK_LOOKUP_ADAPTER)
+
 @router.put("/{task_id}", status_code=StatusCode.HTTP_200_OK, response_model=TaskResponseDetail, dependencies=[Depends(is_admin)])
-async def update_task(task_id: UUID, task_update: TaskUpdate, task_service: TaskService = Depends(get_task_service), user_service: UserService = Depends(get_user_service)):
+async def update_task(
+        task_id: UUID,
+        task_update: TaskUpdate,
+        request: Request,
+        response: Response,
+        task_service: TaskService = Depends(get_task_service),
+        user_service: UserService = Depends(get_user_service)
+):
+    owner = None
     if task_update.user_id is not None:
-        await check_user_exists(task_update.user_id, user_service)
-    task = await task_service.update_task(task_id=task_id, task_update=task_update)
+        owner = await check_user_exists(task_update.user_id, user_service)
+    # If-Match mismatches answer 412, a stale body version 409
+    task = await task_service.update_task(task_id=task_id, task_update=task_update, owner=owner, if_match=if_match_versions(request))
     if not task:
         raise TaskNotFoundException
+    response.headers.update(task_validator_headers(task))
     return transform_to_task_response(task)
 
 @router.delete("/{task_id}", status_code=StatusCode.HTTP_200_OK, dependencies=[Depends(is_admin)])
@@ -1,55 +1,93 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from starlette import status
 
 from app.dependencies.services import get_user_service, get_company_service
 from app.dependencies.auth import is_admin
+from app.dependencies.config import get_config, Settings
 from app.exceptions.company_exceptions import CompanyNotFoundException
 from app.exceptions.user_exceptions import UserNotFoundException
+from app.models import Company, User
+from app.schemas.lookup import LookupRequest, LookupResponse
 from app.schemas.user import UserResponseDetail, UserCreate, UserUpdate
 from app.services.company_service import CompanyService
 from app.services.user_service import UserService
-from app.transformers.user_transformers import transform_to_user_response
+from app.transformers.lookup_transformers import generate_lookup_response
+from app.transformers.user_transformers import transform_to_user_response, USER_LIST_ADAPTER, USER_LOOKUP_ADAPTER
+from app.utils.http_cache_utils import make_etag, last_modified_of, is_conditional, is_not_modified, validator_headers, not_modified_response, if_match_versions
+from app.utils.replica_routing import read_only
+from app.utils.responses import ModelResponse
 
 router = APIRouter(prefix="/users", tags=["Users"], dependencies=[Depends(is_admin)])
 
-async def check_company_exists(company_id: UUID, company_service: CompanyService):
+async def check_company_exists(company_id: UUID, company_service: CompanyService) -> Company:
     company = await company_service.get_company_by_id(company_id)
     if not company:
         raise CompanyNotFoundException(detail=f"Company with ID {company_id} not found")
+    return company
+
+def user_validator_headers(user: User) -> dict:
+    return validator_headers(make_etag(user.version, user.company.version), last_modified_of(user.updated_at, user.company.updated_at))
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=List[UserResponseDetail])
 async def get_users(user_service: UserService = Depends(get_user_service)):
     users = await user_service.get_users()
-    return [transform_to_user_response(user) for user in users]
+    return ModelResponse([transform_to_user_response(user) for user in users], USER_LIST_ADAPTER)
 
 @router.get("/{user_id}", status_code=status.HTTP_200_OK, response_model=UserResponseDetail)
-async def get_user(user_id: UUID, user_service: UserService = Depends(get_user_service)):
+async def get_user(user_id: UUID, request: Request, response: Response, user_service: UserService = Depends(get_user_service)):
+    if is_conditional(request):
+        versions = await user_service.get_user_versions(user_id=user_id)
+        if not versions:
+            raise UserNotFoundException()
+        etag, last_modified = make_etag(versions.version, versions.company_version), last_modified_of(versions.updated_at, versions.company_updated_at)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
     user_info = await user_service.get_user_by_id(user_id=user_id)
     if not user_info:
         raise UserNotFoundException()
+    # Validators of the body actually sent, which may come from the entity cache
+    response.headers.update(user_validator_headers(user_info))
     return transform_to_user_response(user_info)
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserResponseDetail)
 async def create_user(user_create: UserCreate, user_service: UserService = Depends(get_user_service), company_service: CompanyService = Depends(get_company_service)):
+    company = None
     if user_create.company_id is not None:
-        await check_company_exists(user_create.company_id, company_service)
-    user_info = user_service.create_user(user_create=user_create)
+        company = await check_company_exists(user_create.company_id, company_service)
+    user_info = await user_service.create_user(user_create=user_create, company=company)
     return transform_to_user_response(user_info)
 
+@router.post("/lookup", status_code=status.HTTP_200_OK, response_model=LookupResponse[UserResponseDetail])
+@read_only
+async def lookup_users(lookup: LookupRequest, user_service: UserService = Depends(get_user_service)):
+    user_ids = list(dict.fromkeys(lookup.ids))
+    users = await user_service.get_users_by_ids(user_ids=user_ids)
+    return ModelResponse(generate_lookup_response(user_ids, users, transform_to_user_response), USER_LOOKUP_ADAPTER)
+
 @router.put("/{user_id}", status_code=status.HTTP_200_OK, response_model=UserResponseDetail)
-async def update_user(user_id: UUID, user_update: UserUpdate, user_service: UserService = Depends(get_user_service), company_service: CompanyService = Depends(get_company_service)):
+async def update_user(
+        user_id: UUID,
+        user_update: UserUpdate,
+        request: Request,
+        response: Response,
+        user_service: UserService = Depends(get_user_service),
+        company_service: CompanyService = Depends(get_company_service)
+):
+    company = None
     if user_update.company_id is not None:
-        await check_company_exists(user_update.company_id, company_service)
-    user_info = await user_service.update_user(user_id=user_id, user_update=user_update)
+        company = await check_company_exists(user_update.company_id, company_service)
+    # If-Match mismatches answer 412, a stale body version 409
+    user_info = await user_service.update_user(user_id=user_id, user_update=user_update, company=company, if_match=if_match_versions(request))
     if not user_info:
         raise UserNotFoundException()
+    response.headers.update(user_validator_headers(user_info))
     return transform_to_user_response(user_info)
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: UUID, user_service: UserService = Depends(get_user_service)):
-    success = await user_service.delete_user(user_id=user_id)
+async def delete_user(user_id: UUID, user_service: UserService = Depends(get_user_service), config: Settings = Depends(get_config)):
+    success = await user_service.delete_user(user_id=user_id, batch_size=config.CASCADE_DELETE_BATCH_SIZE)
     if not success:
         raise UserNotFoundException()
\ No newline at end of file
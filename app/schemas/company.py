@@ -13,6 +13,7 @@ class CompanyUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     mode: Optional[bool] = None
+    version: Optional[int] = None
 
 class CompanyInfo(BaseModel):
     company_id: UUID
@@ -25,6 +26,7 @@ class CompanyResponseDetail(BaseModel):
     description: Optional[str]
     status: Optional[str]
     created_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
\ No newline at end of file
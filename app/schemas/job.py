@@ -0,0 +1,54 @@
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.job import JobStatusEnum
+from app.models.task import StatusEnum, PriorityEnum
+from app.schemas.task import ExportFormatEnum
+
+class JobKindEnum(str, enum.Enum):
+    DELETE_USER = 'delete_user'
+    DELETE_COMPANY = 'delete_company'
+    REASSIGN_TASKS = 'reassign_tasks'
+    EXPORT_TASKS = 'export_tasks'
+
+class JobCreate(BaseModel):
+    kind: JobKindEnum
+    # Validated against the payload model of the kind
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    max_attempts: int = Field(3, ge=1, le=10)
+
+class JobResponseDetail(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatusEnum
+    payload: Dict[str, Any]
+    progress: Optional[Dict[str, Any]]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+class DeleteUserJobPayload(BaseModel):
+    user_id: UUID
+
+class DeleteCompanyJobPayload(BaseModel):
+    company_id: UUID
+
+class ReassignTasksJobPayload(BaseModel):
+    from_user_id: UUID
+    to_user_id: UUID
+    status: Optional[StatusEnum] = None
+
+class ExportTasksJobPayload(BaseModel):
+    format: ExportFormatEnum = ExportFormatEnum.NDJSON
+    user_id: Optional[UUID] = None
+    status: Optional[StatusEnum] = None
+    priority: Optional[PriorityEnum] = None
\ No newline at end of file
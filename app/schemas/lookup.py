@@ -0,0 +1,15 @@
+from typing import Generic, List, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+T = TypeVar('T')
+
+class LookupRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=5000)
+
+class LookupResponse(BaseModel, Generic[T]):
+    # Found entities in the order of the requested ids, duplicates collapsed
+    items: List[T]
+    # Requested ids that do not exist or are not visible to the caller
+    missing: List[UUID]
\ No newline at end of file
@@ -1,11 +1,18 @@
-from typing import Generic, List, TypeVar
+import enum
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel
 
 T = TypeVar('T')
 
+class CountModeEnum(str, enum.Enum):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    NONE = 'none'
+
 class PaginatedResponse(BaseModel, Generic[T]):
-    total: int
+    total: Optional[int]
     page: int
     size: int
-    items: List[T]
\ No newline at end of file
+    items: List[T]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,8 +1,9 @@
+import enum
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.task import StatusEnum, PriorityEnum
 from app.schemas.user import UserInfo
@@ -20,6 +21,7 @@ class TaskUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[StatusEnum] = None
     priority: Optional[PriorityEnum] = None
+    version: Optional[int] = None
 
 class TaskResponseDetail(BaseModel):
     task_id: UUID
@@ -28,4 +30,52 @@ class TaskResponseDetail(BaseModel):
     description: Optional[str]
     status: StatusEnum
     priority: PriorityEnum
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+    version: int
+
+class TaskSearchResultDetail(TaskResponseDetail):
+    rank: float
+
+class TaskSearchResponse(BaseModel):
+    size: int
+    items: List[TaskSearchResultDetail]
+    next_cursor: Optional[str] = None
+
+class ExportFormatEnum(str, enum.Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+class BulkModeEnum(str, enum.Enum):
+    ATOMIC = 'atomic'
+    PARTIAL = 'partial'
+
+class BulkItemStatusEnum(str, enum.Enum):
+    CREATED = 'created'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=50000)
+    mode: BulkModeEnum = BulkModeEnum.ATOMIC
+
+class TaskBulkItemResult(BaseModel):
+    index: int
+    status: BulkItemStatusEnum
+    task_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+class TaskBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    items: List[TaskBulkItemResult]
+
+class TaskCountDetail(BaseModel):
+    status: StatusEnum
+    priority: PriorityEnum
+    count: int
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[StatusEnum, int]
+    by_priority: Dict[PriorityEnum, int]
+    counts: List[TaskCountDetail]
\ No newline at end of file
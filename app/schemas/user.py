@@ -40,6 +40,7 @@ class UserCreate(BaseModel):
 
 class UserUpdate(UserBase):
     password: Optional[str] = None
+    version: Optional[int] = None
 
 class UserResponseDetail(BaseModel):
     id: UUID
@@ -51,6 +52,7 @@ class UserResponseDetail(BaseModel):
     is_active: bool
     is_admin: bool
     created_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
\ No newline at end of file
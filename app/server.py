@@ -0,0 +1,70 @@
+"""
+Production entry point: python -m app.server
+
+Runs WEB_WORKERS uvicorn worker processes under uvicorn's supervisor, which replaces workers
+that exit, including the ones recycled after WEB_LIMIT_MAX_REQUESTS. On SIGTERM every worker
+stops accepting connections, lets in-flight requests finish for WEB_GRACEFUL_SHUTDOWN_SECONDS
+and then runs the lifespan shutdown, which closes the pools.
+"""
+import os
+from typing import Tuple
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.dependencies.config import get_config, get_replica_urls, Settings
+
+def worker_count(config: Settings) -> int:
+    return config.WEB_WORKERS or os.cpu_count() or 1
+
+# Connections each worker opens on the primary outside its pool: the task feed's LISTEN connection
+PRIMARY_RESERVED_CONNECTIONS = 1
+
+def worker_pool_limits(budget: int, workers: int, pool_size: int, max_overflow: int, reserved: int = 0) -> Tuple[int, int]:
+    # (pool_size, max_overflow) of one worker, so that workers * (pool_size + max_overflow + reserved) <= budget
+    if not budget:
+        return pool_size, max_overflow
+    per_worker = budget // workers - reserved
+    if per_worker < 1:
+        raise SystemExit(f"DB_CONNECTION_BUDGET={budget} leaves no connection for each of {workers} workers")
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+def serve():
+    config = get_config()
+    workers = worker_count(config)
+    # Replica pools share these settings, they stay within the budget with a connection to spare
+    pool_size, max_overflow = worker_pool_limits(
+        config.DB_CONNECTION_BUDGET, workers, config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW, reserved=PRIMARY_RESERVED_CONNECTIONS
+    )
+    # Workers read their own Settings and environment variables win over .env
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    get_config.cache_clear()
+    print(
+        f"{workers} workers, pool {pool_size} + {max_overflow} overflow each, "
+        f"at most {workers * (pool_size + max_overflow + PRIMARY_RESERVED_CONNECTIONS)} connections on the primary"
+        f" and {workers * (pool_size + max_overflow)} on each of {len(get_replica_urls())} replicas"
+    )
+
+    server_config = uvicorn.Config(
+        "app.main:app",
+        host=config.WEB_HOST,
+        port=config.WEB_PORT,
+        workers=workers,
+        loop=config.WEB_LOOP,
+        http=config.WEB_HTTP,
+        timeout_graceful_shutdown=config.WEB_GRACEFUL_SHUTDOWN_SECONDS,
+        timeout_keep_alive=config.WEB_KEEP_ALIVE_SECONDS,
+        limit_max_requests=config.WEB_LIMIT_MAX_REQUESTS or None,
+    )
+    server = uvicorn.Server(server_config)
+    if workers == 1 and server_config.limit_max_requests is None:
+        server.run()
+        return
+    # A single recycled worker needs the supervisor too, otherwise the whole server would exit with it
+    socket = server_config.bind_socket()
+    Multiprocess(server_config, target=server.run, sockets=[socket]).run()
+
+if __name__ == '__main__':
+    serve()
\ No newline at end of file
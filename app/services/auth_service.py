@@ -7,16 +7,22 @@ from app.models import user as UserModel
 from app.schemas.user import UserInToken
 from .user_service import UserService
 from app.utils.time_utils import get_current_utc_datetime
+from app.utils.token_cache import VerifiedTokenCache
 
 class AuthService:
-    def __init__(self, config, user_service: UserService):
+    def __init__(self, config, user_service: UserService, token_cache: Optional[VerifiedTokenCache] = None):
         self.config = config
         self.user_service = user_service
+        self.token_cache = token_cache
 
     async def authenticate_user(self, username: str, password: str) -> Optional[UserModel]:
         user = await self.user_service.fetch_user_by_username(username)
-        if not user or not UserModel.verify_password(password, user.hashed_password):
+        password_hasher = self.user_service.password_hasher
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             return False
+        # The configured cost changed since this hash was made, upgrade it while we know the plain password
+        if password_hasher.needs_rehash(user.hashed_password):
+            await self.user_service.update_password_hash(user.id, await password_hasher.hash(password))
         return user
 
     def create_access_token(self, user: UserModel, expires: Optional[timedelta] = None):
@@ -39,10 +45,16 @@ class AuthService:
             return None
 
     def get_current_user(self, token: str) -> UserInToken:
+        if self.token_cache is not None:
+            user = self.token_cache.get(token)
+            if user is not None:
+                return user
         payload = self.decode_token(token)
         if payload is None:
             raise UnauthorizedException(detail="Invalid authentication credentials")
         user = UserInToken(**payload)
+        if self.token_cache is not None:
+            self.token_cache.set(token, user, payload.get("exp", 0))
         return user
 
     @staticmethod
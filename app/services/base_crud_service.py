@@ -1,38 +1,105 @@
 from uuid import UUID
-from typing import Type, TypeVar
+from typing import Type, TypeVar, Iterable, Sequence, Collection, Optional
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, cast, Boolean
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, cast, Boolean, any_, literal, ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+
+from app.exceptions.service_exceptions import VersionConflictException, PreconditionFailedException
 
 ModelType = TypeVar("ModelType")
 
+# Bind parameters per statement allowed by the Postgres protocol, multi-row INSERTs stay below it
+MAX_BIND_PARAMETERS = 32767
+# SQLSTATE of a foreign key violation
+FOREIGN_KEY_VIOLATION = '23503'
+
+def id_in(model: Type[ModelType], model_ids: Iterable[UUID]) -> ColumnElement:
+    # id = ANY($1::UUID[]): a single bound array, the statement text is the same whatever the number of ids
+    return model.id == any_(literal(list(model_ids), ARRAY(PG_UUID(as_uuid=True))))
+
+def is_foreign_key_violation(error: DBAPIError) -> bool:
+    return getattr(error.orig, 'sqlstate', None) == FOREIGN_KEY_VIOLATION
+
 class BaseCRUDService:
-    def __init__(self, async_session: AsyncSession = None, sync_session: Session = None):
+    def __init__(self, async_session: AsyncSession = None, read_session: AsyncSession = None):
         self.async_session = async_session
-        self.sync_session = sync_session
+        # Listings, searches and lookups may read from a replica, everything else stays on the primary
+        self.read_session = read_session or async_session
 
     async def get_by_id(self, model: Type[ModelType], model_id: UUID) -> ModelType:
         result = await self.async_session.execute(select(model).where(cast(model.id == model_id, Boolean)))
         entity = result.scalar_one_or_none()
         return entity
 
-    async def update_by_id(self, model: Type[ModelType], model_id: UUID, update_data: dict) -> ModelType | None:
-        entity = self.sync_session.scalar(select(model).where(cast(model.id == model_id, Boolean)))
+    async def get_by_ids(self, model: Type[ModelType], model_ids: Sequence[UUID], *options) -> Sequence[ModelType]:
+        result = await self.read_session.execute(select(model).options(*options).where(id_in(model, model_ids)))
+        return result.scalars().all()
+
+    async def create(self, model: Type[ModelType], create_data: dict, commit: bool = True) -> ModelType:
+        # INSERT ... RETURNING hands back the generated columns, no refresh needed
+        result = await self.async_session.scalars(insert(model).values(**create_data).returning(model))
+        entity = result.one()
+        if commit:
+            await self.async_session.commit()
+
+        return entity
+
+    async def update_by_id(
+            self,
+            model: Type[ModelType],
+            model_id: UUID,
+            update_data: dict,
+            commit: bool = True,
+            if_match: Optional[Collection[int]] = None
+    ) -> ModelType | None:
+        # A 'version' in update_data is the version the client based its changes on, if_match the versions
+        # of an If-Match header; a row at another version raises 409 or 412 instead of being overwritten
+        update_data = dict(update_data)
+        expected_version = update_data.pop('version', None)
+        if not update_data:
+            entity = await self.get_by_id(model, model_id)
+            if entity is not None:
+                self._check_version(entity.version, expected_version, if_match)
+            return entity
+
+        # UPDATE ... RETURNING checks the version, changes and reloads the row in a single statement
+        statement = update(model).where(cast(model.id == model_id, Boolean))
+        if expected_version is not None:
+            statement = statement.where(model.version == expected_version)
+        if if_match is not None:
+            statement = statement.where(model.version.in_(if_match))
+        result = await self.async_session.scalars(
+            statement
+            .values(**update_data, version=model.version + 1)
+            .returning(model)
+            .execution_options(populate_existing=True)
+        )
+        entity = result.one_or_none()
         if not entity:
+            if expected_version is not None or if_match is not None:
+                # Missing or stale, only a failed precondition pays for this second lookup
+                current_version = await self.async_session.scalar(select(model.version).where(cast(model.id == model_id, Boolean)))
+                if current_version is not None:
+                    self._check_version(current_version, expected_version, if_match)
             return None
-        for attr, value in update_data.items():
-            setattr(entity, attr, value)
-        self.sync_session.add(entity)
-        self.sync_session.commit()
-        self.sync_session.refresh(entity)
+        if commit:
+            await self.async_session.commit()
 
         return entity
 
-    async def delete_by_id(self, model: Type[ModelType], model_id: UUID) -> bool:
-        async with self.async_session.begin():
-            entity = await self.get_by_id(model, model_id)
-            if not entity:
-                return False
-            await self.async_session.delete(entity)
+    @staticmethod
+    def _check_version(current_version: int, expected_version: Optional[int], if_match: Optional[Collection[int]]):
+        if if_match is not None and current_version not in if_match:
+            raise PreconditionFailedException()
+        if expected_version is not None and current_version != expected_version:
+            raise VersionConflictException(detail=f"Version {expected_version} is stale, the current version is {current_version}")
+
+    async def delete_by_id(self, model: Type[ModelType], model_id: UUID, commit: bool = True) -> bool:
+        # DELETE ... RETURNING finds and removes the row in a single statement, nothing is loaded
+        deleted_id = await self.async_session.scalar(delete(model).where(cast(model.id == model_id, Boolean)).returning(model.id))
+        if deleted_id is None:
+            return False
+        if commit:
             await self.async_session.commit()
-            return True
\ No newline at end of file
+        return True
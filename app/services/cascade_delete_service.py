@@ -0,0 +1,149 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, delete, Select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions.service_exceptions import VersionConflictException
+from app.models import Task, User, Company
+from app.utils.entity_cache import EntityCache, user_cache_key, company_cache_key
+from .base_crud_service import BaseCRUDService
+from .task_counter_service import TaskCounterService
+from .task_change_service import TaskChangeService, TaskChangeOperationEnum, task_change
+
+logger = logging.getLogger(__name__)
+
+# Rounds restarted because rows were attached to the owner meanwhile, before giving up with a conflict
+MAX_CASCADE_RETRIES = 3
+
+@dataclass
+class DeleteProgress:
+    tasks: int = 0
+    users: int = 0
+    # Committed transactions so far
+    batches: int = 0
+
+class CascadeDeleteService(BaseCRUDService):
+    """
+    Deletes a user with their tasks, or a company with its users and their tasks, set-based.
+
+    Children go first in DELETE ... WHERE id IN (SELECT ... LIMIT batch_size) statements, each full batch
+    committed on its own so no transaction holds more than batch_size row locks or writes an unbounded
+    amount of WAL. The last partial batch and the owner row share one transaction: owners with fewer
+    children than batch_size are removed atomically in two or three statements.
+    """
+
+    def __init__(
+            self,
+            async_session: AsyncSession = None,
+            entity_cache: Optional[EntityCache] = None,
+            batch_size: int = 1000,
+            on_progress: Optional[Callable[[DeleteProgress], None]] = None
+    ):
+        super().__init__(async_session)
+        self.entity_cache = entity_cache
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.task_counter_service = TaskCounterService(async_session)
+        self.task_change_service = TaskChangeService(async_session)
+        # Cache keys of rows deleted in the open transaction, dropped once it commits
+        self._pending_invalidations: List[str] = []
+        self._committed = DeleteProgress()
+
+    async def delete_user(self, user_id: UUID) -> Optional[DeleteProgress]:
+        # None when the user does not exist
+        return await self._cascade(
+            tasks_query=select(Task.id).where(Task.user_id == user_id),
+            users_query=None,
+            owner=User,
+            owner_id=user_id,
+            owner_cache_key=user_cache_key(user_id)
+        )
+
+    async def delete_company(self, company_id: UUID) -> Optional[DeleteProgress]:
+        # None when the company does not exist
+        return await self._cascade(
+            tasks_query=select(Task.id).join(Task.user).where(User.company_id == company_id),
+            users_query=select(User.id).where(User.company_id == company_id),
+            owner=Company,
+            owner_id=company_id,
+            owner_cache_key=company_cache_key(company_id)
+        )
+
+    async def _cascade(self, tasks_query: Select, users_query: Optional[Select], owner, owner_id: UUID, owner_cache_key: str) -> Optional[DeleteProgress]:
+        progress = self._committed = DeleteProgress()
+        retries = 0
+        while True:
+            await self._delete_tasks(tasks_query, progress)
+            try:
+                if users_query is not None:
+                    await self._delete_users(users_query, progress)
+                deleted = await self.delete_by_id(owner, owner_id, commit=False)
+            except IntegrityError as error:
+                # A task or user was attached to the owner meanwhile, the next round deletes it too
+                await self.async_session.rollback()
+                self._pending_invalidations.clear()
+                progress = replace(self._committed)
+                retries += 1
+                if retries > MAX_CASCADE_RETRIES:
+                    # Children keep coming faster than they are deleted, what was committed stays deleted
+                    logger.warning("cascade delete of %s %s gave up after %d retries", owner.__tablename__, owner_id, MAX_CASCADE_RETRIES)
+                    raise VersionConflictException("Rows are still being added to the resource, try deleting it again") from error
+                continue
+            if not deleted:
+                # Nothing was committed for a missing owner: no children can reference it
+                await self.async_session.rollback()
+                return None
+            self._pending_invalidations.append(owner_cache_key)
+            await self._commit(progress)
+            return progress
+
+    async def _delete_tasks(self, tasks_query: Select, progress: DeleteProgress):
+        while True:
+            removed = (await self.async_session.execute(
+                delete(Task)
+                .where(Task.id.in_(tasks_query.limit(self.batch_size).scalar_subquery()))
+                .returning(Task.id, Task.user_id, Task.status, Task.priority, Task.version)
+            )).all()
+            if removed:
+                # Stats stay exact while a large cascade is under way
+                deltas = Counter()
+                for row in removed:
+                    deltas[(row.user_id, row.status, row.priority)] -= 1
+                await self.task_counter_service.apply(deltas)
+                await self.task_change_service.publish([
+                    task_change(TaskChangeOperationEnum.DELETED, row.id, row.user_id, row.status, row.priority, row.version) for row in removed
+                ])
+            progress.tasks += len(removed)
+            if len(removed) < self.batch_size:
+                return
+            await self._commit(progress)
+
+    async def _delete_users(self, users_query: Select, progress: DeleteProgress):
+        while True:
+            # task_counters rows go with their users (ON DELETE CASCADE)
+            user_ids = (await self.async_session.scalars(
+                delete(User)
+                .where(User.id.in_(users_query.limit(self.batch_size).scalar_subquery()))
+                .returning(User.id)
+            )).all()
+            self._pending_invalidations.extend(user_cache_key(user_id) for user_id in user_ids)
+            progress.users += len(user_ids)
+            if len(user_ids) < self.batch_size:
+                return
+            await self._commit(progress)
+
+    async def _commit(self, progress: DeleteProgress):
+        await self.async_session.commit()
+        progress.batches += 1
+        self._committed = replace(progress)
+        if self.entity_cache is not None and self._pending_invalidations:
+            await self.entity_cache.delete(*self._pending_invalidations)
+        self._pending_invalidations.clear()
+        logger.info("cascade delete: %d tasks, %d users deleted in %d batches", progress.tasks, progress.users, progress.batches)
+        if self.on_progress is not None:
+            self.on_progress(progress)
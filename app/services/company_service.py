@@ -1,35 +1,57 @@
-from typing import Sequence
+from typing import Sequence, Optional, List
 from uuid import UUID
 
-from sqlalchemy import select, cast, Boolean, desc
+from sqlalchemy import select, cast, Boolean, desc, Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 
 from app.models import Company
 from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.utils.entity_cache import EntityCache, company_cache_key, entity_to_dict, dict_to_entity
 from .base_crud_service import BaseCRUDService
+from .cascade_delete_service import CascadeDeleteService
 
 class CompanyService(BaseCRUDService):
-    def __init__(self, async_session: AsyncSession = None, sync_session: Session = None):
-        super().__init__(async_session, sync_session)
+    def __init__(self, async_session: AsyncSession = None, entity_cache: Optional[EntityCache] = None, read_session: AsyncSession = None):
+        super().__init__(async_session, read_session)
+        self.entity_cache = entity_cache
 
     async def get_companies(self) -> Sequence[Company]:
-        result = await self.async_session.scalars(select(Company).order_by(desc(Company.created_at)))
+        result = await self.read_session.scalars(select(Company).order_by(desc(Company.created_at)))
         return result.all()
 
     async def get_company_by_id(self, company_id: UUID) -> Company:
-        result = await self.async_session.execute(select(Company).filter(cast(Company.id == company_id, Boolean)))
-        return result.scalar_one_or_none()
-
-    def create_company(self, company: CompanyCreate):
-        db_company = Company(**company.model_dump())
-        self.sync_session.add(db_company)
-        self.sync_session.commit()
-        self.sync_session.refresh(db_company)
-        return db_company
+        if self.entity_cache is not None:
+            cached = await self.entity_cache.get(company_cache_key(company_id))
+            if cached is not None:
+                return dict_to_entity(Company, cached)
 
-    async def update_company(self, company_id: UUID, company_update: CompanyUpdate) -> Company | None:
-        return await self.update_by_id(Company, company_id, company_update.model_dump(exclude_unset=True))
-
-    async def delete_company(self, company_id: UUID) -> bool:
-        return await self.delete_by_id(Company, company_id)
\ No newline at end of file
+        result = await self.async_session.execute(select(Company).filter(cast(Company.id == company_id, Boolean)))
+        company = result.scalar_one_or_none()
+        if company is not None and self.entity_cache is not None:
+            await self.entity_cache.set(company_cache_key(company_id), entity_to_dict(company))
+        return company
+
+    async def get_companies_by_ids(self, company_ids: Sequence[UUID]) -> Sequence[Company]:
+        return await self.get_by_ids(Company, company_ids)
+
+    async def get_company_versions(self, company_id: UUID) -> Optional[Row]:
+        # Primary key lookup of the version and timestamp only, enough to answer a conditional GET
+        result = await self.async_session.execute(select(Company.version, Company.updated_at).filter(cast(Company.id == company_id, Boolean)))
+        return result.one_or_none()
+
+    async def create_company(self, company: CompanyCreate) -> Company:
+        return await self.create(Company, company.model_dump())
+
+    async def update_company(self, company_id: UUID, company_update: CompanyUpdate, if_match: Optional[List[int]] = None) -> Company | None:
+        company = await self.update_by_id(Company, company_id, company_update.model_dump(exclude_unset=True), if_match=if_match)
+        await self._invalidate(company_id)
+        return company
+
+    async def delete_company(self, company_id: UUID, batch_size: int = 1000) -> bool:
+        # Its users and their tasks go first in committed batches, the company row and cache entries last
+        progress = await CascadeDeleteService(self.async_session, entity_cache=self.entity_cache, batch_size=batch_size).delete_company(company_id)
+        return progress is not None
+
+    async def _invalidate(self, company_id: UUID):
+        if self.entity_cache is not None:
+            await self.entity_cache.delete(company_cache_key(company_id))
\ No newline at end of file
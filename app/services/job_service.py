@@ -0,0 +1,130 @@
+import uuid
+from datetime import timedelta
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update, cast, Boolean, or_, and_, case, func
+
+from app.models import Job
+from app.models.job import JobStatusEnum
+from .base_crud_service import BaseCRUDService
+
+class JobService(BaseCRUDService):
+    """
+    The jobs table as a queue. Workers claim jobs with FOR UPDATE SKIP LOCKED, so concurrent
+    claims never wait on each other or get the same job, and hold them under a lease their
+    heartbeat extends; every write of a worker is guarded by the lease token of its claim.
+    """
+
+    async def create_job(self, kind: str, payload: dict, max_attempts: int, created_by: Optional[UUID] = None) -> Job:
+        return await self.create(Job, {
+            'kind': kind,
+            'payload': payload,
+            'max_attempts': max_attempts,
+            'status': JobStatusEnum.QUEUED,
+            'created_by': created_by,
+        })
+
+    async def get_job(self, job_id: UUID) -> Optional[Job]:
+        return await self.get_by_id(Job, job_id)
+
+    async def cancel_job(self, job_id: UUID) -> Tuple[Optional[Job], bool]:
+        # Queued jobs are cancelled right away, running ones by their worker once its heartbeat sees the flag.
+        # Returns the job and whether it was still cancellable.
+        result = await self.async_session.scalars(
+            update(Job)
+            .where(cast(Job.id == job_id, Boolean), Job.status.in_((JobStatusEnum.QUEUED, JobStatusEnum.RUNNING)))
+            .values(
+                cancel_requested=True,
+                status=case((Job.status == JobStatusEnum.QUEUED, JobStatusEnum.CANCELLED), else_=Job.status),
+                finished_at=case((Job.status == JobStatusEnum.QUEUED, func.now()), else_=Job.finished_at),
+                version=Job.version + 1,
+            )
+            .returning(Job)
+            .execution_options(populate_existing=True)
+        )
+        job = result.one_or_none()
+        if job is not None:
+            await self.async_session.commit()
+            return job, True
+        return await self.get_job(job_id), False
+
+    async def claim_job(self, lease_seconds: float) -> Optional[Job]:
+        # Due queued jobs, and running ones whose worker stopped renewing the lease
+        claimable = (
+            select(Job.id)
+            .where(or_(
+                and_(Job.status == JobStatusEnum.QUEUED, Job.run_after <= func.now()),
+                and_(Job.status == JobStatusEnum.RUNNING, Job.locked_until < func.now()),
+            ))
+            .order_by(Job.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.async_session.scalars(
+            update(Job)
+            .where(Job.id == claimable.scalar_subquery())
+            .values(
+                status=JobStatusEnum.RUNNING,
+                attempts=Job.attempts + 1,
+                lease_token=uuid.uuid4(),
+                locked_until=func.now() + timedelta(seconds=lease_seconds),
+                started_at=func.coalesce(Job.started_at, func.now()),
+                version=Job.version + 1,
+            )
+            .returning(Job)
+        )
+        job = result.one_or_none()
+        await self.async_session.commit()
+        return job
+
+    async def heartbeat(self, job: Job, lease_seconds: float, progress: Optional[dict]) -> Optional[bool]:
+        # Extends the lease and saves the progress, returns whether cancellation was requested,
+        # None once the job is no longer this worker's (lease expired and taken over)
+        cancel_requested = await self.async_session.scalar(
+            update(Job)
+            .where(self._leased(job))
+            .values(locked_until=func.now() + timedelta(seconds=lease_seconds), progress=progress)
+            .returning(Job.cancel_requested)
+        )
+        await self.async_session.commit()
+        return cancel_requested
+
+    async def finish_job(self, job: Job, status: JobStatusEnum, progress: Optional[dict] = None, result: Optional[dict] = None, error: Optional[str] = None):
+        await self.async_session.execute(
+            update(Job)
+            .where(self._leased(job))
+            .values(
+                status=status, progress=progress, result=result, error=error,
+                lease_token=None, locked_until=None, finished_at=func.now(), version=Job.version + 1,
+            )
+        )
+        await self.async_session.commit()
+
+    async def retry_job(self, job: Job, error: str, delay_seconds: float, progress: Optional[dict] = None):
+        await self.async_session.execute(
+            update(Job)
+            .where(self._leased(job))
+            .values(
+                status=JobStatusEnum.QUEUED, progress=progress, error=error,
+                run_after=func.now() + timedelta(seconds=delay_seconds),
+                lease_token=None, locked_until=None, version=Job.version + 1,
+            )
+        )
+        await self.async_session.commit()
+
+    async def release_job(self, job: Job, progress: Optional[dict] = None):
+        # Worker shutdown: back in the queue at once, the interrupted attempt does not count
+        await self.async_session.execute(
+            update(Job)
+            .where(self._leased(job))
+            .values(
+                status=JobStatusEnum.QUEUED, progress=progress, attempts=Job.attempts - 1,
+                lease_token=None, locked_until=None, version=Job.version + 1,
+            )
+        )
+        await self.async_session.commit()
+
+    @staticmethod
+    def _leased(job: Job):
+        return and_(Job.id == job.id, Job.status == JobStatusEnum.RUNNING, Job.lease_token == job.lease_token)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import enum
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import StatusEnum, PriorityEnum, TASK_CHANGES_CHANNEL, TASK_CHANGE_ID_SEQUENCE
+
+class TaskChangeOperationEnum(str, enum.Enum):
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+
+# One notification per change, completed with its event id and the owners' companies in the same statement
+PUBLISH_TASK_CHANGES = text(f"""
+SELECT pg_notify(:channel, (change || jsonb_build_object(
+    'id', nextval('{TASK_CHANGE_ID_SEQUENCE}'),
+    'company_id', (SELECT company_id FROM users WHERE id = (change->>'user_id')::uuid),
+    'previous_company_id', (SELECT company_id FROM users WHERE id = (change->>'previous_user_id')::uuid)
+))::text)
+FROM jsonb_array_elements(:changes) AS change
+""").bindparams(bindparam('changes', type_=JSONB))
+
+def task_change(
+        operation: TaskChangeOperationEnum,
+        task_id: UUID,
+        user_id: UUID,
+        status: StatusEnum,
+        priority: PriorityEnum,
+        version: int,
+        previous_user_id: Optional[UUID] = None
+) -> dict:
+    # Ids and states only, a notification payload is limited to 8000 bytes; clients fetch the task if they need more
+    return {
+        'op': operation.value,
+        'task_id': str(task_id),
+        'user_id': str(user_id),
+        'previous_user_id': str(previous_user_id) if previous_user_id is not None else None,
+        'status': status.value,
+        'priority': priority.value,
+        'version': version,
+    }
+
+class TaskChangeService:
+    """
+    Publishes task changes on the task_changes channel. Every method runs inside the caller's transaction and
+    never commits: Postgres delivers the notifications when that transaction commits, and drops them on rollback.
+    """
+
+    def __init__(self, async_session: AsyncSession = None):
+        self.async_session = async_session
+
+    async def publish(self, changes: List[dict]):
+        if not changes:
+            return
+        await self.async_session.execute(PUBLISH_TASK_CHANGES, {'channel': TASK_CHANGES_CHANNEL, 'changes': changes})
\ No newline at end of file
@@ -0,0 +1,70 @@
+from collections import Counter
+from typing import Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, func, text, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TaskCounter, User
+from app.models.task import StatusEnum, PriorityEnum
+
+# (user_id, status, priority) -> change in the number of tasks
+CounterKey = Tuple[UUID, StatusEnum, PriorityEnum]
+
+REBUILD_TASK_COUNTERS = text("""
+INSERT INTO task_counters (user_id, status, priority, company_id, count)
+SELECT tasks.user_id, tasks.status, tasks.priority, users.company_id, count(*)
+FROM tasks JOIN users ON users.id = tasks.user_id
+GROUP BY tasks.user_id, tasks.status, tasks.priority, users.company_id
+""")
+
+class TaskCounterService:
+    """Keeps task_counters in step with tasks. Every method runs inside the caller's transaction and never commits."""
+
+    def __init__(self, async_session: AsyncSession = None):
+        self.async_session = async_session
+
+    async def apply(self, deltas: Counter):
+        rows = [
+            {
+                'user_id': user_id,
+                'status': status,
+                'priority': priority,
+                'company_id': select(User.company_id).where(User.id == user_id).scalar_subquery(),
+                'count': delta
+            }
+            # Sorted so concurrent writers lock counter rows in the same order
+            for (user_id, status, priority), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1].value, item[0][2].value))
+            if delta
+        ]
+        if not rows:
+            return
+        statement = insert(TaskCounter).values(rows)
+        await self.async_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[TaskCounter.user_id, TaskCounter.status, TaskCounter.priority],
+                set_={'count': TaskCounter.count + statement.excluded.count}
+            )
+        )
+
+    async def move_user(self, user_id: UUID, company_id: Optional[UUID]):
+        await self.async_session.execute(
+            update(TaskCounter).where(TaskCounter.user_id == user_id).values(company_id=company_id)
+        )
+
+    async def get_counts(self, user_id: Optional[UUID] = None, company_id: Optional[UUID] = None) -> Sequence[Row]:
+        query = select(TaskCounter.status, TaskCounter.priority, func.sum(TaskCounter.count).label('count'))
+        if user_id is not None:
+            query = query.where(TaskCounter.user_id == user_id)
+        if company_id is not None:
+            query = query.where(TaskCounter.company_id == company_id)
+        result = await self.async_session.execute(query.group_by(TaskCounter.status, TaskCounter.priority))
+        return result.all()
+
+    async def rebuild(self) -> int:
+        # Writers wait while the counters are recomputed, readers keep going
+        await self.async_session.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+        await self.async_session.execute(delete(TaskCounter))
+        result = await self.async_session.execute(REBUILD_TASK_COUNTERS)
+        return result.rowcount
@@ -1,18 +1,34 @@
-from typing import Sequence, Tuple, Optional
+import json
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Sequence, Tuple, Optional, List, Set, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select, cast, Boolean, desc, func
+from sqlalchemy import select, insert, update, delete, cast, Boolean, desc, func, tuple_, text, Select, Row, REAL
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import joinedload, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models import Task, User
-from app.models.task import StatusEnum, PriorityEnum
-from app.schemas.task import TaskCreate, TaskUpdate
-from .base_crud_service import BaseCRUDService
+from app.exceptions.user_exceptions import UserNotFoundException
+from app.models.task import StatusEnum, PriorityEnum, SEARCH_CONFIG
+from app.schemas.paginate import CountModeEnum
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkItemResult, BulkItemStatusEnum
+from app.utils.explain_utils import ExplainJson
+from .base_crud_service import BaseCRUDService, id_in, is_foreign_key_violation, MAX_BIND_PARAMETERS
+from .task_counter_service import TaskCounterService
+from .task_change_service import TaskChangeService, TaskChangeOperationEnum, task_change
+
+# Columns that decide which task_counters row a task is counted in
+COUNTED_COLUMNS = {'user_id', 'status', 'priority'}
 
 class TaskService(BaseCRUDService):
-    def __init__(self, async_session: AsyncSession = None, sync_session: Session = None):
-        super().__init__(async_session, sync_session)
+    def __init__(self, async_session: AsyncSession = None, read_session: AsyncSession = None):
+        super().__init__(async_session, read_session)
+        self.task_counter_service = TaskCounterService(async_session)
+        self.task_change_service = TaskChangeService(async_session)
 
     async def get_tasks(
             self,
@@ -20,35 +36,122 @@ class TaskService(BaseCRUDService):
             status: StatusEnum = None,
             priority: PriorityEnum = None,
             skip: int = 0,
-            limit: int = 10
-    ) -> Tuple[Sequence[Task], int]:
-        # Count Query
-        count_query = select(func.count(Task.id))
-        if user_id is not None:
-            count_query = count_query.filter(cast(Task.user_id == user_id, Boolean))
-        if status is not None:
-            count_query = count_query.where(cast(Task.status == status, Boolean))
-        if priority is not None:
-            count_query = count_query.where(cast(Task.priority == priority, Boolean))
+            limit: int = 10,
+            cursor: Optional[Tuple[datetime, UUID]] = None,
+            count_mode: CountModeEnum = CountModeEnum.EXACT
+    ) -> Tuple[Sequence[Task], Optional[int], Optional[Task]]:
+        # Returns the page, the total count and the last task of the page when a next page exists.
+        # A (created_at, id) cursor seeks past the previous page instead of using OFFSET, so skip is ignored.
+        count_query = self._filter_tasks(select(func.count(Task.id)), user_id, status, priority)
 
-        total_result = await self.async_session.execute(count_query)
-        total_count = total_result.scalar()
+        # Data Query, the exact total rides along as an uncorrelated scalar subquery so it costs no extra round trip
+        columns = [Task]
+        if count_mode == CountModeEnum.EXACT:
+            columns.append(count_query.scalar_subquery().label('total'))
+        data_query = self._filter_tasks(select(*columns).options(joinedload(Task.user, innerjoin=True)), user_id, status, priority)
+        if cursor is not None:
+            data_query = data_query.where(tuple_(Task.created_at, Task.id) < tuple_(*cursor))
+        else:
+            data_query = data_query.offset(skip)
 
-        # Data Query
-        data_query = select(Task).options(joinedload(Task.user, innerjoin=True))
-        if user_id is not None:
-            data_query = data_query.filter(cast(Task.user_id == user_id, Boolean))
-        if status is not None:
-            data_query = data_query.where(cast(Task.status == status, Boolean))
-        if priority is not None:
-            data_query = data_query.where(cast(Task.priority == priority, Boolean))
+        # Fetch one extra row to know whether a next page exists
+        data_query = data_query.limit(limit + 1).order_by(desc(Task.created_at), desc(Task.id))
+
+        result = await self.read_session.execute(data_query)
+        rows = result.all()
+        tasks = [row[0] for row in rows]
+        last_task = tasks[limit - 1] if len(tasks) > limit else None
+
+        total_count = None
+        if count_mode == CountModeEnum.EXACT:
+            if rows:
+                total_count = rows[0].total
+            elif cursor is None and skip == 0:
+                total_count = 0
+            else:
+                # Paged past the end, the subquery had no row to ride on
+                total_count = (await self.read_session.execute(count_query)).scalar()
+        elif count_mode == CountModeEnum.ESTIMATED:
+            filtered = user_id is not None or status is not None or priority is not None
+            total_count = await self._estimate_count(self._filter_tasks(select(Task.id), user_id, status, priority), filtered)
+
+        return tasks[:limit], total_count, last_task
+
+    async def search_tasks(
+            self,
+            q: str,
+            user_id: Optional[UUID] = None,
+            status: StatusEnum = None,
+            priority: PriorityEnum = None,
+            limit: int = 10,
+            cursor: Optional[Tuple[float, UUID]] = None
+    ) -> Tuple[Sequence[Row], Optional[Row]]:
+        # Returns (Task, rank) rows best match first and the last row of the page when a next page exists.
+        # websearch_to_tsquery accepts free text ("quoted phrases", or, -negation) and never raises on user input.
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank(Task.search_vector, ts_query, type_=REAL)
+
+        query = self._filter_tasks(
+            select(Task, rank.label('rank'))
+            .options(joinedload(Task.user, innerjoin=True))
+            .where(Task.search_vector.bool_op('@@')(ts_query)),
+            user_id, status, priority
+        )
+        if cursor is not None:
+            # Keyset on (rank, id), ranks are recomputed identically for the same q
+            query = query.where(tuple_(rank, Task.id) < tuple_(*cursor))
+        query = query.order_by(desc(rank), desc(Task.id)).limit(limit + 1)
+
+        rows = (await self.read_session.execute(query)).all()
+        last_row = rows[limit - 1] if len(rows) > limit else None
+        return rows[:limit], last_row
 
-        data_query = data_query.offset(skip).limit(limit).order_by(desc(Task.created_at))
+    async def stream_tasks(
+            self,
+            user_id: Optional[UUID] = None,
+            status: StatusEnum = None,
+            priority: PriorityEnum = None,
+            batch_size: int = 1000
+    ) -> AsyncIterator[Row]:
+        # Plain rows through a server-side cursor: memory stays flat whatever the result size
+        query = self._filter_tasks(
+            select(
+                Task.id, Task.user_id, User.first_name, User.last_name, Task.summary,
+                Task.description, Task.status, Task.priority, Task.created_at
+            ).join(Task.user),
+            user_id, status, priority
+        ).order_by(desc(Task.created_at), desc(Task.id)).execution_options(yield_per=batch_size)
 
-        result = await self.async_session.execute(data_query)
-        tasks = result.scalars().all()
+        result = await self.async_session.stream(query)
+        async for row in result:
+            yield row
 
-        return tasks, total_count
+    async def _estimate_count(self, query: Select, filtered: bool) -> int:
+        if not filtered:
+            # Unfiltered listings read the row estimate kept by VACUUM/ANALYZE
+            reltuples = await self.read_session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+                {"table_name": Task.__tablename__}
+            )
+            # -1 means the table was never analyzed, let the planner estimate instead
+            if reltuples is not None and reltuples >= 0:
+                return reltuples
+
+        # Ask the planner how many rows the filtered query would return without running it
+        plan = await self.read_session.scalar(ExplainJson(query))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _filter_tasks(query: Select, user_id: Optional[str], status: Optional[StatusEnum], priority: Optional[PriorityEnum]) -> Select:
+        if user_id is not None:
+            query = query.filter(cast(Task.user_id == user_id, Boolean))
+        if status is not None:
+            query = query.where(cast(Task.status == status, Boolean))
+        if priority is not None:
+            query = query.where(cast(Task.priority == priority, Boolean))
+        return query
 
     async def get_task_by_id(self, task_id: UUID) -> Task:
         result = await self.async_session.execute(
@@ -66,6 +169,23 @@ class TaskService(BaseCRUDService):
         )
         return result.scalar_one_or_none()
 
+    async def get_tasks_by_ids(self, task_ids: Sequence[UUID], user_id: Optional[UUID] = None) -> Sequence[Task]:
+        # One round trip for the whole batch, a user_id hides other users' tasks like get_task_by_id_and_user_id
+        query = select(Task).options(joinedload(Task.user, innerjoin=True)).where(id_in(Task, task_ids))
+        if user_id is not None:
+            query = query.filter(cast(Task.user_id == user_id, Boolean))
+        result = await self.read_session.execute(query)
+        return result.scalars().all()
+
+    async def get_task_versions(self, task_id: UUID, user_id: Optional[UUID] = None) -> Optional[Row]:
+        # (task, owner) versions and timestamps by primary key, the task body embeds the owner's name
+        query = select(
+            Task.version, User.version.label('owner_version'), Task.updated_at, User.updated_at.label('owner_updated_at')
+        ).join(Task.user).filter(cast(Task.id == task_id, Boolean))
+        if user_id is not None:
+            query = query.filter(cast(Task.user_id == user_id, Boolean))
+        return (await self.async_session.execute(query)).one_or_none()
+
     async def get_tasks_by_user_id(self, user_id: UUID) -> Sequence[Task]:
         result = await self.async_session.execute(
             select(Task)
@@ -82,24 +202,191 @@ class TaskService(BaseCRUDService):
         )
         return result.scalars().all()
 
-    async def get_tasks_by_company_id_and_status(self, company_id: UUID, status: StatusEnum) -> Sequence[Task]:
+    async def get_tasks_by_company_id_and_status(self, company_id: UUID, status: StatusEnum, skip: int = 0, limit: int = 100) -> Sequence[Task]:
+        # Filter and eager load through the same explicit join, users must not end up as a second FROM entry
         result = await self.async_session.execute(
             select(Task)
-            .options(joinedload(Task.user, innerjoin=True))
+            .join(Task.user)
+            .options(contains_eager(Task.user))
             .where(User.company_id == company_id, Task.status == status)
+            .order_by(desc(Task.created_at), desc(Task.id))
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
-    def create_task(self, task_create: TaskCreate) -> Task:
-        task_info = Task(**task_create.model_dump())
-        self.sync_session.add(task_info)
-        self.sync_session.commit()
-        self.sync_session.refresh(task_info)
+    async def create_task(self, task_create: TaskCreate, owner: Optional[User] = None) -> Task:
+        try:
+            task_info = await self.create(Task, task_create.model_dump(), commit=False)
+            await self.task_counter_service.apply(Counter({(task_info.user_id, task_info.status, task_info.priority): 1}))
+        except IntegrityError as error:
+            await self._raise_if_user_deleted(error, task_create.user_id)
+            raise
+        await self.task_change_service.publish([
+            task_change(TaskChangeOperationEnum.CREATED, task_info.id, task_info.user_id, task_info.status, task_info.priority, task_info.version)
+        ])
+        await self.async_session.commit()
+        await self._attach_user(task_info, owner)
+
+        return task_info
+
+    async def create_tasks(
+            self,
+            tasks_create: Sequence[TaskCreate],
+            existing_user_ids: Set[UUID],
+            atomic: bool = True,
+            chunk_size: int = 1000
+    ) -> List[TaskBulkItemResult]:
+        results: List[Optional[TaskBulkItemResult]] = [None] * len(tasks_create)
+        rows = []
+        for index, task_create in enumerate(tasks_create):
+            if task_create.user_id not in existing_user_ids:
+                results[index] = TaskBulkItemResult(index=index, status=BulkItemStatusEnum.FAILED, error=f"User with ID {task_create.user_id} not found")
+            else:
+                # Ids are generated here so every item maps to its row regardless of RETURNING order
+                rows.append((index, {'id': uuid.uuid4(), **task_create.model_dump()}))
+
+        if atomic and len(rows) < len(tasks_create):
+            return self._skip_pending(results, rows)
+
+        if rows:
+            # One bind parameter per column and row
+            chunk_size = max(1, min(chunk_size, MAX_BIND_PARAMETERS // len(rows[0][1])))
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            while chunk:
+                try:
+                    await self._insert_chunk(chunk, atomic)
+                except DBAPIError as error:
+                    if atomic:
+                        await self.async_session.rollback()
+                    # A user deleted since the existence check: its items fail as if it had been missing then,
+                    # in non-atomic mode the rest of the chunk is inserted again without them
+                    deleted_user_ids = await self._deleted_user_ids(chunk) if is_foreign_key_violation(error) else set()
+                    reason = f"Insert failed: {type(error.orig).__name__}"
+                    for index, row in chunk:
+                        if row['user_id'] in deleted_user_ids:
+                            results[index] = TaskBulkItemResult(index=index, status=BulkItemStatusEnum.FAILED, error=f"User with ID {row['user_id']} not found")
+                        elif not deleted_user_ids:
+                            results[index] = TaskBulkItemResult(index=index, status=BulkItemStatusEnum.FAILED, error=reason)
+                    if atomic:
+                        return self._skip_pending(results, rows)
+                    chunk = [(index, row) for index, row in chunk if deleted_user_ids and row['user_id'] not in deleted_user_ids]
+                    continue
+                for index, row in chunk:
+                    results[index] = TaskBulkItemResult(index=index, status=BulkItemStatusEnum.CREATED, task_id=row['id'])
+                break
+
+        await self.async_session.commit()
+        return results
+
+    async def _insert_chunk(self, chunk: list, atomic: bool):
+        # One multi-row INSERT per chunk
+        statement = insert(Task).values([row for _, row in chunk])
+        deltas = Counter((row['user_id'], row['status'], row['priority']) for _, row in chunk)
+        # New rows start at version 1 (server default)
+        changes = [task_change(TaskChangeOperationEnum.CREATED, row['id'], row['user_id'], row['status'], row['priority'], 1) for _, row in chunk]
+        if atomic:
+            await self.async_session.execute(statement)
+            await self.task_counter_service.apply(deltas)
+            await self.task_change_service.publish(changes)
+            return
+        # A failing chunk only rolls back to its own savepoint
+        async with self.async_session.begin_nested():
+            await self.async_session.execute(statement)
+            await self.task_counter_service.apply(deltas)
+            await self.task_change_service.publish(changes)
+
+    async def _deleted_user_ids(self, chunk: list) -> Set[UUID]:
+        user_ids = {row['user_id'] for _, row in chunk}
+        existing = await self.async_session.scalars(select(User.id).where(id_in(User, user_ids)))
+        return user_ids - set(existing.all())
+
+    async def _raise_if_user_deleted(self, error: IntegrityError, user_id: UUID):
+        # The owner was checked through the entity cache, or deleted by another worker right after the check
+        if is_foreign_key_violation(error):
+            await self.async_session.rollback()
+            raise UserNotFoundException(detail=f"User with ID {user_id} not found") from error
 
+    @staticmethod
+    def _skip_pending(results: List[Optional[TaskBulkItemResult]], rows: list) -> List[TaskBulkItemResult]:
+        # All-or-nothing: nothing was written, valid items are reported as skipped
+        for index, _ in rows:
+            if results[index] is None or results[index].status == BulkItemStatusEnum.CREATED:
+                results[index] = TaskBulkItemResult(index=index, status=BulkItemStatusEnum.SKIPPED)
+        return results
+
+    async def update_task(self, task_id: UUID, task_update: TaskUpdate, owner: Optional[User] = None, if_match: Optional[List[int]] = None) -> Task | None:
+        update_data = task_update.model_dump(exclude_unset=True)
+        previous = None
+        if COUNTED_COLUMNS.intersection(update_data):
+            # Lock the row and remember which counter it leaves
+            previous = (await self.async_session.execute(
+                select(Task.user_id, Task.status, Task.priority).where(Task.id == task_id).with_for_update()
+            )).one_or_none()
+            if previous is None:
+                return None
+
+        try:
+            task_info = await self.update_by_id(Task, task_id, update_data, commit=False, if_match=if_match)
+            if not task_info:
+                return None
+            if previous is not None:
+                deltas = Counter({tuple(previous): -1})
+                deltas[(task_info.user_id, task_info.status, task_info.priority)] += 1
+                await self.task_counter_service.apply(deltas)
+        except IntegrityError as error:
+            await self._raise_if_user_deleted(error, update_data.get('user_id'))
+            raise
+        previous_user_id = previous.user_id if previous is not None and previous.user_id != task_info.user_id else None
+        await self.task_change_service.publish([
+            task_change(TaskChangeOperationEnum.UPDATED, task_info.id, task_info.user_id, task_info.status, task_info.priority, task_info.version, previous_user_id)
+        ])
+        await self.async_session.commit()
+        await self._attach_user(task_info, owner)
         return task_info
 
-    async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Task | None:
-        return await self.update_by_id(Task, task_id, task_update.model_dump(exclude_unset=True))
+    async def _attach_user(self, task: Task, owner: Optional[User] = None):
+        # RETURNING only brings the task row back, reuse the already loaded owner (or the identity map) for task.user
+        if owner is None or owner.id != task.user_id:
+            owner = await self.async_session.get(User, task.user_id)
+        set_committed_value(task, 'user', owner)
 
     async def delete_task(self, task_id: UUID) -> bool:
-        return await self.delete_by_id(Task, task_id)
\ No newline at end of file
+        result = await self.async_session.execute(
+            delete(Task).where(Task.id == task_id).returning(Task.user_id, Task.status, Task.priority, Task.version)
+        )
+        removed = result.one_or_none()
+        if removed is None:
+            return False
+        await self.task_counter_service.apply(Counter({(removed.user_id, removed.status, removed.priority): -1}))
+        await self.task_change_service.publish([
+            task_change(TaskChangeOperationEnum.DELETED, task_id, removed.user_id, removed.status, removed.priority, removed.version)
+        ])
+        await self.async_session.commit()
+        return True
+
+    async def reassign_tasks(self, from_user_id: UUID, to_user_id: UUID, status: Optional[StatusEnum] = None, limit: int = 1000) -> int:
+        # One committed batch of a bulk reassignment, returns the number of tasks moved
+        owned = [Task.user_id == from_user_id] + ([Task.status == status] if status is not None else [])
+        batch = select(Task.id).where(*owned).limit(limit).scalar_subquery()
+        # The owner is checked again outside the subquery, a task moved concurrently is skipped rather than miscounted
+        moved = (await self.async_session.execute(
+            update(Task)
+            .where(Task.id.in_(batch), *owned)
+            .values(user_id=to_user_id, version=Task.version + 1)
+            .returning(Task.id, Task.status, Task.priority, Task.version)
+        )).all()
+        deltas = Counter()
+        for row in moved:
+            deltas[(from_user_id, row.status, row.priority)] -= 1
+            deltas[(to_user_id, row.status, row.priority)] += 1
+        await self.task_counter_service.apply(deltas)
+        await self.task_change_service.publish([
+            task_change(TaskChangeOperationEnum.UPDATED, row.id, to_user_id, row.status, row.priority, row.version, from_user_id) for row in moved
+        ])
+        await self.async_session.commit()
+        return len(moved)
+
+    async def get_task_stats(self, user_id: Optional[UUID] = None, company_id: Optional[UUID] = None) -> Sequence[Row]:
+        return await self.task_counter_service.get_counts(user_id=user_id, company_id=company_id)
\ No newline at end of file
@@ -1,21 +1,27 @@
-from typing import Sequence
+from typing import Sequence, Optional, Iterable, Set, List
 from uuid import UUID
 
-from sqlalchemy import select, cast, Boolean, desc
+from sqlalchemy import select, update, cast, Boolean, desc, Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import User
-from app.models.user import get_password_hash
+from app.models import User, Company
 from app.schemas.user import UserCreate, UserUpdate
-from .base_crud_service import BaseCRUDService
+from app.utils.password_utils import PasswordHasher
+from app.utils.entity_cache import EntityCache, user_cache_key, company_cache_key, entity_to_dict, dict_to_entity
+from .base_crud_service import BaseCRUDService, id_in
+from .cascade_delete_service import CascadeDeleteService
+from .task_counter_service import TaskCounterService
 
 class UserService(BaseCRUDService):
-    def __init__(self, async_session: AsyncSession = None, sync_session: Session = None):
-        super().__init__(async_session, sync_session)
+    def __init__(self, async_session: AsyncSession = None, password_hasher: PasswordHasher = None, entity_cache: Optional[EntityCache] = None, read_session: AsyncSession = None):
+        super().__init__(async_session, read_session)
+        self.password_hasher = password_hasher
+        self.entity_cache = entity_cache
 
     async def get_users(self) -> Sequence[User]:
-        result = await self.async_session.execute(
+        result = await self.read_session.execute(
             select(User)
             .options(joinedload(User.company, innerjoin=True))
             .order_by(desc(User.created_at))
@@ -27,49 +33,101 @@ class UserService(BaseCRUDService):
         return result.first()
 
     async def get_user_by_id(self, user_id: UUID) -> User:
+        if self.entity_cache is not None:
+            user = await self._get_cached_user(user_id)
+            if user is not None:
+                return user
+
         result = await self.async_session.execute(
             select(User)
             .options(joinedload(User.company, innerjoin=True))
             .filter(cast(User.id == user_id, Boolean))
         )
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None and self.entity_cache is not None:
+            # The password hash never leaves the database
+            await self.entity_cache.set(user_cache_key(user_id), entity_to_dict(user, exclude=('hashed_password',)))
+            await self.entity_cache.set(company_cache_key(user.company_id), entity_to_dict(user.company))
+        return user
+
+    async def get_users_by_ids(self, user_ids: Sequence[UUID]) -> Sequence[User]:
+        # Straight from the database, one statement beats a cache round trip per id
+        return await self.get_by_ids(User, user_ids, joinedload(User.company, innerjoin=True))
+
+    async def get_user_versions(self, user_id: UUID) -> Optional[Row]:
+        # (user, company) versions and timestamps by primary key, the user body embeds the company
+        result = await self.async_session.execute(
+            select(User.version, Company.version.label('company_version'), User.updated_at, Company.updated_at.label('company_updated_at'))
+            .join(User.company)
+            .filter(cast(User.id == user_id, Boolean))
+        )
+        return result.one_or_none()
+
+    async def _get_cached_user(self, user_id: UUID) -> Optional[User]:
+        # The company is cached on its own key, so company updates never leave stale copies inside user entries
+        cached_user = await self.entity_cache.get(user_cache_key(user_id))
+        if cached_user is None or cached_user.get('company_id') is None:
+            return None
+        cached_company = await self.entity_cache.get(company_cache_key(cached_user['company_id']))
+        if cached_company is None:
+            return None
+        user = dict_to_entity(User, cached_user)
+        set_committed_value(user, 'company', dict_to_entity(Company, cached_company))
+        return user
+
+    async def get_existing_user_ids(self, user_ids: Iterable[UUID]) -> Set[UUID]:
+        result = await self.async_session.scalars(select(User.id).where(id_in(User, set(user_ids))))
+        return set(result.all())
 
-    def create_user(self, user_create: UserCreate) -> User:
+    async def create_user(self, user_create: UserCreate, company: Optional[Company] = None) -> User:
         # Hash the plain-text password
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await self.password_hasher.hash(user_create.password)
         # Get the dictionary representation of the user and update the password
         user_dict = user_create.model_dump()
         user_dict['hashed_password'] = hashed_password
         del user_dict['password'] # Ensure the plain-text password is not saved
 
-        # Create the User instance with the updated dictionary
-        db_user = User(**user_dict)
-        self.sync_session.add(db_user)
-        self.sync_session.commit()
-        self.sync_session.refresh(db_user)
+        db_user = await self.create(User, user_dict)
+        await self._attach_company(db_user, company)
 
         return db_user
 
-    async def update_user(self, user_id: UUID, user_update: UserUpdate) -> User | None:
-        result = await self.async_session.execute(
-            select(User)
-            .options(joinedload(User.company, innerjoin=True))
-            .where(cast(User.id == user_id, Boolean))
-        )
-        user_info = result.scalar_one_or_none()
+    async def update_user(self, user_id: UUID, user_update: UserUpdate, company: Optional[Company] = None, if_match: Optional[List[int]] = None) -> User | None:
+        update_data = user_update.model_dump(exclude_unset=True)
+        if 'password' in update_data:
+            update_data['hashed_password'] = await self.password_hasher.hash(update_data.pop('password'))
+
+        user_info = await self.update_by_id(User, user_id, update_data, commit=False, if_match=if_match)
         if not user_info:
             return None
-
-        for attr, value in user_update.model_dump(exclude_unset=True).items():
-            if attr == 'password':
-                value = get_password_hash(value)
-                attr = 'hashed_password'
-            setattr(user_info, attr, value)
-        self.async_session.add(user_info)
+        if 'company_id' in update_data:
+            # Company roll-ups of the task counters follow the user
+            await TaskCounterService(self.async_session).move_user(user_id, user_info.company_id)
         await self.async_session.commit()
-        await self.async_session.refresh(user_info)
+        await self._invalidate(user_id)
+        await self._attach_company(user_info, company)
 
         return user_info
 
-    async def delete_user(self, user_id: UUID) -> bool:
-        return await self.delete_by_id(User, user_id)
\ No newline at end of file
+    async def update_password_hash(self, user_id: UUID, hashed_password: str):
+        # A credential change, not a change of the user's representation: version and updated_at stay, so do
+        # ETags and cached entries (which never hold the hash)
+        await self.async_session.execute(
+            update(User).where(User.id == user_id).values(hashed_password=hashed_password, updated_at=User.updated_at)
+        )
+        await self.async_session.commit()
+
+    async def delete_user(self, user_id: UUID, batch_size: int = 1000) -> bool:
+        # Tasks go first in committed batches, the user row and cache entry last
+        progress = await CascadeDeleteService(self.async_session, entity_cache=self.entity_cache, batch_size=batch_size).delete_user(user_id)
+        return progress is not None
+
+    async def _invalidate(self, user_id: UUID):
+        if self.entity_cache is not None:
+            await self.entity_cache.delete(user_cache_key(user_id))
+
+    async def _attach_company(self, user: User, company: Optional[Company] = None):
+        # RETURNING only brings the user row back, reuse the already loaded company (or the identity map) for user.company
+        if company is None or company.id != user.company_id:
+            company = await self.async_session.get(Company, user.company_id) if user.company_id else None
+        set_committed_value(user, 'company', company)
\ No newline at end of file
@@ -1,11 +1,20 @@
+from typing import List
+
+from pydantic import TypeAdapter
+
 from app.models import Company
 from app.schemas.company import CompanyResponseDetail
+from app.schemas.lookup import LookupResponse
+
+COMPANY_LIST_ADAPTER = TypeAdapter(List[CompanyResponseDetail])
+COMPANY_LOOKUP_ADAPTER = TypeAdapter(LookupResponse[CompanyResponseDetail])
 
 def transform_to_company_response_detail(company: Company) -> CompanyResponseDetail:
-    return CompanyResponseDetail(
+    return CompanyResponseDetail.model_construct(
         id=company.id,
         name=company.name,
         description=company.description,
         status="Active" if company.mode else "Inactive",
-        created_at=company.created_at
+        created_at=company.created_at,
+        version=company.version
     )
\ No newline at end of file
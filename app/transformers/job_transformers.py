@@ -0,0 +1,21 @@
+from app.models import Job
+from app.schemas.job import JobResponseDetail
+
+def transform_to_job_response_detail(job: Job) -> JobResponseDetail:
+    # The result path of exports stays on the server, clients fetch the file through /jobs/{id}/download
+    result = {key: value for key, value in job.result.items() if key != "path"} if job.result else job.result
+    return JobResponseDetail.model_construct(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        payload=job.payload,
+        progress=job.progress,
+        result=result,
+        error=job.error,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        cancel_requested=job.cancel_requested,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
\ No newline at end of file
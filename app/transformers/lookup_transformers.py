@@ -0,0 +1,12 @@
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+from app.schemas.lookup import LookupResponse
+
+def generate_lookup_response(requested_ids: Sequence[UUID], entities: Sequence[Any], transform: Callable[[Any], Any]) -> LookupResponse:
+    # ANY(...) returns rows in no particular order, answer in the order the ids were asked for
+    by_id = {entity.id: entity for entity in entities}
+    return LookupResponse.model_construct(
+        items=[transform(by_id[entity_id]) for entity_id in requested_ids if entity_id in by_id],
+        missing=[entity_id for entity_id in requested_ids if entity_id not in by_id]
+    )
\ No newline at end of file
@@ -1,17 +1,28 @@
-from typing import Sequence
+from typing import Sequence, Optional, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import Row
 
 from app.models import Task
+from app.models.task import StatusEnum, PriorityEnum
+from app.schemas.lookup import LookupResponse
 from app.schemas.paginate import PaginatedResponse
-from app.schemas.task import TaskResponseDetail
+from app.schemas.task import TaskResponseDetail, TaskStatsResponse, TaskCountDetail, TaskSearchResultDetail, TaskSearchResponse
 from app.schemas.user import UserInfo
+from app.utils.cursor_utils import encode_cursor, encode_rank_cursor
 
 # Define a type alias for PaginatedResponse of TaskResponseDetail
 TasksPaginatedResponse = PaginatedResponse[TaskResponseDetail]
 
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponseDetail])
+TASKS_PAGINATED_ADAPTER = TypeAdapter(TasksPaginatedResponse)
+TASK_SEARCH_ADAPTER = TypeAdapter(TaskSearchResponse)
+TASK_LOOKUP_ADAPTER = TypeAdapter(LookupResponse[TaskResponseDetail])
+
 def transform_to_task_response(task: Task) -> TaskResponseDetail:
-    return TaskResponseDetail(
+    return TaskResponseDetail.model_construct(
         task_id=task.id,
-        user_info=UserInfo(
+        user_info=UserInfo.model_construct(
             user_id=task.user_id,
             first_name=task.user.first_name,
             last_name=task.user.last_name
@@ -20,13 +31,51 @@ def transform_to_task_response(task: Task) -> TaskResponseDetail:
         description=task.description,
         status=task.status,
         priority=task.priority,
-        created_at=task.created_at
+        created_at=task.created_at,
+        version=task.version
     )
 
-def generate_tasks_paginated_response(tasks: Sequence[Task], total: int, skip: int, limit: int) -> TasksPaginatedResponse:
-    return TasksPaginatedResponse(
+# Column order of exported tasks, shared by the NDJSON keys and the CSV header
+TASK_EXPORT_FIELDS = ("task_id", "user_id", "first_name", "last_name", "summary", "description", "status", "priority", "created_at")
+
+def transform_to_task_export_row(row: Row) -> dict:
+    return {
+        "task_id": str(row.id),
+        "user_id": str(row.user_id),
+        "first_name": row.first_name,
+        "last_name": row.last_name,
+        "summary": row.summary,
+        "description": row.description,
+        "status": row.status.value,
+        "priority": row.priority.value,
+        "created_at": row.created_at.isoformat()
+    }
+
+def generate_tasks_paginated_response(tasks: Sequence[Task], total: Optional[int], skip: int, limit: int, last_task: Optional[Task] = None) -> TasksPaginatedResponse:
+    return TasksPaginatedResponse.model_construct(
         total=total,
         page=(skip // limit) + 1,
         size=limit,
-        items=[transform_to_task_response(task) for task in tasks]
+        items=[transform_to_task_response(task) for task in tasks],
+        next_cursor=encode_cursor(last_task.created_at, last_task.id) if last_task else None
+    )
+
+def generate_task_search_response(rows: Sequence[Row], limit: int, last_row: Optional[Row] = None) -> TaskSearchResponse:
+    return TaskSearchResponse.model_construct(
+        size=limit,
+        items=[TaskSearchResultDetail.model_construct(**dict(transform_to_task_response(row.Task)), rank=row.rank) for row in rows],
+        next_cursor=encode_rank_cursor(last_row.rank, last_row.Task.id) if last_row else None
+    )
+
+def transform_to_task_stats_response(counts: Sequence[Row]) -> TaskStatsResponse:
+    by_status = {status: 0 for status in StatusEnum}
+    by_priority = {priority: 0 for priority in PriorityEnum}
+    for row in counts:
+        by_status[row.status] += row.count
+        by_priority[row.priority] += row.count
+    return TaskStatsResponse(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        by_priority=by_priority,
+        counts=[TaskCountDetail(status=row.status, priority=row.priority, count=row.count) for row in counts]
     )
\ No newline at end of file
@@ -1,17 +1,23 @@
-from typing import Sequence
+from typing import Sequence, List
+
+from pydantic import TypeAdapter
 
 from app.models import User
 from app.schemas.company import CompanyInfo
+from app.schemas.lookup import LookupResponse
 from app.schemas.paginate import PaginatedResponse
 from app.schemas.user import UserResponseDetail
 
 # Define a type alias for PaginatedResponse of TaskResponseDetail
 UsersPaginatedResponse = PaginatedResponse[UserResponseDetail]
 
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponseDetail])
+USER_LOOKUP_ADAPTER = TypeAdapter(LookupResponse[UserResponseDetail])
+
 def transform_to_user_response(user: User) -> UserResponseDetail:
-    return UserResponseDetail(
+    return UserResponseDetail.model_construct(
         id=user.id,
-        company_info=CompanyInfo(
+        company_info=CompanyInfo.model_construct(
             company_id=user.company_id,
             name=user.company.name,
             status="Active" if user.company.mode else "Inactive",
@@ -22,7 +28,8 @@ def transform_to_user_response(user: User) -> UserResponseDetail:
         last_name=user.last_name,
         is_active=user.is_active,
         is_admin=user.is_admin,
-        created_at=user.created_at
+        created_at=user.created_at,
+        version=user.version
     )
 
 def generate_tasks_paginated_response(users: Sequence[User], total: int, skip: int, limit: int) -> UsersPaginatedResponse:
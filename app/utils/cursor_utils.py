@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+from uuid import UUID
+
+from app.exceptions.pagination_exceptions import InvalidCursorException
+
+def _encode(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+def encode_cursor(created_at: datetime, entity_id: UUID) -> str:
+    return _encode([created_at.isoformat(), str(entity_id)])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, entity_id = _decode(cursor)
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at, UUID(entity_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+def encode_rank_cursor(rank: float, entity_id: UUID) -> str:
+    # repr round-trips the float exactly, so the seek resumes right after the last row
+    return _encode([rank, str(entity_id)])
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, UUID]:
+    try:
+        rank, entity_id = _decode(cursor)
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise TypeError("rank must be a number")
+        return float(rank), UUID(entity_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
\ No newline at end of file
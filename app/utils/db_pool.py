@@ -0,0 +1,55 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait and how many time out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+def get_pool_stats(pool) -> dict:
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    stats = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": checked_out / capacity if capacity else 0.0,
+    }
+    pool_stats = getattr(pool, "stats", None)
+    if pool_stats is not None:
+        stats.update({
+            "checkouts": pool_stats.checkouts,
+            "timeouts": pool_stats.timeouts,
+            "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+            "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+            "wait_seconds_avg": round(pool_stats.wait_seconds_total / pool_stats.checkouts, 6) if pool_stats.checkouts else 0.0,
+        })
+    return stats
@@ -0,0 +1,163 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, Optional, Tuple, Type
+from uuid import UUID
+
+from app.utils.resp_client import RespClient, RespError
+
+def company_cache_key(company_id: UUID) -> str:
+    return f"company:{company_id}"
+
+def user_cache_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+def entity_to_dict(entity, exclude: Iterable[str] = ()) -> dict:
+    return {column.key: getattr(entity, column.key) for column in entity.__table__.columns if column.key not in exclude}
+
+def dict_to_entity(model: Type, data: dict):
+    # Detached instance, never added to a session, so cached rows are not shared between requests
+    return model(**{column.key: _decode_value(column, data[column.key]) for column in model.__table__.columns if column.key in data})
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+class EntityCache(ABC):
+    """Read-through cache of column values keyed by entity, with hit ratio counters."""
+
+    backend = "none"
+
+    def __init__(self, ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict):
+        await self._set(key, value)
+
+    async def delete(self, *keys: str):
+        await self._delete(keys)
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def _set(self, key: str, value: dict):
+        ...
+
+    @abstractmethod
+    async def _delete(self, keys: Tuple[str, ...]):
+        ...
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+class MemoryEntityCache(EntityCache):
+    """
+    In-process TTL + LRU cache. Invalidation only reaches the current worker,
+    other workers may serve a stale entry until its TTL runs out.
+    """
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 10000):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        # Only touched from the event loop, no locking needed
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _delete(self, keys: Tuple[str, ...]):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries), "max_entries": self.max_entries}
+
+class RedisEntityCache(EntityCache):
+    """Shared cache on a Redis-protocol server, a failing server degrades to cache misses."""
+
+    backend = "redis"
+
+    def __init__(self, client: RespClient, ttl_seconds: int = 60, prefix: str = "todos:"):
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    async def _get(self, key: str) -> Optional[dict]:
+        try:
+            raw = await self.client.execute('GET', self.prefix + key)
+        except (OSError, EOFError, RespError, TimeoutError):
+            self.errors += 1
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def _set(self, key: str, value: dict):
+        try:
+            await self.client.execute('SET', self.prefix + key, json.dumps(value, default=_encode_value), 'EX', self.ttl_seconds)
+        except (OSError, EOFError, RespError, TimeoutError):
+            self.errors += 1
+
+    async def _delete(self, keys: Tuple[str, ...]):
+        if not keys:
+            return
+        try:
+            await self.client.execute('DEL', *(self.prefix + key for key in keys))
+        except (OSError, EOFError, RespError, TimeoutError):
+            self.errors += 1
+
+    def close(self):
+        self.client.close()
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.visitors import InternalTraversal
+
+class ExplainJson(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, compiled and bound like the statement itself."""
+
+    inherit_cache = True
+    # Part of the cache key, each wrapped statement compiles to its own SQL
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+@compiles(ExplainJson, "postgresql")
+def _compile_explain_json(element: ExplainJson, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
\ No newline at end of file
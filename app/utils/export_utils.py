@@ -0,0 +1,31 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Sequence
+
+# Rows buffered into one chunk, keeps the number of socket writes low without holding the result in memory
+ROWS_PER_CHUNK = 500
+
+async def encode_ndjson(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    buffer = []
+    async for row in rows:
+        buffer.append(json.dumps(row, separators=(",", ":")))
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+async def encode_csv(rows: AsyncIterator[dict], fields: Sequence[str]) -> AsyncIterator[str]:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fields)
+    writer.writeheader()
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % ROWS_PER_CHUNK == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
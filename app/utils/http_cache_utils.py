@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def make_etag(*versions: Optional[int]) -> str:
+    # A detail body is derived from these rows only, the entity's own version first, then the embedded rows'
+    return '"' + '.'.join(str(version) if version is not None else '0' for version in versions) + '"'
+
+def if_match_versions(request: Request) -> Optional[List[int]]:
+    # Entity versions named by If-Match, None without the header or for '*' (any current version).
+    # Only the first ETag component guards an update, changes to embedded rows never block it.
+    if_match = request.headers.get('if-match')
+    if if_match is None:
+        return None
+    versions = []
+    for tag in (tag.strip() for tag in if_match.split(',')):
+        if tag == '*':
+            return None
+        # Strong comparison (RFC 9110 13.1.1): weak and malformed tags match nothing
+        if len(tag) < 2 or not tag.startswith('"') or not tag.endswith('"'):
+            continue
+        version = tag[1:-1].split('.')[0]
+        if version.isdigit():
+            versions.append(int(version))
+    return versions
+
+def last_modified_of(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    present = [_as_utc(value) for value in timestamps if value is not None]
+    return max(present) if present else None
+
+def is_conditional(request: Request) -> bool:
+    return 'if-none-match' in request.headers or 'if-modified-since' in request.headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2), tags are compared weakly
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= _as_utc(since)
+    return False
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    # Clients may keep the body but must revalidate before reusing it
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
\ No newline at end of file
@@ -0,0 +1,118 @@
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds in seconds of the request latency histogram, +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label of requests no route matched (404s, scanners), keeps raw paths out of the metrics
+UNMATCHED_ROUTE = "<unmatched>"
+
+class RequestTiming:
+    """Database work done on behalf of one request, filled in by the engine event hooks."""
+
+    __slots__ = ("scope", "queries", "db_seconds", "statements")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        # Normalized SQL -> executions, only kept while a query budget is enforced
+        self.statements: Optional[Counter] = None
+
+def route_template(scope: dict) -> str:
+    # The router stores the matched route in the scope, its path template is the label
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+# Set by MetricsMiddleware; SQLAlchemy runs the cursor events in a greenlet sharing the request's context
+current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("current_timing", default=None)
+
+class RouteMetrics:
+    __slots__ = ("bucket_counts", "count", "seconds_total", "queries_total", "db_seconds_total", "statuses")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds_total = 0.0
+        self.queries_total = 0
+        self.db_seconds_total = 0.0
+        self.statuses: Dict[int, int] = {}
+
+class MetricsRegistry:
+    """Per-process metrics keyed by (method, route template), the label set stays bounded by the routes."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timing: RequestTiming):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        metrics.count += 1
+        metrics.seconds_total += seconds
+        metrics.queries_total += timing.queries
+        metrics.db_seconds_total += timing.db_seconds
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self) -> str:
+        # Prometheus text exposition format 0.0.4
+        lines: List[str] = [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, metrics.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds_total}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+        lines += ["# HELP http_responses_total Responses by route template and status code.", "# TYPE http_responses_total counter"]
+        for (method, route), metrics in sorted(self.routes.items()):
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+        lines += ["# HELP db_queries_total SQL statements executed while serving the route.", "# TYPE db_queries_total counter"]
+        lines += [f'db_queries_total{{method="{method}",route="{_escape(route)}"}} {metrics.queries_total}' for (method, route), metrics in sorted(self.routes.items())]
+        lines += ["# HELP db_query_seconds_total Time spent in SQL statements while serving the route.", "# TYPE db_query_seconds_total counter"]
+        lines += [f'db_query_seconds_total{{method="{method}",route="{_escape(route)}"}} {metrics.db_seconds_total}' for (method, route), metrics in sorted(self.routes.items())]
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+metrics_registry = MetricsRegistry()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish_query(conn)
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        _finish_query(exception_context.connection)
+
+def _finish_query(conn):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    timing = current_timing.get()
+    if timing is not None:
+        timing.queries += 1
+        timing.db_seconds += elapsed
+
+def instrument_engine(engine: Engine):
+    """Count statements and their time into the current request, pass AsyncEngine.sync_engine for async engines."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, TYPE_CHECKING
+
+from app.exceptions.service_exceptions import ServiceUnavailableException
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# passlib's own default cost for bcrypt
+DEFAULT_BCRYPT_ROUNDS = 12
+
+@lru_cache
+def get_crypt_context(rounds: int = DEFAULT_BCRYPT_ROUNDS) -> "CryptContext":
+    # passlib is slow to import, deferred until the first hash (or PasswordHasher.warm_up)
+    from passlib.context import CryptContext
+    # Creating a CryptContext specifically for bcrypt
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+
+# Module level so they can be pickled into a ProcessPoolExecutor
+def hash_password(password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> str:
+    return get_crypt_context(rounds).hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    # The cost is read from the hash itself, any context verifies it
+    return get_crypt_context().verify(plain_password, hashed_password)
+
+def get_hash_rounds(hashed_password: str) -> int:
+    # bcrypt hashes look like $2b$<rounds>$<salt+digest>
+    try:
+        return int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return 0
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop in a bounded pool and rejects work once the pool and its queue are full."""
+
+    def __init__(self, rounds: int = DEFAULT_BCRYPT_ROUNDS, max_workers: int = 4, queue_limit: int = 64, use_processes: bool = False):
+        self.rounds = rounds
+        self.capacity = max_workers + queue_limit
+        self.pending = 0
+        self.rejected = 0
+        # pyca/bcrypt releases the GIL while hashing, so threads already run in parallel
+        self._executor: Executor = ProcessPoolExecutor(max_workers=max_workers) if use_processes else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        # Only touched from the event loop thread, a plain counter is enough
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise ServiceUnavailableException(detail="Too many password operations in progress, retry shortly")
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        job = self._executor.submit(fn, *args)
+        # Released when the job itself ends, not the awaiting request: a cancelled request leaves a
+        # started hash running, and it keeps its slot until then. Callbacks may run in a worker thread
+        job.add_done_callback(lambda _: self._release_from(loop))
+        return await asyncio.wrap_future(job)
+
+    def _release_from(self, loop: asyncio.AbstractEventLoop):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release)
+
+    def _release(self):
+        self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def warm_up(self):
+        # Imports passlib, selects the bcrypt backend and starts a worker, off the event loop
+        await self.hash("warm-up")
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return get_hash_rounds(hashed_password) != self.rounds
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.metrics import RequestTiming, current_timing, route_template
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+\b")
+# asyncpg binds carry explicit casts, $1::UUID
+_PLACEHOLDER_CAST = re.compile(r"\?::\w+(?:\[\])?")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+# (?, ?, ?) or several of them in a row, as produced by IN lists and multi-row VALUES
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(statement: str) -> str:
+    # One shape per statement: literals and placeholders become ?, lists of them collapse to (...)
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _PLACEHOLDER_CAST.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LISTS.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+def parameter_shapes(parameters: Any) -> Any:
+    # Types and sizes only, bound values may hold personal data
+    if isinstance(parameters, dict):
+        return {key: parameter_shapes(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return _shape(parameters)
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, str) and len(value) > 64:
+        return f"str({len(value)})"
+    return type(value).__name__
+
+class RateLimiter:
+    """At most `per_minute` events in each fixed one-minute window."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.window_started = time.monotonic()
+        self.count = 0
+        self.suppressed = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if now - self.window_started >= 60:
+            self.window_started, self.count = now, 0
+        if self.count >= self.per_minute:
+            self.suppressed += 1
+            return False
+        self.count += 1
+        return True
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryLog:
+    """
+    Slow-query log and per-request query budget, fed by cursor-execute events.
+
+    Statements over the threshold are logged with route, normalized SQL, bind parameter shapes and
+    duration. A sample of the slow SELECTs is re-run as EXPLAIN (ANALYZE, BUFFERS) on a separate,
+    read-only connection in the background, so the plan never delays or alters the request.
+    """
+
+    def __init__(
+            self,
+            threshold_ms: float = 0,
+            explain_sample_rate: float = 0.0,
+            explain_timeout_ms: int = 5000,
+            logs_per_minute: int = 60,
+            explains_per_minute: int = 6,
+            budget_max_statements: int = 0,
+            budget_max_repeats: int = 0,
+            budget_raise: bool = False
+    ):
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.log_limiter = RateLimiter(logs_per_minute)
+        self.explain_limiter = RateLimiter(explains_per_minute)
+        self.budget_max_statements = budget_max_statements
+        self.budget_max_repeats = budget_max_repeats
+        self.budget_raise = budget_raise
+        # Watched engines by their sync engine, a plan is explained on the database that ran the statement
+        self.engines: Dict[Engine, AsyncEngine] = {}
+        # Strong references, the event loop only keeps weak ones to running tasks
+        self._explain_tasks = set()
+
+    @property
+    def budget_enabled(self) -> bool:
+        return self.budget_max_statements > 0 or self.budget_max_repeats > 0
+
+    def watch(self, engine: AsyncEngine):
+        self.engines[engine.sync_engine] = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_log_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_log_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if context is not None and context.execution_options.get("skip_query_log"):
+            return
+        timing = current_timing.get()
+        if self.budget_enabled and timing is not None:
+            if timing.statements is None:
+                timing.statements = Counter()
+            shape = normalize_sql(statement)
+            timing.statements[shape] += 1
+            if self.budget_raise:
+                self._enforce_budget(timing, shape)
+        if self.threshold_seconds and elapsed >= self.threshold_seconds:
+            self._log_slow(statement, parameters, elapsed, executemany, timing, self.engines.get(conn.engine))
+
+    def _log_slow(self, statement: str, parameters: Any, elapsed: float, executemany: bool, timing: Optional[RequestTiming], engine: Optional[AsyncEngine] = None):
+        if not self.log_limiter.allow():
+            return
+        route = route_template(timing.scope) if timing is not None and timing.scope is not None else "<no request>"
+        logger.warning(
+            "slow query %.1f ms route=%s sql=%s params=%s",
+            elapsed * 1000, route, normalize_sql(statement), parameter_shapes(parameters)
+        )
+        explainable = not executemany and statement.lstrip()[:6].upper() == "SELECT"
+        if explainable and engine is not None and random.random() < self.explain_sample_rate and self.explain_limiter.allow():
+            task = asyncio.get_running_loop().create_task(self._explain(engine, statement, parameters, route))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, engine: AsyncEngine, statement: str, parameters: Any, route: str):
+        # Runs in a copy of the request's context, its queries must not count towards that request
+        current_timing.set(None)
+        try:
+            async with engine.connect() as connection:
+                # Read-only transaction, rolled back when the connection is released
+                await connection.execution_options(skip_query_log=True, postgresql_readonly=True)
+                await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                result = await connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in result)
+        except Exception as error:
+            logger.warning("slow query explain failed route=%s sql=%s error=%r", route, normalize_sql(statement), error)
+            return
+        logger.warning("slow query plan route=%s sql=%s\n%s", route, normalize_sql(statement), plan)
+
+    def _enforce_budget(self, timing: RequestTiming, shape: str):
+        # Raised from the statement that goes over, the request fails before its response starts
+        statements = sum(timing.statements.values())
+        if self.budget_max_statements and statements > self.budget_max_statements:
+            raise QueryBudgetExceeded(f"query budget exceeded on {self._request_label(timing)}: {statements} statements, budget {self.budget_max_statements}")
+        if self.budget_max_repeats and timing.statements[shape] > self.budget_max_repeats:
+            raise QueryBudgetExceeded(f"query budget exceeded on {self._request_label(timing)}: {timing.statements[shape]}x {shape}")
+
+    @staticmethod
+    def _request_label(timing: RequestTiming) -> str:
+        if timing.scope is None:
+            return "<no request>"
+        return f"{timing.scope.get('method')} {route_template(timing.scope)}"
+
+    def check_budget(self, timing: RequestTiming, scope: dict):
+        """Called once the request is done, logs too many statements and N+1 style repeats in 'warn' mode."""
+        # 'raise' mode already failed the request on the statement that went over
+        if not self.budget_enabled or self.budget_raise or not timing.statements:
+            return
+        problems: List[str] = []
+        if self.budget_max_statements and timing.queries > self.budget_max_statements:
+            problems.append(f"{timing.queries} statements, budget {self.budget_max_statements}")
+        if self.budget_max_repeats:
+            problems.extend(
+                f"{count}x {sql}" for sql, count in timing.statements.most_common()
+                if count > self.budget_max_repeats
+            )
+        if not problems:
+            return
+        logger.warning(f"query budget exceeded on {scope.get('method')} {route_template(scope)}: " + "; ".join(problems))
\ No newline at end of file
@@ -0,0 +1,86 @@
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from jose import jwt, JWTError
+
+# Where clients send the read-your-writes token back, see StickyWrites
+STICKY_COOKIE = "read_your_writes"
+STICKY_HEADER = "X-Read-Your-Writes"
+
+def read_only(endpoint):
+    """Marks a route that never writes although its method is not GET, its callers are not made sticky."""
+    endpoint.read_only = True
+    return endpoint
+
+def is_read_only_route(scope: dict) -> bool:
+    # The router stores the matched route in the scope before the response starts
+    return getattr(getattr(scope.get("route"), "endpoint", None), "read_only", False)
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """User id claim of a bearer token, read without checking the signature."""
+    # Only decides which database serves the caller's reads, routes still verify the token
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.get_unverified_claims(authorization[7:].strip()).get("id")
+    except JWTError:
+        return None
+
+class StickyWrites:
+    """
+    Users who wrote within the last `seconds`, their reads stay on the primary until replicas catch up.
+
+    Every successful write hands the writer a signed token holding the window's deadline, as a cookie and as
+    a response header. Any worker honours the token when the client sends it back (browsers do so with the
+    cookie, API clients echo the header), the in-process entries only cover clients that send neither.
+    """
+
+    def __init__(self, secret: str, seconds: float = 5.0, max_entries: int = 10000):
+        self.seconds = seconds
+        self.max_entries = max_entries
+        # Separate key, a sticky token can never pass for anything signed with the JWT secret
+        self._key = hashlib.sha256(b"read-your-writes:" + secret.encode()).digest()
+        self._deadlines: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, subject: str) -> str:
+        # Wall clock in the token, it is checked by other workers and hosts
+        deadline_ms = int((time.time() + self.seconds) * 1000)
+        self._deadlines[subject] = time.monotonic() + self.seconds
+        self._deadlines.move_to_end(subject)
+        while len(self._deadlines) > self.max_entries:
+            self._deadlines.popitem(last=False)
+        return f"{subject}.{deadline_ms}.{self._sign(subject, deadline_ms)}"
+
+    def is_sticky(self, subject: Optional[str], token: Optional[str] = None) -> bool:
+        if subject is None:
+            return False
+        return self._has_token(subject, token) or self._has_entry(subject)
+
+    def _has_token(self, subject: str, token: Optional[str]) -> bool:
+        if not token:
+            return False
+        try:
+            token_subject, deadline, signature = token.rsplit(".", 2)
+            deadline_ms = int(deadline)
+        except ValueError:
+            return False
+        return (
+            token_subject == subject
+            and deadline_ms > time.time() * 1000
+            and hmac.compare_digest(signature, self._sign(subject, deadline_ms))
+        )
+
+    def _has_entry(self, subject: str) -> bool:
+        deadline = self._deadlines.get(subject)
+        if deadline is None:
+            return False
+        if deadline <= time.monotonic():
+            del self._deadlines[subject]
+            return False
+        return True
+
+    def _sign(self, subject: str, deadline_ms: int) -> str:
+        return hmac.new(self._key, f"{subject}.{deadline_ms}".encode(), hashlib.sha256).hexdigest()[:32]
\ No newline at end of file
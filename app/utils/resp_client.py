@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+class RespError(Exception):
+    pass
+
+class RespClient:
+    """
+    Minimal client for the Redis serialization protocol (RESP2), enough for GET/SET/DEL.
+    Talks to Redis, Valkey or any compatible server over one connection per worker.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # Requests and replies are matched by order, one command at a time on the connection
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args: Any) -> Any:
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._execute(args), timeout=self.timeout)
+            except RespError:
+                # Error reply read in full, the connection is still in step
+                raise
+            except BaseException:
+                # Also on cancellation: a command written but not read back would leave its reply
+                # for the next caller. Drop the connection, the next command reconnects
+                self.close()
+                raise
+
+    async def _execute(self, args) -> Any:
+        if self._writer is None:
+            await self._connect()
+        return await self._command(args)
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._command(('AUTH', self.password))
+        if self.db:
+            await self._command(('SELECT', self.db))
+
+    async def _command(self, args) -> Any:
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        return b''.join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise EOFError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b'+':
+            return payload.decode()
+        if prefix == b'-':
+            raise RespError(payload.decode())
+        if prefix == b':':
+            return int(payload)
+        if prefix == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if prefix == b'*':
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply prefix {prefix!r}")
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
@@ -0,0 +1,24 @@
+from typing import Any, Mapping, Optional
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+class ModelResponse(Response):
+    """
+    JSON response serialized in one pass by a pre-built TypeAdapter.
+    Returning it from a route skips FastAPI's response_model re-validation and jsonable_encoder,
+    response_model is then only used for the OpenAPI schema. Adapters are built once at import
+    in app.transformers, and the transformers fill them with model_construct since rows are already typed.
+    """
+    media_type = "application/json"
+
+    def __init__(
+            self,
+            content: Any,
+            adapter: TypeAdapter,
+            status_code: int = 200,
+            headers: Optional[Mapping[str, str]] = None,
+            background: Optional[BackgroundTask] = None
+    ):
+        super().__init__(content=adapter.dump_json(content), status_code=status_code, headers=headers, background=background)
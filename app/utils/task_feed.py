@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Sent when events were missed (resume point no longer buffered, slow subscriber, lost listener), the client reloads its tasks
+RESET_FRAME = b"event: reset\ndata: {}\n\n"
+KEEPALIVE_FRAME = b": keepalive\n\n"
+# Backoff between reconnects of the listener, doubled after every failure and reset once listening again
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+class TaskFeedSubscriber:
+    """Frames waiting for one SSE response, bounded so a stalled client cannot hold an unbounded backlog."""
+
+    __slots__ = ("user_id", "company_id", "max_frames", "frames", "ready")
+
+    def __init__(self, user_id: Optional[str], company_id: Optional[str], max_frames: int):
+        self.user_id = user_id
+        self.company_id = company_id
+        self.max_frames = max_frames
+        self.frames: Deque[bytes] = deque()
+        self.ready = asyncio.Event()
+
+    def push(self, frame: bytes):
+        if len(self.frames) >= self.max_frames:
+            # Too far behind: the backlog is dropped for a reset, later events follow as usual
+            self.frames.clear()
+            frame = RESET_FRAME
+        self.frames.append(frame)
+        self.ready.set()
+
+    async def next_frames(self, keepalive_seconds: float) -> List[bytes]:
+        if not self.frames:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream
+                return [KEEPALIVE_FRAME]
+        frames = list(self.frames)
+        self.frames.clear()
+        return frames
+
+    def sees(self, owners: Tuple[Optional[str], ...], companies: Tuple[Optional[str], ...]) -> bool:
+        if self.user_id is not None:
+            return self.user_id in owners
+        if self.company_id is not None:
+            return self.company_id in companies
+        return True
+
+class TaskFeed:
+    """
+    Task change events of one worker process: a single LISTEN connection fanned out to any number of subscribers.
+
+    Each notification is parsed and framed as a server-sent event once, then handed to the subscribers of its
+    owner, of its owner's company and to the unfiltered ones through dict lookups, so the cost of an event does
+    not grow with subscribers that cannot see it. The last `buffer_size` events are kept for Last-Event-ID resumes;
+    event ids come from a database sequence and Postgres delivers notifications in commit order to every
+    listener, so a client can resume on any worker.
+    """
+
+    def __init__(self, dsn: str, channel: str, buffer_size: int = 10000, subscriber_buffer: int = 1000, ping_seconds: float = 30.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.subscriber_buffer = subscriber_buffer
+        self.ping_seconds = ping_seconds
+        # (event id, owners, companies, frame) in delivery order
+        self._events: Deque[Tuple[int, Tuple[Optional[str], ...], Tuple[Optional[str], ...], bytes]] = deque(maxlen=buffer_size)
+        self._all: Set[TaskFeedSubscriber] = set()
+        self._by_user: Dict[str, Set[TaskFeedSubscriber]] = {}
+        self._by_company: Dict[str, Set[TaskFeedSubscriber]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self.connected = False
+        self.events_received = 0
+
+    async def start(self):
+        self._listener = asyncio.create_task(self._listen(), name="task-feed-listener")
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        self._listener = None
+
+    def subscribe(self, user_id: Optional[str] = None, company_id: Optional[str] = None, last_event_id: Optional[int] = None) -> TaskFeedSubscriber:
+        # user_id wins over company_id, neither sees every event
+        subscriber = TaskFeedSubscriber(user_id, None if user_id is not None else company_id, self.subscriber_buffer)
+        if last_event_id is not None:
+            self._replay(subscriber, last_event_id)
+        if subscriber.user_id is not None:
+            self._by_user.setdefault(subscriber.user_id, set()).add(subscriber)
+        elif subscriber.company_id is not None:
+            self._by_company.setdefault(subscriber.company_id, set()).add(subscriber)
+        else:
+            self._all.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: TaskFeedSubscriber):
+        if subscriber.user_id is not None:
+            _discard(self._by_user, subscriber.user_id, subscriber)
+        elif subscriber.company_id is not None:
+            _discard(self._by_company, subscriber.company_id, subscriber)
+        else:
+            self._all.discard(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "subscribers": len(self._all) + sum(map(len, self._by_user.values())) + sum(map(len, self._by_company.values())),
+            "buffered_events": len(self._events),
+            "oldest_event_id": self._events[0][0] if self._events else None,
+            "events_received": self.events_received,
+        }
+
+    def _replay(self, subscriber: TaskFeedSubscriber, last_event_id: int):
+        # Delivery order is not id order across concurrent transactions, so resume from the event's position
+        for position in range(len(self._events) - 1, -1, -1):
+            if self._events[position][0] == last_event_id:
+                break
+        else:
+            subscriber.push(RESET_FRAME)
+            return
+        for index in range(position + 1, len(self._events)):
+            _, owners, companies, frame = self._events[index]
+            if subscriber.sees(owners, companies):
+                subscriber.push(frame)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = json.loads(payload)
+            event_id = int(event["id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("ignored malformed task change %r", payload[:200])
+            return
+        self.events_received += 1
+        owners = (event.get("user_id"), event.get("previous_user_id"))
+        companies = (event.get("company_id"), event.get("previous_company_id"))
+        frame = f"id: {event_id}\nevent: task\ndata: {payload}\n\n".encode()
+        self._events.append((event_id, owners, companies, frame))
+
+        for subscriber in self._all:
+            subscriber.push(frame)
+        # A subscriber sits in exactly one index entry, reassigned tasks reach both the old and the new owner
+        for user_id in owners:
+            for subscriber in self._by_user.get(user_id, ()):
+                subscriber.push(frame)
+        for index, company_id in enumerate(companies):
+            if index and company_id == companies[0]:
+                continue
+            for subscriber in self._by_company.get(company_id, ()):
+                subscriber.push(frame)
+
+    def _reset(self):
+        # Notifications sent while the listener was down are gone, nobody can resume across the gap
+        self._events.clear()
+        for subscriber in self._all:
+            subscriber.push(RESET_FRAME)
+        for subscribers in (*self._by_user.values(), *self._by_company.values()):
+            for subscriber in subscribers:
+                subscriber.push(RESET_FRAME)
+
+    async def _listen(self):
+        reconnecting = False
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except Exception:
+                # Cancellation is not an Exception and still stops the listener
+                logger.exception("task feed listener cannot connect, retrying in %.0f s", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+                continue
+            try:
+                await connection.add_listener(self.channel, self._on_notification)
+                self.connected = True
+                delay = RECONNECT_MIN_SECONDS
+                if reconnecting:
+                    self._reset()
+                reconnecting = True
+                logger.info("task feed listening on %s", self.channel)
+                while True:
+                    # Notifications arrive through the connection's protocol, the ping only detects a dead connection
+                    await asyncio.sleep(self.ping_seconds)
+                    await asyncio.wait_for(connection.execute("SELECT 1"), timeout=self.ping_seconds)
+            except Exception:
+                logger.exception("task feed listener lost its connection, reconnecting in %.0f s", delay)
+            finally:
+                self.connected = False
+                connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+def _discard(index: Dict[str, Set[TaskFeedSubscriber]], key: str, subscriber: TaskFeedSubscriber):
+    subscribers = index.get(key)
+    if subscribers is not None:
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del index[key]
\ No newline at end of file
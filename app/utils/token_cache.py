@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.schemas.user import UserInToken
+
+class VerifiedTokenCache:
+    """Bounded LRU of bearer tokens whose signature and expiry were already checked."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, UserInToken]]" = OrderedDict()
+        # Sync dependencies run in the threadpool, guard the OrderedDict moves
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserInToken]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def set(self, token: str, user: UserInToken, token_expires_at: float):
+        # Never keep a token past its own exp claim
+        expires_at = min(time.time() + self.ttl_seconds, token_expires_at)
+        with self._lock:
+            self._entries[token] = (expires_at, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
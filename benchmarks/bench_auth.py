@@ -0,0 +1,30 @@
+"""Per-request cost of resolving the bearer token on authenticated routes.
+
+Usage: python -m benchmarks.bench_auth [iterations]
+"""
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+from app.services.auth_service import AuthService
+from app.utils.token_cache import VerifiedTokenCache
+
+def main(iterations: int = 20000):
+    config = SimpleNamespace(JWT_SECRET_KEY="benchmark-secret", JWT_ALGORITHM="HS256")
+    user = SimpleNamespace(id=uuid.uuid4(), username="bench", first_name="Bench", last_name="User", is_admin=False)
+
+    uncached = AuthService(config=config, user_service=None)
+    cached = AuthService(config=config, user_service=None, token_cache=VerifiedTokenCache())
+    token = uncached.create_access_token(user, timedelta(minutes=15))
+
+    for name, auth_service in (("jwt.decode every request", uncached), ("verified-token cache", cached)):
+        auth_service.get_current_user(token)  # warm up, fills the cache
+        seconds = timeit.timeit(lambda: auth_service.get_current_user(token), number=iterations)
+        print(f"{name:<28} {seconds / iterations * 1e6:8.2f} us/request")
+
+    print("cache stats:", cached.token_cache.stats())
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,115 @@
+"""Completed tasks of a company: the old implicit cross join against the explicit join.
+
+Seeds one company with 10k users and 1M tasks (once, reused on later runs), then times both
+queries against the database configured in .env.
+
+Usage: python -m benchmarks.bench_company_completed [--users 10000] [--tasks 1000000] [--timeout 60]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from sqlalchemy import select, text, desc
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import joinedload
+
+from app.dependencies.db import AsyncSessionLocal, get_engine, dispose_engine
+from app.models import Task, User
+from app.models.task import StatusEnum
+from app.services.task_service import TaskService
+
+BENCH_COMPANY_ID = uuid.UUID("b3e1c0de-0000-4000-8000-000000000001")
+
+SEED_COMPANY = text("""
+INSERT INTO companies (id, name, description, mode, created_at, updated_at)
+VALUES (:company_id, 'Benchmark company', 'Seeded by benchmarks.bench_company_completed', true, now(), now())
+""")
+
+SEED_USERS = text("""
+INSERT INTO users (id, email, username, first_name, last_name, hashed_password, is_active, is_admin, company_id, created_at, updated_at)
+SELECT gen_random_uuid(), 'bench_' || g || '@example.com', 'bench_' || g, 'Bench', 'User ' || g, '', true, false, :company_id, now(), now()
+FROM generate_series(1, :users) AS g
+""")
+
+SEED_TASKS = text("""
+WITH company_users AS (SELECT array_agg(id) AS ids FROM users WHERE company_id = :company_id)
+INSERT INTO tasks (id, user_id, summary, status, priority, created_at, updated_at)
+SELECT gen_random_uuid(),
+       company_users.ids[1 + g % :users],
+       'Benchmark task ' || g,
+       (ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[1 + g % 3]::statusenum,
+       (ARRAY['LOW', 'MEDIUM', 'HIGH'])[1 + g % 3]::priorityenum,
+       now() - make_interval(secs => g),
+       now()
+FROM generate_series(1, :tasks) AS g, company_users
+""")
+
+def legacy_query(company_id: uuid.UUID):
+    # The query as it was: users only joined through the aliased joinedload, so the filter adds a second FROM users
+    return (
+        select(Task)
+        .options(joinedload(Task.user, innerjoin=True))
+        .where(User.company_id == company_id, Task.status == StatusEnum.DONE)
+    )
+
+async def seed(users: int, tasks: int):
+    async with get_engine().begin() as connection:
+        exists = await connection.scalar(text("SELECT count(*) FROM companies WHERE id = :company_id"), {"company_id": BENCH_COMPANY_ID})
+        if exists:
+            print("benchmark company already seeded")
+            return
+        started = time.perf_counter()
+        await connection.execute(SEED_COMPANY, {"company_id": BENCH_COMPANY_ID})
+        await connection.execute(SEED_USERS, {"company_id": BENCH_COMPANY_ID, "users": users})
+        await connection.execute(SEED_TASKS, {"company_id": BENCH_COMPANY_ID, "users": users, "tasks": tasks})
+        print(f"seeded {users} users and {tasks} tasks in {time.perf_counter() - started:.1f}s")
+    async with get_engine().connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE users"))
+        await connection.execute(text("ANALYZE tasks"))
+
+async def explain(statement, timeout_seconds: int) -> dict:
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    async with get_engine().connect() as connection:
+        await connection.execute(text(f"SET statement_timeout = '{timeout_seconds}s'"))
+        try:
+            plan = await connection.scalar(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+        except Exception as error:
+            return {"error": f"{type(error).__name__} (statement_timeout {timeout_seconds}s)"}
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return {"execution_ms": plan[0]["Execution Time"], "rows": plan[0]["Plan"]["Actual Rows"]}
+
+async def time_service(limit: int, rounds: int = 20) -> float:
+    async with AsyncSessionLocal() as session:
+        task_service = TaskService(async_session=session)
+        await task_service.get_tasks_by_company_id_and_status(BENCH_COMPANY_ID, StatusEnum.DONE, limit=limit)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await task_service.get_tasks_by_company_id_and_status(BENCH_COMPANY_ID, StatusEnum.DONE, limit=limit)
+        return (time.perf_counter() - started) / rounds * 1000
+
+async def main(args):
+    await seed(args.users, args.tasks)
+
+    new_query = (
+        select(Task)
+        .join(Task.user)
+        .where(User.company_id == BENCH_COMPANY_ID, Task.status == StatusEnum.DONE)
+        .order_by(desc(Task.created_at), desc(Task.id))
+        .limit(args.limit)
+    )
+    print("legacy implicit cross join:", await explain(legacy_query(BENCH_COMPANY_ID), args.timeout))
+    print(f"explicit join, first {args.limit}:", await explain(new_query, args.timeout))
+    print(f"TaskService end to end, {args.limit} rows: {await time_service(args.limit):.2f} ms/request")
+    await dispose_engine()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--timeout", type=int, default=60, help="statement_timeout in seconds for each EXPLAIN ANALYZE")
+    asyncio.run(main(parser.parse_args()))
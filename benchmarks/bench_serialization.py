@@ -0,0 +1,102 @@
+"""Per-row CPU cost of rendering the /tasks and /users list responses.
+
+Compares the previous path (validating constructors, FastAPI response_model re-validation,
+jsonable_encoder, json.dumps) with ModelResponse (model_construct + one TypeAdapter.dump_json).
+Rows are in-memory stand-ins for ORM objects, so only serialization is measured.
+
+Usage: python -m benchmarks.bench_serialization [rows] [rounds]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.task import StatusEnum, PriorityEnum
+from app.schemas.company import CompanyInfo
+from app.schemas.task import TaskResponseDetail
+from app.schemas.user import UserInfo, UserResponseDetail
+from app.transformers.task_transformers import TasksPaginatedResponse, TASKS_PAGINATED_ADAPTER, generate_tasks_paginated_response
+from app.transformers.user_transformers import USER_LIST_ADAPTER, transform_to_user_response
+from app.utils.responses import ModelResponse
+
+def make_rows(count: int):
+    company = SimpleNamespace(id=uuid.uuid4(), name="Benchmark company", mode=True)
+    users, tasks = [], []
+    for index in range(count):
+        user = SimpleNamespace(
+            id=uuid.uuid4(), company_id=company.id, company=company, email=f"user{index}@example.com",
+            username=f"user{index}", first_name="Bench", last_name=f"User {index}", is_active=True,
+            is_admin=False, created_at=datetime.now(timezone.utc), version=1
+        )
+        users.append(user)
+        tasks.append(SimpleNamespace(
+            id=uuid.uuid4(), user_id=user.id, user=user, summary=f"Task {index}", description="Benchmark task",
+            status=StatusEnum.TODO, priority=PriorityEnum.MEDIUM, created_at=datetime.now(timezone.utc), version=1
+        ))
+    return tasks, users
+
+# The transformers as they were, validating every row
+def legacy_task_response(task) -> TaskResponseDetail:
+    return TaskResponseDetail(
+        task_id=task.id,
+        user_info=UserInfo(user_id=task.user_id, first_name=task.user.first_name, last_name=task.user.last_name),
+        summary=task.summary, description=task.description, status=task.status,
+        priority=task.priority, created_at=task.created_at, version=task.version
+    )
+
+def legacy_user_response(user) -> UserResponseDetail:
+    return UserResponseDetail(
+        id=user.id,
+        company_info=CompanyInfo(company_id=user.company_id, name=user.company.name, status="Active" if user.company.mode else "Inactive"),
+        email=user.email, username=user.username, first_name=user.first_name, last_name=user.last_name,
+        is_active=user.is_active, is_admin=user.is_admin, created_at=user.created_at, version=user.version
+    )
+
+async def legacy_render(field, content) -> bytes:
+    # What FastAPI does with a plain return value: validate against response_model, encode, dump
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+async def measure(name: str, render, rows: int, rounds: int):
+    await render()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await render()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<32} {elapsed / rounds * 1000:8.2f} ms/response {elapsed / rounds / rows * 1e6:8.2f} us/row")
+
+async def main(rows: int, rounds: int):
+    tasks, users = make_rows(rows)
+    tasks_field = create_response_field(name="Response_get_tasks", type_=TasksPaginatedResponse, mode="serialization")
+    users_field = create_response_field(name="Response_get_users", type_=List[UserResponseDetail], mode="serialization")
+
+    async def legacy_tasks():
+        page = TasksPaginatedResponse(total=rows, page=1, size=rows, items=[legacy_task_response(task) for task in tasks])
+        return await legacy_render(tasks_field, page)
+
+    async def fast_tasks():
+        return ModelResponse(generate_tasks_paginated_response(tasks, rows, 0, rows), TASKS_PAGINATED_ADAPTER).body
+
+    async def legacy_users():
+        return await legacy_render(users_field, [legacy_user_response(user) for user in users])
+
+    async def fast_users():
+        return ModelResponse([transform_to_user_response(user) for user in users], USER_LIST_ADAPTER).body
+
+    await measure("/tasks  response_model path", legacy_tasks, rows, rounds)
+    await measure("/tasks  ModelResponse", fast_tasks, rows, rounds)
+    await measure("/users  response_model path", legacy_users, rows, rounds)
+    await measure("/users  ModelResponse", fast_users, rows, rounds)
+
+if __name__ == '__main__':
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    ))
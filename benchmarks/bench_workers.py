@@ -0,0 +1,118 @@
+"""Throughput of the production server (python -m app.server) from 1 to 8 workers.
+
+For each worker count, starts the server as a subprocess with WEB_WORKERS set, waits for
+/health/ready, runs a few load test scenarios over keep-alive connections and stops the server
+with SIGTERM. Uses the load test data (seeded once, see benchmarks.loadtest) and the database
+configured in .env. The load generator is a single process: when it saturates a core before the
+server does, the larger worker counts stop scaling, raise --concurrency or run it on another host.
+
+Usage: python -m benchmarks.bench_workers [--workers 1 2 4 8] [--concurrency 64] [--requests 2000]
+                                          [--connection-budget 80] [--port 8100]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from app.dependencies.db import AsyncSessionLocal, dispose_engine
+
+from .loadtest.report import print_report
+from .loadtest.runner import setup, run_scenario
+from .loadtest.scenarios import SCENARIOS, LoadContext
+from .loadtest.seed import is_seeded, seed, load_seed_data
+from .loadtest.transport import HttpTransport
+
+# CPU bound, DB bound and mixed, in that order
+DEFAULT_SCENARIOS = ("GET /health/live", "GET /tasks/{task_id}", "GET /tasks [user]")
+
+def start_server(workers: int, port: int, connection_budget: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_WORKERS=str(workers), WEB_PORT=str(port), WEB_HOST="127.0.0.1", DB_CONNECTION_BUDGET=str(connection_budget))
+    return subprocess.Popen([sys.executable, "-m", "app.server"], env=env)
+
+async def wait_until_ready(base_url: str, timeout: float = 60.0):
+    transport = HttpTransport(base_url)
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            try:
+                status, _, _ = await transport.request("GET", "/health/ready", {})
+                if status == 200:
+                    return
+            except (OSError, EOFError, asyncio.IncompleteReadError):
+                transport.close()
+            await asyncio.sleep(0.25)
+    finally:
+        transport.close()
+    raise SystemExit(f"server at {base_url} not ready after {timeout:.0f}s")
+
+def stop_server(process: subprocess.Popen):
+    # Same signal as docker stop, the supervisor drains its workers
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+async def main(args):
+    async with AsyncSessionLocal() as session:
+        if not await is_seeded(session):
+            await seed(session, args.companies, args.users, args.tasks, args.seed)
+        seed_data = await load_seed_data(session)
+    await dispose_engine()
+
+    scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.scenario]
+    base_url = f"http://127.0.0.1:{args.port}"
+    # Worker count -> scenario -> req/s
+    throughput: Dict[int, Dict[str, float]] = {}
+    for workers in args.workers:
+        process = start_server(workers, args.port, args.connection_budget)
+        try:
+            await wait_until_ready(base_url)
+            context = LoadContext(seed=seed_data)
+            transports = [HttpTransport(base_url) for _ in range(args.concurrency)]
+            try:
+                await setup(transports[0], context, args.login_users)
+                results = {
+                    scenario.name: await run_scenario(scenario, context, transports, args.requests, args.warmup, args.seed)
+                    for scenario in scenarios
+                }
+            finally:
+                for transport in transports:
+                    transport.close()
+        finally:
+            stop_server(process)
+        summaries = {name: result.summary() for name, result in results.items()}
+        print(f"\n{workers} workers")
+        print_report(summaries)
+        throughput[workers] = {name: summary["throughput"] for name, summary in summaries.items()}
+
+    first = args.workers[0]
+    print(f"\nspeedup over {first} worker(s)")
+    width = max(len(scenario.name) for scenario in scenarios)
+    print(f"{'endpoint':<{width}} " + " ".join(f"{str(workers) + 'w':>7}" for workers in args.workers))
+    for scenario in scenarios:
+        baseline = throughput[first][scenario.name] or 1.0
+        print(f"{scenario.name:<{width}} " + " ".join(f"{throughput[workers][scenario.name] / baseline:>6.2f}x" for workers in args.workers))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--scenario", action="append", help="load test scenario name, repeatable")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario and worker count")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--login-users", type=int, default=10)
+    parser.add_argument("--connection-budget", type=int, default=80, help="DB_CONNECTION_BUDGET of the server, shared by all workers")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(DEFAULT_SCENARIOS)
+    asyncio.run(main(args))
@@ -0,0 +1,98 @@
+"""Load test of every router against a local Postgres.
+
+Seeds synthetic data once (reused on later runs), logs in through /auth/token, then runs each
+scenario of benchmarks.loadtest.scenarios in turn at the given concurrency and reports
+throughput and p50/p95/p99 latency per endpoint. Runs against a server started separately
+(--base-url) or in-process against app.main:app (--in-process, no sockets).
+
+Usage:
+    python -m benchmarks.loadtest [--companies 20] [--users 2000] [--tasks 200000] [--concurrency 16]
+                                  [--requests 200] [--save-baseline benchmarks/baselines/local.json]
+                                  [--baseline benchmarks/baselines/local.json --threshold 0.2]
+
+Exits with status 1 when a request fails or an endpoint regresses past --threshold.
+"""
+import argparse
+import asyncio
+import sys
+from contextlib import AsyncExitStack
+from typing import Callable
+
+from app.dependencies.db import AsyncSessionLocal, dispose_engine
+
+from .report import summarize, print_report, save_baseline, load_baseline, compare_to_baseline
+from .runner import setup, run_scenario
+from .scenarios import SCENARIOS, LoadContext
+from .seed import is_seeded, reset, seed, load_seed_data
+from .transport import HttpTransport, AsgiTransport
+
+async def main(args) -> int:
+    async with AsyncSessionLocal() as session:
+        if args.reset:
+            await reset(session)
+        if await is_seeded(session):
+            print("reusing seeded data, pass --reset to regenerate it")
+        else:
+            await seed(session, args.companies, args.users, args.tasks, args.seed)
+        seed_data = await load_seed_data(session)
+
+    context = LoadContext(seed=seed_data)
+    results = {}
+    async with AsyncExitStack() as stack:
+        if args.in_process:
+            from app.main import app
+            # Startup warm-up and readiness like under uvicorn
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            make_transport: Callable = lambda: AsgiTransport(app)
+        else:
+            make_transport = lambda: HttpTransport(args.base_url)
+        transports = [make_transport() for _ in range(args.concurrency)]
+        stack.callback(lambda: [transport.close() for transport in transports])
+        await setup(transports[0], context, args.login_users)
+        for scenario in SCENARIOS:
+            if args.only and not any(pattern in scenario.name for pattern in args.only):
+                continue
+            results[scenario.name] = await run_scenario(scenario, context, transports, args.requests, args.warmup, args.seed)
+    await dispose_engine()
+
+    summaries = summarize(results)
+    print_report(summaries)
+    settings = {
+        "mode": "in-process" if args.in_process else "http",
+        "companies": args.companies, "users": args.users, "tasks": args.tasks, "seed": args.seed,
+        "concurrency": args.concurrency, "requests": args.requests,
+    }
+    if args.save_baseline:
+        save_baseline(args.save_baseline, settings, summaries)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare_to_baseline(load_baseline(args.baseline), settings, summaries, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"{len(regressions)} regressions past {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions past {args.threshold:.0%} against {args.baseline}")
+    elif any(summary["errors"] for summary in summaries.values()):
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="call app.main:app directly instead of a running server")
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the generated data and of every request")
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded data first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per endpoint")
+    parser.add_argument("--login-users", type=int, default=10, help="regular users whose tokens drive the non-admin scenarios")
+    parser.add_argument("--only", action="append", help="run only scenarios whose name contains this, repeatable")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative change, 0.2 = 20%%")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="latency increases below this are never regressions")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,79 @@
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+# Metrics compared against a baseline, and whether a higher value is worse
+COMPARED_METRICS = (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("throughput", False))
+
+@dataclass
+class EndpointResult:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "throughput": round(len(ordered) / self.elapsed_seconds, 2) if self.elapsed_seconds else 0.0,
+            "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50_ms": round(percentile(ordered, 50), 3),
+            "p95_ms": round(percentile(ordered, 95), 3),
+            "p99_ms": round(percentile(ordered, 99), 3),
+            "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        }
+
+def percentile(ordered: Sequence[float], pct: float) -> float:
+    # Nearest-rank percentile of an already sorted sample
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def print_report(summaries: Dict[str, dict]):
+    width = max([len(name) for name in summaries] + [8])
+    print(f"{'endpoint':<{width}} {'reqs':>6} {'errs':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, summary in summaries.items():
+        print(
+            f"{name:<{width}} {summary['requests']:>6} {summary['errors']:>5} {summary['throughput']:>9.1f} "
+            f"{summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+        )
+
+def save_baseline(path: str, settings: dict, summaries: Dict[str, dict]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump({"settings": settings, "endpoints": summaries}, baseline_file, indent=2, sort_keys=True)
+
+def load_baseline(path: str) -> dict:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+def compare_to_baseline(baseline: dict, settings: dict, summaries: Dict[str, dict], threshold: float, min_delta_ms: float) -> List[str]:
+    """Returns one line per regression, an empty list means the run is within threshold."""
+    regressions = []
+    if baseline.get("settings") != settings:
+        print(f"warning: baseline was recorded with {baseline.get('settings')}, this run used {settings}")
+    for name, summary in summaries.items():
+        if summary["errors"]:
+            regressions.append(f"{name}: {summary['errors']} failed requests")
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS:
+            before, after = previous[metric], summary[metric]
+            if higher_is_worse:
+                # Sub-millisecond endpoints jitter by more than any sane percentage
+                regressed = after > before * (1 + threshold) and after - before > min_delta_ms
+            else:
+                regressed = after < before * (1 - threshold)
+            if regressed:
+                change = (after - before) / before * 100 if before else math.inf
+                regressions.append(f"{name}: {metric} {before} -> {after} ({change:+.1f}%)")
+    return regressions
+
+def summarize(results: Dict[str, EndpointResult]) -> Dict[str, dict]:
+    return {name: result.summary() for name, result in results.items()}
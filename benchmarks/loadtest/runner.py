@@ -0,0 +1,68 @@
+"""Login, setup and the measuring loop of one scenario, shared by the load test and bench_workers."""
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List
+
+from .report import EndpointResult
+from .scenarios import Scenario, LoadContext, encode_request, ADMIN_LOGIN, login_request
+
+TRANSPORT_ERRORS = (OSError, EOFError, asyncio.IncompleteReadError, ValueError)
+
+async def login(transport, request) -> str:
+    status, _, body = await transport.request("POST", request.path, *encode_request(None, request, random.Random()))
+    if status != 200:
+        raise SystemExit(f"login as {request.form['username']} failed with {status}: {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+async def setup(transport, context: LoadContext, login_users: int):
+    context.admin_token = await login(transport, ADMIN_LOGIN)
+    for user_id, username in list(zip(context.seed.user_ids, context.seed.usernames))[:login_users]:
+        context.user_tokens.append((user_id, await login(transport, login_request(username))))
+    status, _, body = await transport.request("GET", "/tasks?limit=20&count=none", {"Authorization": f"Bearer {context.admin_token}"})
+    if status == 200:
+        context.first_page_cursor = json.loads(body).get("next_cursor")
+
+async def run_scenario(scenario: Scenario, context: LoadContext, transports: List, requests: int, warmup: int, rng_seed: int) -> EndpointResult:
+    result = EndpointResult(scenario.name)
+    issued = 0
+    first_error = None
+
+    async def virtual_user(transport, rng: random.Random, budget: int, record: bool):
+        nonlocal issued, first_error
+        while issued < budget:
+            issued += 1
+            request = scenario.build(context, rng)
+            if request is None:
+                # Nothing left to act on, e.g. every created row is already deleted
+                return
+            headers, body = encode_request(context, request, rng)
+            started = time.perf_counter()
+            try:
+                status, response_headers, content = await transport.request(request.method, request.path, headers, body)
+            except TRANSPORT_ERRORS as error:
+                status, response_headers, content = 0, {}, repr(error).encode()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if scenario.on_response is not None:
+                scenario.on_response(context, request, status, response_headers, content)
+            if not record:
+                continue
+            result.latencies_ms.append(elapsed_ms)
+            if status not in request.expected:
+                result.errors += 1
+                first_error = first_error or f"{request.method} {request.path} -> {status}: {content[:200]!r}"
+
+    # Warm up on one connection (caches, prepared statements, pool), then measure at full concurrency
+    await virtual_user(transports[0], random.Random(f"{rng_seed}:{scenario.name}:warmup"), warmup, record=False)
+    issued = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(transport, random.Random(f"{rng_seed}:{scenario.name}:{index}"), requests, record=True)
+        for index, transport in enumerate(transports)
+    ))
+    result.elapsed_seconds = time.perf_counter() - started
+    if first_error:
+        print(f"{scenario.name}: {result.errors} errors, first: {first_error}", file=sys.stderr)
+    return result
@@ -0,0 +1,190 @@
+"""One scenario per route (and per interesting variant), run in this order.
+
+Creates come before the updates and deletes that consume the ids they return, and plain reads
+come before the conditional reads that reuse their ETags.
+"""
+import json
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from uuid import UUID
+
+from app.models.task import StatusEnum, PriorityEnum
+
+from .seed import SeedData, SEED_PREFIX, SEED_PASSWORD, ADMIN_USERNAME
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    # Whose bearer token is sent: 'admin', 'user' or None
+    role: Optional[str] = 'admin'
+    json: Any = None
+    form: Optional[Dict[str, str]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    expected: Tuple[int, ...] = (200,)
+
+@dataclass
+class LoadContext:
+    seed: SeedData
+    admin_token: str = ""
+    # (user_id, token) of the regular users logged in during setup
+    user_tokens: List[Tuple[UUID, str]] = field(default_factory=list)
+    first_page_cursor: Optional[str] = None
+    task_etags: Dict[UUID, str] = field(default_factory=dict)
+    created_task_ids: Deque[UUID] = field(default_factory=deque)
+    created_user_ids: Deque[UUID] = field(default_factory=deque)
+    created_company_ids: Deque[UUID] = field(default_factory=deque)
+    sequence: int = 0
+
+    def next_sequence(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[LoadContext, random.Random], Optional[Request]]
+    on_response: Optional[Callable[[LoadContext, Request, int, Dict[str, str], bytes], None]] = None
+
+def _query(path: str, **params) -> str:
+    params = {key: value for key, value in params.items() if value is not None}
+    return f"{path}?{urlencode(params)}" if params else path
+
+def _remember(attribute: str, key: str = "id"):
+    def on_response(context: LoadContext, request: Request, status: int, headers: Dict[str, str], body: bytes):
+        if status in request.expected:
+            getattr(context, attribute).append(UUID(json.loads(body)[key]))
+    return on_response
+
+def _remember_etag(context: LoadContext, request: Request, status: int, headers: Dict[str, str], body: bytes):
+    if status == 200 and "etag" in headers:
+        context.task_etags[UUID(request.path.rsplit("/", 1)[1])] = headers["etag"]
+
+def _sample_ids(ids: List[UUID], rng: random.Random, size: int = 100) -> List[str]:
+    return [str(entity_id) for entity_id in rng.sample(ids, min(size, len(ids)))]
+
+def _pop(ids: Deque[UUID]) -> Optional[UUID]:
+    return ids.popleft() if ids else None
+
+def _task_create(context: LoadContext, rng: random.Random) -> dict:
+    return {
+        "user_id": str(rng.choice(context.seed.user_ids)),
+        "summary": f"{rng.choice(context.seed.words)} {rng.choice(context.seed.words)}",
+        "description": " ".join(rng.choice(context.seed.words) for _ in range(12)),
+        "status": rng.choice(list(StatusEnum)).value,
+        "priority": rng.choice(list(PriorityEnum)).value,
+    }
+
+def _update_task(context: LoadContext, rng: random.Random) -> Optional[Request]:
+    task_id = context.created_task_ids[rng.randrange(len(context.created_task_ids))] if context.created_task_ids else None
+    if task_id is None:
+        return None
+    return Request("PUT", f"/tasks/{task_id}", json={"status": rng.choice(list(StatusEnum)).value, "summary": "updated by load test"})
+
+def _delete(path: str, ids_attribute: str, expected: Tuple[int, ...]) -> Callable[[LoadContext, random.Random], Optional[Request]]:
+    def build(context: LoadContext, rng: random.Random) -> Optional[Request]:
+        entity_id = _pop(getattr(context, ids_attribute))
+        return Request("DELETE", f"{path}/{entity_id}", expected=expected) if entity_id else None
+    return build
+
+def _create_user(context: LoadContext, rng: random.Random) -> Request:
+    sequence = context.next_sequence()
+    return Request("POST", "/users/", json={
+        "company_id": str(rng.choice(context.seed.company_ids)), "email": f"{SEED_PREFIX}_new_{sequence}@example.com",
+        "username": f"{SEED_PREFIX}_new_{sequence}", "password": SEED_PASSWORD, "first_name": "Load", "last_name": f"New {sequence}"
+    }, expected=(201,))
+
+def _conditional_task(context: LoadContext, rng: random.Random) -> Optional[Request]:
+    if not context.task_etags:
+        return None
+    task_id, etag = rng.choice(list(context.task_etags.items()))
+    return Request("GET", f"/tasks/{task_id}", headers={"If-None-Match": etag}, expected=(304,))
+
+SCENARIOS: List[Scenario] = [
+    Scenario("POST /auth/token", lambda context, rng: Request(
+        "POST", "/auth/token", role=None, form={"username": rng.choice(context.seed.usernames), "password": SEED_PASSWORD})),
+    Scenario("GET /health/live", lambda context, rng: Request("GET", "/health/live", role=None)),
+    Scenario("GET /health/ready", lambda context, rng: Request("GET", "/health/ready", role=None)),
+
+    # Task listings
+    Scenario("GET /tasks [admin]", lambda context, rng: Request("GET", _query("/tasks", limit=20))),
+    Scenario("GET /tasks [user]", lambda context, rng: Request("GET", _query("/tasks", limit=20), role="user")),
+    Scenario("GET /tasks [status, priority]", lambda context, rng: Request("GET", _query(
+        "/tasks", status=rng.choice(list(StatusEnum)).value, priority=rng.choice(list(PriorityEnum)).value, limit=20), role="user")),
+    Scenario("GET /tasks [cursor]", lambda context, rng: Request("GET", _query("/tasks", limit=20, cursor=context.first_page_cursor))),
+    Scenario("GET /tasks [count=estimated]", lambda context, rng: Request("GET", _query("/tasks", limit=20, count="estimated"))),
+    Scenario("GET /tasks/search [admin]", lambda context, rng: Request("GET", _query("/tasks/search", q=rng.choice(context.seed.words), limit=20))),
+    Scenario("GET /tasks/search [user]", lambda context, rng: Request("GET", _query(
+        "/tasks/search", q=f"{rng.choice(context.seed.words)} or {rng.choice(context.seed.words)}", limit=20), role="user")),
+    Scenario("GET /tasks/stats [user]", lambda context, rng: Request("GET", "/tasks/stats", role="user")),
+    Scenario("GET /tasks/stats [company]", lambda context, rng: Request("GET", _query("/tasks/stats", company_id=rng.choice(context.seed.company_ids)))),
+    Scenario("GET /tasks/export [user]", lambda context, rng: Request("GET", _query("/tasks/export", format="csv"), role="user")),
+    Scenario("GET /tasks/{task_id}", lambda context, rng: Request("GET", f"/tasks/{rng.choice(context.seed.task_ids)}"), _remember_etag),
+    Scenario("GET /tasks/{task_id} [If-None-Match]", _conditional_task),
+    Scenario("POST /tasks/lookup [admin]", lambda context, rng: Request(
+        "POST", "/tasks/lookup", json={"ids": _sample_ids(context.seed.task_ids, rng)})),
+    Scenario("POST /tasks/lookup [user]", lambda context, rng: Request(
+        "POST", "/tasks/lookup", json={"ids": _sample_ids(context.seed.task_ids, rng)}, role="user")),
+    Scenario("GET /tasks/user/{user_id}", lambda context, rng: Request("GET", f"/tasks/user/{rng.choice(context.seed.user_ids)}")),
+    Scenario("GET /tasks/user/{user_id}/stream", lambda context, rng: Request("GET", f"/tasks/user/{rng.choice(context.seed.user_ids)}/stream")),
+    Scenario("GET /tasks/user/{user_id}/completed", lambda context, rng: Request("GET", f"/tasks/user/{rng.choice(context.seed.user_ids)}/completed")),
+    Scenario("GET /tasks/company/{company_id}/completed", lambda context, rng: Request(
+        "GET", _query(f"/tasks/company/{rng.choice(context.seed.company_ids)}/completed", limit=100))),
+
+    # Task writes
+    Scenario("POST /tasks", lambda context, rng: Request("POST", "/tasks", json=_task_create(context, rng), expected=(201,)), _remember("created_task_ids", "task_id")),
+    Scenario("POST /tasks/bulk", lambda context, rng: Request(
+        "POST", "/tasks/bulk", json={"items": [_task_create(context, rng) for _ in range(20)], "mode": "atomic"}, expected=(201,))),
+    Scenario("PUT /tasks/{task_id}", _update_task),
+    Scenario("DELETE /tasks/{task_id}", _delete("/tasks", "created_task_ids", expected=(200,))),
+
+    # Companies
+    Scenario("GET /companies", lambda context, rng: Request("GET", "/companies")),
+    Scenario("GET /companies/{company_id}", lambda context, rng: Request("GET", f"/companies/{rng.choice(context.seed.company_ids)}")),
+    Scenario("POST /companies/lookup", lambda context, rng: Request(
+        "POST", "/companies/lookup", json={"ids": _sample_ids(context.seed.company_ids, rng)})),
+    Scenario("POST /companies", lambda context, rng: Request(
+        "POST", "/companies/", json={"name": f"{SEED_PREFIX} created {context.next_sequence()}", "mode": True}, expected=(201,)),
+        _remember("created_company_ids")),
+    Scenario("PUT /companies/{company_id}", lambda context, rng: Request(
+        "PUT", f"/companies/{rng.choice(context.created_company_ids)}", json={"description": "updated by load test"}) if context.created_company_ids else None),
+
+    # Users go into seeded companies, the companies created above stay empty and are deleted last
+    Scenario("GET /users", lambda context, rng: Request("GET", "/users")),
+    Scenario("GET /users/{user_id}", lambda context, rng: Request("GET", f"/users/{rng.choice(context.seed.user_ids)}")),
+    Scenario("POST /users/lookup", lambda context, rng: Request(
+        "POST", "/users/lookup", json={"ids": _sample_ids(context.seed.user_ids, rng)})),
+    Scenario("POST /users", _create_user, _remember("created_user_ids")),
+    Scenario("PUT /users/{user_id}", lambda context, rng: Request(
+        "PUT", f"/users/{rng.choice(context.created_user_ids)}", json={"last_name": "Updated"}) if context.created_user_ids else None),
+    Scenario("DELETE /users/{user_id}", _delete("/users", "created_user_ids", expected=(204,))),
+    Scenario("DELETE /companies/{company_id}", _delete("/companies", "created_company_ids", expected=(204,))),
+
+    # Admin stats
+    Scenario("GET /stats/token-cache", lambda context, rng: Request("GET", "/stats/token-cache")),
+    Scenario("GET /stats/pool", lambda context, rng: Request("GET", "/stats/pool")),
+    Scenario("GET /stats/entity-cache", lambda context, rng: Request("GET", "/stats/entity-cache")),
+    Scenario("GET /stats/task-feed", lambda context, rng: Request("GET", "/stats/task-feed")),
+]
+
+def encode_request(context: LoadContext, request: Request, rng: random.Random) -> Tuple[Dict[str, str], bytes]:
+    headers = dict(request.headers)
+    if request.role == "admin":
+        headers["Authorization"] = f"Bearer {context.admin_token}"
+    elif request.role == "user":
+        headers["Authorization"] = f"Bearer {rng.choice(context.user_tokens)[1]}"
+    if request.form is not None:
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+        return headers, urlencode(request.form).encode()
+    if request.json is not None:
+        headers["Content-Type"] = "application/json"
+        return headers, json.dumps(request.json).encode()
+    return headers, b""
+
+def login_request(username: str) -> Request:
+    return Request("POST", "/auth/token", role=None, form={"username": username, "password": SEED_PASSWORD})
+
+ADMIN_LOGIN = login_request(ADMIN_USERNAME)
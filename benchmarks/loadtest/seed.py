@@ -0,0 +1,122 @@
+"""Synthetic companies, users and tasks for the load test, written through the app.models tables.
+
+Everything seeded is tagged with SEED_PREFIX so it can be found again and removed with --reset.
+The same --seed always produces the same names, owners, statuses and texts.
+"""
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Company, User, Task
+from app.models.task import StatusEnum, PriorityEnum
+from app.models.user import get_password_hash
+from app.services.base_crud_service import MAX_BIND_PARAMETERS
+from app.services.task_counter_service import TaskCounterService
+
+SEED_PREFIX = "loadtest"
+SEED_PASSWORD = "loadtest-password"
+ADMIN_USERNAME = f"{SEED_PREFIX}_admin"
+# Ids kept for the scenarios, enough to spread requests without loading whole tables
+SAMPLE_SIZE = 1000
+
+WORDS = (
+    "invoice report deploy release review meeting customer budget design database migration backup "
+    "security audit onboarding roadmap feedback support ticket incident outage dashboard metrics "
+    "analytics campaign newsletter contract renewal hiring interview training documentation api "
+    "integration payment refund shipping inventory supplier forecast quarterly planning retrospective"
+).split()
+
+@dataclass
+class SeedData:
+    company_ids: List[uuid.UUID] = field(default_factory=list)
+    user_ids: List[uuid.UUID] = field(default_factory=list)
+    usernames: List[str] = field(default_factory=list)
+    task_ids: List[uuid.UUID] = field(default_factory=list)
+    words: List[str] = field(default_factory=lambda: list(WORDS))
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+async def _insert_chunked(session: AsyncSession, model, rows: List[dict]):
+    if not rows:
+        return
+    # Multi-row INSERTs bind one parameter per column and row
+    chunk_size = MAX_BIND_PARAMETERS // len(rows[0])
+    for start in range(0, len(rows), chunk_size):
+        await session.execute(insert(model).values(rows[start:start + chunk_size]))
+
+async def is_seeded(session: AsyncSession) -> bool:
+    return bool(await session.scalar(select(func.count(User.id)).where(User.username == ADMIN_USERNAME)))
+
+async def reset(session: AsyncSession):
+    # Also removes what the CRUD scenarios created, task_counters rows go with their users (ON DELETE CASCADE)
+    seeded_users = select(User.id).where(User.username.like(f"{SEED_PREFIX}\\_%"))
+    await session.execute(delete(Task).where(Task.user_id.in_(seeded_users)))
+    await session.execute(delete(User).where(User.username.like(f"{SEED_PREFIX}\\_%")))
+    await session.execute(delete(Company).where(Company.name.like(f"{SEED_PREFIX} %")))
+    await session.commit()
+
+async def seed(session: AsyncSession, companies: int, users: int, tasks: int, rng_seed: int):
+    rng = random.Random(rng_seed)
+    started = time.perf_counter()
+    # bcrypt once, every seeded user shares the password
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    company_rows = [
+        {"id": uuid.UUID(int=rng.getrandbits(128), version=4), "name": f"{SEED_PREFIX} company {index}",
+         "description": _sentence(rng, 8), "mode": rng.random() > 0.1}
+        for index in range(companies)
+    ]
+    user_rows = [
+        {"id": uuid.UUID(int=rng.getrandbits(128), version=4), "username": f"{SEED_PREFIX}_{index}",
+         "email": f"{SEED_PREFIX}_{index}@example.com", "first_name": "Load", "last_name": f"User {index}",
+         "hashed_password": hashed_password, "is_active": True, "is_admin": False,
+         "company_id": company_rows[index % companies]["id"]}
+        for index in range(users)
+    ]
+    user_rows.append({
+        "id": uuid.UUID(int=rng.getrandbits(128), version=4), "username": ADMIN_USERNAME,
+        "email": f"{ADMIN_USERNAME}@example.com", "first_name": "Load", "last_name": "Admin",
+        "hashed_password": hashed_password, "is_active": True, "is_admin": True, "company_id": company_rows[0]["id"]
+    })
+    statuses, priorities = list(StatusEnum), list(PriorityEnum)
+    task_rows = [
+        {"id": uuid.UUID(int=rng.getrandbits(128), version=4), "user_id": user_rows[rng.randrange(users)]["id"],
+         "summary": _sentence(rng, 4), "description": _sentence(rng, 16),
+         "status": rng.choice(statuses), "priority": rng.choice(priorities),
+         # Spread over the last year so created_at ordering and cursors behave like real data
+         "created_at": now - timedelta(seconds=rng.randrange(365 * 24 * 3600))}
+        for _ in range(tasks)
+    ]
+
+    await _insert_chunked(session, Company, company_rows)
+    await _insert_chunked(session, User, user_rows)
+    await _insert_chunked(session, Task, task_rows)
+    # Seeding bypasses TaskService, recompute the counters behind GET /tasks/stats
+    await TaskCounterService(session).rebuild()
+    await session.commit()
+    print(f"seeded {companies} companies, {users + 1} users and {tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+async def load_seed_data(session: AsyncSession) -> SeedData:
+    data = SeedData()
+    data.company_ids = list(await session.scalars(
+        select(Company.id).where(Company.name.like(f"{SEED_PREFIX} company %")).order_by(Company.id).limit(SAMPLE_SIZE)
+    ))
+    rows = (await session.execute(
+        select(User.id, User.username)
+        .where(User.username.like(f"{SEED_PREFIX}\\_%"), User.is_admin.is_(False))
+        .order_by(User.id).limit(SAMPLE_SIZE)
+    )).all()
+    data.user_ids = [row.id for row in rows]
+    data.usernames = [row.username for row in rows]
+    data.task_ids = list(await session.scalars(
+        select(Task.id).where(Task.user_id.in_(data.user_ids)).order_by(Task.id).limit(SAMPLE_SIZE)
+    ))
+    return data
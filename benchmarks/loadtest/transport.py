@@ -0,0 +1,128 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+# (status, headers with lower-case names, body)
+HttpResult = Tuple[int, Dict[str, str], bytes]
+
+class HttpTransport:
+    """
+    HTTP/1.1 keep-alive connection to a running server, one per virtual user so requests
+    pay for the socket round trip like a real client, not for connection setup.
+    """
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 80
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: bytes = b'') -> HttpResult:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            return await self._exchange(method, path, headers, body)
+        except (OSError, EOFError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+
+    async def _exchange(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> HttpResult:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise EOFError("Connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304):
+            content = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            content = await self._reader.readexactly(int(response_headers['content-length']))
+        else:
+            content = await self._reader.read()
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            size = int((await self._reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Trailers, if any, end with an empty line
+                while (await self._reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append((await self._reader.readexactly(size + 2))[:-2])
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+class AsgiTransport:
+    """Calls the ASGI app in-process: no server or sockets, only the application and the database are measured."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: bytes = b'') -> HttpResult:
+        raw_path, _, query = path.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': unquote(raw_path),
+            'raw_path': raw_path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'content-length', str(len(body)).encode())] + [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            'client': ('127.0.0.1', 0),
+            'server': ('loadtest', 80),
+        }
+        response_done = asyncio.Event()
+        body_sent = False
+        status = 500
+        response_headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            # Streaming responses listen for a disconnect, only signal it once the response is complete
+            await response_done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                response_headers.update((name.decode('latin-1').lower(), value.decode('latin-1')) for name, value in message.get('headers', []))
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body', False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return status, response_headers, b''.join(chunks)
+
+    def close(self):
+        pass
@@ -0,0 +1,30 @@
+"""Add tasks keyset pagination indexes
+
+Revision ID: 3c1f9a7b2d4e
+Revises: d707de36f623
+Create Date: 2026-10-18 09:12:41.208413
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7b2d4e'
+down_revision: Union[str, None] = 'd707de36f623'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASKS_TABLE = 'tasks'
+CREATED_AT_ID_INDEX = 'ix_tasks_created_at_id'
+USER_ID_CREATED_AT_ID_INDEX = 'ix_tasks_user_id_created_at_id'
+
+def upgrade() -> None:
+    # Serves ORDER BY created_at DESC, id DESC and the (created_at, id) < (:created_at, :id) seek
+    op.create_index(CREATED_AT_ID_INDEX, TASKS_TABLE, ['created_at', 'id'])
+    # Same ordering for non-admin listings, which always filter on user_id
+    op.create_index(USER_ID_CREATED_AT_ID_INDEX, TASKS_TABLE, ['user_id', 'created_at', 'id'])
+
+def downgrade() -> None:
+    op.drop_index(USER_ID_CREATED_AT_ID_INDEX, TASKS_TABLE)
+    op.drop_index(CREATED_AT_ID_INDEX, TASKS_TABLE)
@@ -0,0 +1,44 @@
+"""Create task counters table
+
+Revision ID: 5a7d3e9f1b62
+Revises: 8e2b6d0c4a91
+Create Date: 2026-10-18 13:40:05.114207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d3e9f1b62'
+down_revision: Union[str, None] = '8e2b6d0c4a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_COUNTERS_TABLE = 'task_counters'
+COMPANY_ID_INDEX = 'ix_task_counters_company_id'
+
+def upgrade() -> None:
+    op.create_table(
+        TASK_COUNTERS_TABLE,
+        sa.Column('user_id', sa.UUID, sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        # Reuse the enum types created with the tasks table
+        sa.Column('status', postgresql.ENUM(name='statusenum', create_type=False), primary_key=True),
+        sa.Column('priority', postgresql.ENUM(name='priorityenum', create_type=False), primary_key=True),
+        sa.Column('company_id', sa.UUID, nullable=True),
+        sa.Column('count', sa.BigInteger, nullable=False, server_default='0')
+    )
+    op.create_index(COMPANY_ID_INDEX, TASK_COUNTERS_TABLE, ['company_id'])
+    # Backfill from the existing tasks
+    op.execute(
+        f"INSERT INTO {TASK_COUNTERS_TABLE} (user_id, status, priority, company_id, count) "
+        "SELECT tasks.user_id, tasks.status, tasks.priority, users.company_id, count(*) "
+        "FROM tasks JOIN users ON users.id = tasks.user_id "
+        "GROUP BY tasks.user_id, tasks.status, tasks.priority, users.company_id"
+    )
+
+def downgrade() -> None:
+    op.drop_index(COMPANY_ID_INDEX, TASK_COUNTERS_TABLE)
+    op.drop_table(TASK_COUNTERS_TABLE)
@@ -0,0 +1,26 @@
+"""Add users company_id index
+
+Revision ID: 8e2b6d0c4a91
+Revises: 3c1f9a7b2d4e
+Create Date: 2026-10-18 11:02:17.530961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2b6d0c4a91'
+down_revision: Union[str, None] = '3c1f9a7b2d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USERS_TABLE = 'users'
+COMPANY_ID_INDEX = 'ix_users_company_id'
+
+def upgrade() -> None:
+    # Company scoped task listings start from the company's users
+    op.create_index(COMPANY_ID_INDEX, USERS_TABLE, ['company_id'])
+
+def downgrade() -> None:
+    op.drop_index(COMPANY_ID_INDEX, USERS_TABLE)
@@ -0,0 +1,52 @@
+"""Create jobs table
+
+Revision ID: a2d5f8c1e374
+Revises: c9f3a7e2d148
+Create Date: 2026-10-18 18:12:46.207531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d5f8c1e374'
+down_revision: Union[str, None] = 'c9f3a7e2d148'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOBS_TABLE = 'jobs'
+STATUS_RUN_AFTER_INDEX = 'ix_jobs_status_run_after'
+JOB_STATUS_ENUM = postgresql.ENUM('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED', name='jobstatusenum')
+
+def upgrade() -> None:
+    op.create_table(
+        JOBS_TABLE,
+        sa.Column('id', sa.UUID, primary_key=True),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('status', JOB_STATUS_ENUM, nullable=False),
+        sa.Column('payload', postgresql.JSONB, nullable=False, server_default='{}'),
+        sa.Column('progress', postgresql.JSONB, nullable=True),
+        sa.Column('result', postgresql.JSONB, nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer, nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('lease_token', sa.UUID, nullable=True),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean, nullable=False, server_default='false'),
+        sa.Column('created_by', sa.UUID, nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('version', sa.Integer, nullable=False, server_default=sa.text('1'))
+    )
+    op.create_index(STATUS_RUN_AFTER_INDEX, JOBS_TABLE, ['status', 'run_after'])
+
+def downgrade() -> None:
+    op.drop_index(STATUS_RUN_AFTER_INDEX, JOBS_TABLE)
+    op.drop_table(JOBS_TABLE)
+    JOB_STATUS_ENUM.drop(op.get_bind(), checkfirst=True)
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Server side created_at/updated_at defaults
+
+Revision ID: b4c8e2f6a013
+Revises: 5a7d3e9f1b62
+Create Date: 2026-10-18 15:02:41.538120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c8e2f6a013'
+down_revision: Union[str, None] = '5a7d3e9f1b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMPED_TABLES = ('companies', 'users', 'tasks')
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+TASKS_TABLE = 'tasks'
+
+def upgrade() -> None:
+    # tasks was created with naive timestamps while the model declares timezone=True, the stored values are UTC
+    for column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            TASKS_TABLE, column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
+    for table in TIMESTAMPED_TABLES:
+        for column in TIMESTAMP_COLUMNS:
+            op.alter_column(table, column, server_default=sa.func.now(), existing_type=sa.DateTime(timezone=True))
+
+def downgrade() -> None:
+    for table in TIMESTAMPED_TABLES:
+        for column in TIMESTAMP_COLUMNS:
+            op.alter_column(table, column, server_default=None, existing_type=sa.DateTime(timezone=True))
+    for column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            TASKS_TABLE, column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Create the event id sequence of the task change feed
+
+Revision ID: b7e4c2a9d613
+Revises: a2d5f8c1e374
+Create Date: 2026-10-18 19:12:40.552107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2a9d613'
+down_revision: Union[str, None] = 'a2d5f8c1e374'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_CHANGE_ID_SEQUENCE = 'task_change_id_seq'
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence(TASK_CHANGE_ID_SEQUENCE)))
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence(TASK_CHANGE_ID_SEQUENCE)))
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Add version columns for optimistic concurrency
+
+Revision ID: c9f3a7e2d148
+Revises: e6a1d4c9b725
+Create Date: 2026-10-18 17:05:27.318644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f3a7e2d148'
+down_revision: Union[str, None] = 'e6a1d4c9b725'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ('companies', 'users', 'tasks')
+VERSION_COLUMN = 'version'
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, existing rows read as version 1 without a table rewrite
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column(VERSION_COLUMN, sa.Integer(), nullable=False, server_default=sa.text('1')))
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, VERSION_COLUMN)
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""Add tasks full text search vector
+
+Revision ID: e6a1d4c9b725
+Revises: b4c8e2f6a013
+Create Date: 2026-10-18 16:20:13.902174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1d4c9b725'
+down_revision: Union[str, None] = 'b4c8e2f6a013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASKS_TABLE = 'tasks'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SEARCH_VECTOR_INDEX = 'ix_tasks_search_vector'
+# Frozen copy of app.models.task.SEARCH_VECTOR_EXPRESSION at this revision
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+def upgrade() -> None:
+    # Stored generated column: Postgres recomputes it on every INSERT/UPDATE, existing rows are filled by the rewrite
+    op.add_column(
+        TASKS_TABLE,
+        sa.Column(SEARCH_VECTOR_COLUMN, postgresql.TSVECTOR, sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+    )
+    op.create_index(SEARCH_VECTOR_INDEX, TASKS_TABLE, [SEARCH_VECTOR_COLUMN], postgresql_using='gin')
+
+def downgrade() -> None:
+    op.drop_index(SEARCH_VECTOR_INDEX, TASKS_TABLE)
+    op.drop_column(TASKS_TABLE, SEARCH_VECTOR_COLUMN)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import os
+
+# Settings has required fields without defaults; tests that need a database read TEST_DATABASE_URL instead
+for name, value in {
+    "POSTGRES_DB": "todos_test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "password",
+    "DEFAULT_PASSWORD_ADMIN": "admin-password",
+    "JWT_SECRET_KEY": "test-secret",
+}.items():
+    os.environ.setdefault(name, value)
+
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import Sequence
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateSequence, DropSequence
+
+# Imported for every mapped table to be registered on Base
+import app.models
+from app.models.base import Base
+from app.models.task import TASK_CHANGE_ID_SEQUENCE
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+TEST_REPLICA_DATABASE_URL = os.environ.get("TEST_REPLICA_DATABASE_URL")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@asynccontextmanager
+async def throwaway_database(url: str):
+    # Schema of the models rather than the migrations, dropped again after the test
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(CreateSequence(Sequence(TASK_CHANGE_ID_SEQUENCE)))
+    try:
+        yield engine
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(DropSequence(Sequence(TASK_CHANGE_ID_SEQUENCE)))
+            await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+@pytest.fixture
+async def db_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    async with throwaway_database(TEST_DATABASE_URL) as engine:
+        yield engine
+
+@pytest.fixture
+async def replica_engine(db_engine):
+    if not TEST_REPLICA_DATABASE_URL:
+        pytest.skip("TEST_REPLICA_DATABASE_URL is not set")
+    async with throwaway_database(TEST_REPLICA_DATABASE_URL) as engine:
+        yield engine
+
+@pytest.fixture
+def session_factory(db_engine) -> async_sessionmaker:
+    return async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
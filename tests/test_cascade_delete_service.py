@@ -0,0 +1,49 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.exceptions.service_exceptions import VersionConflictException
+from app.services.cascade_delete_service import CascadeDeleteService, MAX_CASCADE_RETRIES
+
+pytestmark = pytest.mark.anyio
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+class RacedCascade(CascadeDeleteService):
+    # Every round finds a child attached to the owner meanwhile, as under a steady stream of inserts
+    def __init__(self, session, races: int):
+        super().__init__(session)
+        self.races = races
+        self.rounds = 0
+
+    async def _delete_tasks(self, tasks_query, progress):
+        self.rounds += 1
+
+    async def delete_by_id(self, model, model_id, commit=True):
+        if self.rounds <= self.races:
+            raise IntegrityError("DELETE FROM users", {}, Exception("violates foreign key constraint"))
+        return True
+
+    async def _commit(self, progress):
+        pass
+
+async def test_cascade_retries_when_children_are_attached_meanwhile():
+    service = RacedCascade(FakeSession(), races=MAX_CASCADE_RETRIES)
+
+    assert await service.delete_user(uuid.uuid4()) is not None
+    assert service.rounds == MAX_CASCADE_RETRIES + 1
+
+async def test_cascade_gives_up_with_a_conflict_after_the_retries():
+    session = FakeSession()
+    service = RacedCascade(session, races=MAX_CASCADE_RETRIES + 1)
+
+    with pytest.raises(VersionConflictException):
+        await service.delete_user(uuid.uuid4())
+    assert service.rounds == MAX_CASCADE_RETRIES + 1
+    assert session.rollbacks == MAX_CASCADE_RETRIES + 1
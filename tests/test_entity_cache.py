@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import entity_cache
+from app.utils.entity_cache import MemoryEntityCache
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(entity_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+async def test_entries_expire_after_the_ttl(clock):
+    cache = MemoryEntityCache(ttl_seconds=60)
+    await cache.set("user:1", {"id": 1})
+
+    clock.now += 59
+    assert await cache.get("user:1") == {"id": 1}
+    clock.now += 1
+    assert await cache.get("user:1") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+async def test_least_recently_used_entry_is_evicted(clock):
+    cache = MemoryEntityCache(ttl_seconds=60, max_entries=2)
+    await cache.set("user:1", {"id": 1})
+    await cache.set("user:2", {"id": 2})
+    # Reading user:1 makes user:2 the least recently used
+    await cache.get("user:1")
+    await cache.set("user:3", {"id": 3})
+
+    assert await cache.get("user:2") is None
+    assert await cache.get("user:1") == {"id": 1}
+    assert await cache.get("user:3") == {"id": 3}
+
+async def test_setting_again_refreshes_ttl_and_recency(clock):
+    cache = MemoryEntityCache(ttl_seconds=60, max_entries=2)
+    await cache.set("user:1", {"id": 1})
+    await cache.set("user:2", {"id": 2})
+    clock.now += 30
+    await cache.set("user:1", {"id": 1, "version": 2})
+    await cache.set("user:3", {"id": 3})
+
+    clock.now += 45
+    assert await cache.get("user:1") == {"id": 1, "version": 2}
+    assert await cache.get("user:2") is None
+
+async def test_delete_invalidates_entries(clock):
+    cache = MemoryEntityCache(ttl_seconds=60)
+    await cache.set("user:1", {"id": 1})
+    await cache.set("company:1", {"id": 1})
+
+    await cache.delete("user:1", "company:1", "user:missing")
+
+    assert await cache.get("user:1") is None
+    assert await cache.get("company:1") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.jobs import runner as runner_module
+from app.jobs.runner import JobDefinition, JobRunner
+from app.models.job import JobStatusEnum
+
+pytestmark = pytest.mark.anyio
+
+class EmptyPayload(BaseModel):
+    pass
+
+def make_job(kind: str = "noop") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(), kind=kind, payload={}, progress=None, attempts=1, max_attempts=3,
+        cancel_requested=False, lease_token=uuid.uuid4()
+    )
+
+class FakeQueue:
+    def __init__(self, jobs, failing_finishes: int = 0):
+        self.jobs = list(jobs)
+        self.claimed = []
+        self.finished = []
+        self.failing_finishes = failing_finishes
+
+class FakeJobService:
+    queue: FakeQueue = None
+
+    def __init__(self, session):
+        pass
+
+    async def claim_job(self, lease_seconds):
+        if not self.queue.jobs:
+            return None
+        job = self.queue.jobs.pop(0)
+        self.queue.claimed.append(job)
+        return job
+
+    async def finish_job(self, job, status, progress=None, result=None, error=None):
+        if self.queue.failing_finishes:
+            self.queue.failing_finishes -= 1
+            raise ConnectionResetError("connection lost")
+        self.queue.finished.append((job, status))
+
+    async def heartbeat(self, job, lease_seconds, progress):
+        return False
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+async def noop(context, payload):
+    return {"ok": True}
+
+async def wait_until(predicate, timeout: float = 2.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+async def test_worker_survives_a_failing_finish(monkeypatch):
+    queue = FakeQueue([make_job(), make_job()], failing_finishes=1)
+    monkeypatch.setattr(FakeJobService, "queue", queue)
+    monkeypatch.setattr(runner_module, "JobService", FakeJobService)
+    runner = JobRunner(fake_session, {"noop": JobDefinition(EmptyPayload, noop)}, concurrency=1, poll_interval=0.01, lease_seconds=30)
+
+    await runner.start()
+    try:
+        await wait_until(lambda: queue.finished)
+    finally:
+        await runner.stop(timeout=1)
+
+    # The first job's finish failed, the same worker still claimed and finished the second one
+    assert len(queue.claimed) == 2
+    assert queue.finished == [(queue.claimed[1], JobStatusEnum.SUCCEEDED)]
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update, func
+
+from app.models import Job
+from app.models.job import JobStatusEnum
+from app.services.job_service import JobService
+
+pytestmark = pytest.mark.anyio
+
+LEASE_SECONDS = 30
+
+async def create_jobs(session_factory, count: int) -> list:
+    async with session_factory() as session:
+        return [(await JobService(session).create_job("noop", {}, max_attempts=3)).id for _ in range(count)]
+
+async def claim(session_factory):
+    async with session_factory() as session:
+        return await JobService(session).claim_job(LEASE_SECONDS)
+
+async def load(session_factory, job_id) -> Job:
+    async with session_factory() as session:
+        return await JobService(session).get_job(job_id)
+
+async def test_concurrent_claimers_never_get_the_same_job(session_factory):
+    job_ids = await create_jobs(session_factory, 8)
+
+    claimed = await asyncio.gather(*(claim(session_factory) for _ in range(8)))
+
+    assert sorted(job.id for job in claimed) == sorted(job_ids)
+    assert len({job.lease_token for job in claimed}) == 8
+
+async def test_claim_skips_a_job_locked_by_another_claimer(session_factory):
+    first, second = await create_jobs(session_factory, 2)
+
+    async with session_factory() as other_claimer:
+        # The other claimer is between its SELECT ... FOR UPDATE and its commit
+        await other_claimer.execute(select(Job.id).where(Job.id == first).with_for_update())
+
+        job = await asyncio.wait_for(claim(session_factory), timeout=5)
+        await other_claimer.rollback()
+
+    assert job.id == second
+
+async def test_expired_lease_is_reclaimed(session_factory):
+    [job_id] = await create_jobs(session_factory, 1)
+    stalled = await claim(session_factory)
+    assert await claim(session_factory) is None
+
+    async with session_factory() as session:
+        await session.execute(update(Job).where(Job.id == job_id).values(locked_until=func.now() - timedelta(seconds=1)))
+        await session.commit()
+    reclaimed = await claim(session_factory)
+
+    assert reclaimed.id == job_id
+    assert reclaimed.lease_token != stalled.lease_token
+    assert reclaimed.attempts == 2
+    assert reclaimed.status == JobStatusEnum.RUNNING
+
+async def test_stale_lease_cannot_finish_or_extend_the_job(session_factory):
+    [job_id] = await create_jobs(session_factory, 1)
+    stalled = await claim(session_factory)
+    async with session_factory() as session:
+        await session.execute(update(Job).where(Job.id == job_id).values(locked_until=func.now() - timedelta(seconds=1)))
+        await session.commit()
+    reclaimed = await claim(session_factory)
+
+    async with session_factory() as session:
+        await JobService(session).finish_job(stalled, JobStatusEnum.SUCCEEDED, result={"by": "stalled worker"})
+        assert await JobService(session).heartbeat(stalled, LEASE_SECONDS, progress=None) is None
+
+    job = await load(session_factory, job_id)
+    assert job.status == JobStatusEnum.RUNNING
+    assert job.lease_token == reclaimed.lease_token
+    assert job.result is None
+    assert job.finished_at is None
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Company, Task, User
+from app.models.task import StatusEnum
+from app.services.task_service import TaskService
+from app.utils.metrics import RequestTiming, current_timing
+from app.utils.query_log import QueryLog, QueryBudgetExceeded
+
+pytestmark = pytest.mark.anyio
+
+USERS = 5
+
+@pytest.fixture
+async def company_id(session_factory):
+    # One task per user, listing them with their owners is the N+1 shape when owners are loaded one by one
+    async with session_factory() as session:
+        company = Company(name="Budgeted")
+        session.add(company)
+        await session.flush()
+        for number in range(USERS):
+            user = User(username=f"user-{number}", company_id=company.id)
+            session.add(user)
+            await session.flush()
+            session.add(Task(user_id=user.id, summary=f"task {number}", status=StatusEnum.DONE))
+        await session.commit()
+        return company.id
+
+@pytest.fixture
+def request_timing(db_engine):
+    query_log = QueryLog(budget_max_repeats=2, budget_raise=True)
+    query_log.watch(db_engine)
+    timing = RequestTiming({"method": "GET"})
+    token = current_timing.set(timing)
+    yield timing
+    current_timing.reset(token)
+
+async def test_budget_raises_on_the_repeat_that_goes_over(session_factory, company_id, request_timing):
+    loaded = []
+    async with session_factory() as session:
+        tasks = (await session.scalars(select(Task).join(Task.user).where(User.company_id == company_id))).all()
+        with pytest.raises(QueryBudgetExceeded, match="3x SELECT"):
+            for task in tasks:
+                loaded.append(await session.get(User, task.user_id))
+
+    # The first two owner lookups fit the budget of two repeats, the third one fails
+    assert len(loaded) == 2
+    assert sum(request_timing.statements.values()) == 4
+
+async def test_joined_load_listing_stays_within_budget(session_factory, company_id, request_timing):
+    async with session_factory() as session:
+        tasks = await TaskService(session).get_tasks_by_company_id_and_status(company_id, StatusEnum.DONE)
+
+    assert len(tasks) == USERS
+    assert {task.user.company_id for task in tasks} == {company_id}
+    assert sum(request_timing.statements.values()) == 1
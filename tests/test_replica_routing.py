@@ -0,0 +1,206 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from jose import jwt
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.dependencies import db as db_module
+from app.middlewares import ReadYourWritesMiddleware
+from app.models import Company
+from app.routers import company, task, user
+from app.utils import replica_routing
+from app.utils.replica_routing import StickyWrites, read_only, STICKY_COOKIE, STICKY_HEADER
+
+pytestmark = pytest.mark.anyio
+
+def make_app(sticky_writes: StickyWrites) -> ReadYourWritesMiddleware:
+    app = FastAPI()
+
+    @app.post("/things")
+    async def create_thing():
+        return {}
+
+    @app.post("/things/lookup")
+    @read_only
+    async def lookup_things():
+        return {}
+
+    return ReadYourWritesMiddleware(app, sticky_writes=sticky_writes)
+
+def bearer(subject: str) -> str:
+    # Signed with any key, routing reads the claim without verifying it
+    return "Bearer " + jwt.encode({"id": subject}, "any-key", algorithm="HS256")
+
+def http_scope(method: str, path: str, headers: dict) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "server": ("test", 80),
+        "client": ("test", 1234), "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    }
+
+async def call(app, method: str, path: str, subject: str) -> dict:
+    scope = http_scope(method, path, {"Authorization": bearer(subject)})
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    return {name.decode().lower(): value.decode() for name, value in start["headers"]}
+
+async def test_write_marks_the_caller_sticky():
+    sticky_writes = StickyWrites("secret")
+    subject = str(uuid.uuid4())
+
+    headers = await call(make_app(sticky_writes), "POST", "/things", subject)
+
+    assert sticky_writes.is_sticky(subject, headers[STICKY_HEADER.lower()])
+    assert headers["set-cookie"].startswith(f"{STICKY_COOKIE}=")
+
+async def test_read_only_post_sets_no_sticky_header_or_cookie():
+    sticky_writes = StickyWrites("secret")
+    subject = str(uuid.uuid4())
+
+    headers = await call(make_app(sticky_writes), "POST", "/things/lookup", subject)
+
+    assert STICKY_HEADER.lower() not in headers
+    assert "set-cookie" not in headers
+    assert not sticky_writes.is_sticky(subject)
+
+def test_lookup_routes_are_read_only():
+    for endpoint in (task.lookup_tasks, user.lookup_users, company.lookup_companies):
+        assert endpoint.read_only
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(replica_routing, "time", SimpleNamespace(time=lambda: clock.now, monotonic=lambda: clock.now))
+    return clock
+
+def test_token_is_honoured_by_another_worker(clock):
+    subject = str(uuid.uuid4())
+    token = StickyWrites("secret").mark(subject)
+
+    other_worker = StickyWrites("secret")
+
+    assert other_worker.is_sticky(subject, token)
+    assert not other_worker.is_sticky(subject)
+
+def test_expired_token_is_ignored(clock):
+    sticky_writes = StickyWrites("secret", seconds=5)
+    subject = str(uuid.uuid4())
+    token = sticky_writes.mark(subject)
+
+    clock.now += 5
+
+    assert not sticky_writes.is_sticky(subject, token)
+    assert not StickyWrites("secret", seconds=5).is_sticky(subject, token)
+
+def test_forged_tokens_are_ignored(clock):
+    subject = str(uuid.uuid4())
+    token = StickyWrites("secret").mark(subject)
+    token_subject, deadline, signature = token.rsplit(".", 2)
+    other_worker = StickyWrites("secret")
+
+    # Signed with another secret, pushed deadline, tampered signature, another user's token, garbage
+    assert not other_worker.is_sticky(subject, StickyWrites("other-secret").mark(subject))
+    assert not other_worker.is_sticky(subject, f"{token_subject}.{int(deadline) + 60000}.{signature}")
+    assert not other_worker.is_sticky(subject, f"{token_subject}.{deadline}.{signature[::-1]}")
+    assert not other_worker.is_sticky(str(uuid.uuid4()), token)
+    assert not other_worker.is_sticky(subject, "not-a-token")
+    assert not other_worker.is_sticky(None, token)
+
+class FakeReplicaSessions:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        session = SimpleNamespace(name="replica")
+        self.opened.append(session)
+        return self
+
+    async def __aenter__(self):
+        return self.opened[-1]
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+async def read_session(primary, headers: dict):
+    request = Request(http_scope("GET", "/tasks", headers))
+    sessions = db_module.get_async_read_db_session(request, primary)
+    try:
+        return await sessions.__anext__()
+    finally:
+        await sessions.aclose()
+
+@pytest.fixture
+def sticky_writes(monkeypatch) -> StickyWrites:
+    sticky_writes = StickyWrites("secret")
+    monkeypatch.setattr(db_module, "get_sticky_writes", lambda: sticky_writes)
+    return sticky_writes
+
+async def test_reads_use_the_primary_without_replicas(monkeypatch, sticky_writes):
+    monkeypatch.setattr(db_module, "get_replica_session_factory", lambda: None)
+    primary = SimpleNamespace(name="primary")
+
+    assert await read_session(primary, {"Authorization": bearer(str(uuid.uuid4()))}) is primary
+    assert await read_session(primary, {}) is primary
+
+async def test_reads_of_a_sticky_user_use_the_primary(monkeypatch, sticky_writes):
+    replicas = FakeReplicaSessions()
+    monkeypatch.setattr(db_module, "get_replica_session_factory", lambda: replicas)
+    primary = SimpleNamespace(name="primary")
+    subject = str(uuid.uuid4())
+    token = StickyWrites("secret").mark(subject)
+
+    assert await read_session(primary, {"Authorization": bearer(subject), STICKY_HEADER: token}) is primary
+    assert await read_session(primary, {"Authorization": bearer(subject), "Cookie": f"{STICKY_COOKIE}={token}"}) is primary
+    assert replicas.opened == []
+
+async def test_reads_use_a_replica_with_an_expired_or_forged_token(monkeypatch, sticky_writes, clock):
+    replicas = FakeReplicaSessions()
+    monkeypatch.setattr(db_module, "get_replica_session_factory", lambda: replicas)
+    primary = SimpleNamespace(name="primary")
+    subject = str(uuid.uuid4())
+    forged = StickyWrites("other-secret").mark(subject)
+    expired = StickyWrites("secret").mark(subject)
+    clock.now += 60
+
+    assert (await read_session(primary, {"Authorization": bearer(subject), STICKY_HEADER: forged})).name == "replica"
+    assert (await read_session(primary, {"Authorization": bearer(subject), STICKY_HEADER: expired})).name == "replica"
+    assert (await read_session(primary, {"Authorization": bearer(subject)})).name == "replica"
+    assert len(replicas.opened) == 3
+
+async def test_sticky_reads_see_own_writes_before_the_replica(monkeypatch, sticky_writes, session_factory, replica_engine):
+    # Two independent databases, the "replica" never receives the primary's rows
+    monkeypatch.setattr(
+        db_module, "get_replica_session_factory",
+        lambda: async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    subject = str(uuid.uuid4())
+    async with session_factory() as session:
+        session.add(Company(name="Written on the primary"))
+        await session.commit()
+    token = sticky_writes.mark(subject)
+
+    async def count_companies(headers: dict) -> int:
+        async with session_factory() as primary:
+            request = Request(http_scope("GET", "/companies", headers))
+            sessions = db_module.get_async_read_db_session(request, primary)
+            session = await sessions.__anext__()
+            try:
+                return (await session.execute(select(func.count()).select_from(Company))).scalar_one()
+            finally:
+                await sessions.aclose()
+
+    assert await count_companies({"Authorization": bearer(subject), STICKY_HEADER: token}) == 1
+    assert await count_companies({"Authorization": bearer(str(uuid.uuid4()))}) == 0
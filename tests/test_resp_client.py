@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from app.commands import resp_server
+from app.utils.resp_client import RespClient, RespError
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    resp_server._store.clear()
+    yield
+    resp_server._store.clear()
+
+@pytest.fixture
+async def serve():
+    servers = []
+
+    async def start(handler=resp_server.serve_client) -> RespClient:
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        servers.append(server)
+        host, port = server.sockets[0].getsockname()[:2]
+        return RespClient(f"redis://{host}:{port}/0", timeout=0.2)
+
+    yield start
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+async def test_get_set_del(serve):
+    client = await serve()
+    try:
+        assert await client.execute('GET', 'key') is None
+        assert await client.execute('SET', 'key', 'value', 'EX', 60) == 'OK'
+        assert await client.execute('GET', 'key') == b'value'
+        assert await client.execute('DEL', 'key', 'other') == 1
+        assert await client.execute('GET', 'key') is None
+    finally:
+        client.close()
+
+async def test_error_reply_keeps_the_connection(serve):
+    client = await serve()
+    try:
+        await client.execute('PING')
+        writer = client._writer
+        with pytest.raises(RespError):
+            await client.execute('NOPE')
+        assert client._writer is writer
+        assert await client.execute('PING') == 'PONG'
+    finally:
+        client.close()
+
+def delaying_first_reply(delay: float):
+    # The first command of the first connection is answered late, as a stalled server would
+    connections = []
+
+    async def handler(reader, writer):
+        connections.append(writer)
+        if len(connections) == 1:
+            command = await resp_server._read_command(reader)
+            await asyncio.sleep(delay)
+            writer.write(resp_server.handle_command(command))
+        await resp_server.serve_client(reader, writer)
+
+    return handler
+
+async def test_cancelled_command_does_not_leave_its_reply_to_the_next(serve):
+    client = await serve(delaying_first_reply(0.1))
+    resp_server._store[b'key'] = (b'stale', None)
+    try:
+        pending = asyncio.ensure_future(client.execute('GET', 'key'))
+        await asyncio.sleep(0.02)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        await asyncio.sleep(0.15)
+
+        assert await client.execute('SET', 'key', 'fresh') == 'OK'
+        assert await client.execute('GET', 'key') == b'fresh'
+    finally:
+        client.close()
+
+async def test_timed_out_command_reconnects(serve):
+    client = await serve(delaying_first_reply(0.5))
+    resp_server._store[b'key'] = (b'stale', None)
+    try:
+        with pytest.raises(TimeoutError):
+            await client.execute('GET', 'key')
+
+        assert await client.execute('PING') == 'PONG'
+        assert await client.execute('GET', 'key') == b'stale'
+    finally:
+        client.close()
+
+async def test_reconnects_after_the_server_drops_the_connection(serve):
+    async def answer_once(reader, writer):
+        writer.write(resp_server.handle_command(await resp_server._read_command(reader)))
+        await writer.drain()
+        writer.close()
+
+    client = await serve(answer_once)
+    try:
+        assert await client.execute('SET', 'key', 'value') == 'OK'
+        with pytest.raises((EOFError, OSError)):
+            await client.execute('GET', 'key')
+        assert client._writer is None
+
+        assert await client.execute('GET', 'key') == b'value'
+    finally:
+        client.close()
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.utils import task_feed as task_feed_module
+from app.utils.task_feed import TaskFeed, RESET_FRAME
+
+pytestmark = pytest.mark.anyio
+
+class FakeConnection:
+    def __init__(self, failing_pings: int):
+        self.failing_pings = failing_pings
+        self.terminated = False
+
+    async def add_listener(self, channel, callback):
+        pass
+
+    async def execute(self, statement):
+        if self.failing_pings:
+            self.failing_pings -= 1
+            # Not one of the connection errors asyncpg documents
+            raise RuntimeError("unexpected failure")
+        await asyncio.sleep(3600)
+
+    def terminate(self):
+        self.terminated = True
+
+async def test_listener_survives_unexpected_errors_and_reconnects(monkeypatch):
+    connections = []
+    attempts = []
+
+    async def connect(dsn):
+        attempts.append(dsn)
+        if len(attempts) == 1:
+            raise RuntimeError("unexpected connect failure")
+        connection = FakeConnection(failing_pings=1 if len(connections) == 0 else 0)
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr(task_feed_module.asyncpg, "connect", connect)
+    monkeypatch.setattr(task_feed_module, "RECONNECT_MIN_SECONDS", 0.0)
+    feed = TaskFeed("postgresql://feed", "task_changes", ping_seconds=0.01)
+    subscriber = feed.subscribe()
+    await feed.start()
+    try:
+        for _ in range(200):
+            if len(connections) == 2 and feed.connected:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(attempts) == 3
+        assert connections[0].terminated
+        assert feed.connected
+        # Events may have been missed while reconnecting
+        assert list(subscriber.frames) == [RESET_FRAME]
+    finally:
+        await feed.stop()
+
+    assert not feed.connected
+    assert connections[1].terminated
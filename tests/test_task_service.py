@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+from sqlalchemy import select, delete
+
+from app.exceptions.user_exceptions import UserNotFoundException
+from app.models import Task, User
+from app.schemas.task import TaskCreate, BulkItemStatusEnum
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.anyio
+
+async def create_user(session_factory, username: str) -> uuid.UUID:
+    async with session_factory() as session:
+        user = User(username=username)
+        session.add(user)
+        await session.commit()
+        return user.id
+
+async def delete_user(session_factory, user_id: uuid.UUID):
+    # As another worker would, while this one still holds the user in its cache
+    async with session_factory() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+async def test_create_task_for_a_deleted_user_is_not_found(session_factory):
+    user_id = await create_user(session_factory, "deleted")
+    await delete_user(session_factory, user_id)
+
+    async with session_factory() as session:
+        with pytest.raises(UserNotFoundException):
+            await TaskService(session).create_task(TaskCreate(user_id=user_id, summary="orphan"))
+        assert (await session.scalars(select(Task.id))).all() == []
+
+@pytest.mark.parametrize("atomic", [True, False])
+async def test_bulk_create_reports_items_of_a_deleted_user(session_factory, atomic):
+    kept_id = await create_user(session_factory, "kept")
+    deleted_id = await create_user(session_factory, "deleted")
+    items = [TaskCreate(user_id=kept_id, summary="kept"), TaskCreate(user_id=deleted_id, summary="orphan")]
+    await delete_user(session_factory, deleted_id)
+
+    async with session_factory() as session:
+        results = await TaskService(session).create_tasks(items, existing_user_ids={kept_id, deleted_id}, atomic=atomic)
+        created = (await session.scalars(select(Task.user_id))).all()
+
+    assert results[1].status == BulkItemStatusEnum.FAILED
+    assert results[1].error == f"User with ID {deleted_id} not found"
+    if atomic:
+        assert results[0].status == BulkItemStatusEnum.SKIPPED
+        assert created == []
+    else:
+        assert results[0].status == BulkItemStatusEnum.CREATED
+        assert created == [kept_id]